@@ -1,15 +1,36 @@
 import streamlit as st
-import pandas as pd
 import os
+import json
+import threading
 from dotenv import load_dotenv
 from grid_client import (
     fetch_recent_tournaments,
-    fetch_series_info_for_team,
-    collect_team_data,
     discover_teams_from_tournament_list,
-    discover_teams_from_tournament
+    breaker_states
 )
-from llm_analyzer import generate_scouting_report, generate_comparison_report
+from pipeline import (
+    get_brief_stats,
+    build_stats_bundle,
+    report_fingerprint,
+    comparison_fingerprint,
+    describe_age
+)
+from telemetry import (
+    record_cache,
+    stage_summary,
+    cache_summary,
+    recent_spans,
+    export_otlp_json,
+    start_metrics_server
+)
+from session_store import SessionResults, SHARED_RESULTS, estimate_size
+from prefetch import prefetch_tournament, discover_teams_async, warm_results
+from report_store import default_store, ReportScheduler
+from jobs import JobQueue
+from live import track_series, LIVE_POLL_INTERVAL
+from ratings import default_engine
+from players import default_index
+from form import default_form_index, FORM_HALF_LIFE
 from report_generator import (
     generate_markdown_report, 
     generate_pdf_report,
@@ -21,6 +42,8 @@ from report_generator import (
 # Load environment variables
 load_dotenv()
 DEBUG_MODE = os.getenv("DEBUG", "false").lower() == "true"
+METRICS_PORT = os.getenv("METRICS_PORT")
+REPORT_SCHEDULER = os.getenv("REPORT_SCHEDULER", "false").lower() == "true"
 
 # Premium Scouting Dashboard Config
 st.set_page_config(
@@ -506,24 +529,30 @@ def full_screen_loader(message="FETCHING DATA FROM GRID API"):
         </div>
     """, unsafe_allow_html=True)
 
-# --- GLOBAL INTEL SYNC (STARTUP ONLY) ---
-if 'tours' not in st.session_state:
-    # Use the premium fullscreen loader for initialization
-    full_screen_loader("SYNCHRONIZING GLOBAL COMBAT DATA")
-    
+@st.cache_resource(ttl=900, show_spinner=False)
+def load_global_intel():
+    """Tournaments + team universe, fetched once per server and shared (not copied) by every session."""
     # 1. Fetch Tournaments
     tours = fetch_recent_tournaments(limit=50)
-    st.session_state['tours'] = tours
     
     # 2. Discover Universities (for search and comparison)
     # We use a limited set initially to keep startup fast, or full if user prefers
     # But for comparison we need a good list:
     rt_ids = [t['id'] for t in tours[:30]] # Use first 30 tours for team discovery
-    univ = discover_teams_from_tournament_list(rt_ids)
+    return tours, discover_teams_from_tournament_list(rt_ids)
+
+# --- GLOBAL INTEL SYNC (STARTUP ONLY) ---
+if 'tours' not in st.session_state:
+    # Use the premium fullscreen loader for initialization
+    full_screen_loader("SYNCHRONIZING GLOBAL COMBAT DATA")
+    
+    tours, univ = load_global_intel()
+    if not tours:
+        load_global_intel.clear() # don't pin a failed sync for every session
     
+    # One shared team list serves global search and both matchup pickers
+    st.session_state['tours'] = tours
     st.session_state['guniv'] = univ
-    st.session_state['ca'] = univ
-    st.session_state['cb'] = univ
     
     # Initialize other states
     if 'tteams' not in st.session_state: st.session_state['tteams'] = []
@@ -531,41 +560,244 @@ if 'tours' not in st.session_state:
     # Finish Initialization
     st.rerun() # Refresh to show UI once data is locked in
 
-@st.cache_data(show_spinner="Preparing Mission Dossier...")
-def get_cached_pdf(t_name, ed, pb, sr, wt, cs):
-    return generate_pdf_report(t_name, ed, pb, sr, wt, cs)
+@st.cache_resource
+def start_metrics_endpoint():
+    """One local Prometheus /metrics + /traces endpoint per server process."""
+    return start_metrics_server(METRICS_PORT)
+
+if METRICS_PORT:
+    start_metrics_endpoint()
+
+@st.cache_resource
+def get_report_store():
+    """Precomputed scouting reports (see report_store.py), shared by every session."""
+    return default_store()
+
+@st.cache_resource
+def get_job_queue():
+    """Pipeline workers shared by every session (JOB_WORKERS / JOB_WORKER_MODE); scripts only enqueue and poll."""
+    return JobQueue()
+
+@st.cache_resource
+def start_report_scheduler():
+    """In-process watchlist refresher; `python cli.py watch` does the same as a separate worker."""
+    return ReportScheduler(get_report_store()).start()
+
+if REPORT_SCHEDULER:
+    start_report_scheduler()
+
+@st.cache_resource
+def get_rating_engine():
+    """Glicko-2 ratings fed by every series any session (or job) reads; see ratings.py."""
+    return default_engine()
+
+@st.cache_resource
+def get_player_index():
+    """Cross-team player stats fed by the same series stream; see players.py."""
+    return default_index()
+
+@st.cache_resource
+def get_form_index():
+    """Windowed and time-decayed team form over the series stream; see form.py."""
+    return default_form_index()
+
+get_rating_engine()   # register the series listeners before the first job runs
+get_player_index()
+get_form_index()
+
+# --- RESULT SLOTS (PER-SESSION BUDGET OVER A SHARED CACHE) ---
+def session_results():
+    """This session's result slots (res_t1, res_t2, res_comp, res_rank); payloads live in the shared cache."""
+    if 'results' not in st.session_state:
+        st.session_state['results'] = SessionResults()
+    return st.session_state['results']
+
+def load_result(slot):
+    """The slot's payload, or None; a slot evicted from memory is dropped and explained in its notice."""
+    results = session_results()
+    payload = results.get(slot)
+    if payload is None and results.evicted(slot):
+        results.drop(slot)
+        st.session_state[f"notice_{slot}"] = ("warning", "♻️ This result was evicted from memory to make room for newer ones. Run it again to bring it back.")
+    return payload
+
+def store_scouting_result(slot, team_name, team_id, dp):
+    enriched_data = dp[0]
+    key = enriched_data.get("report_fingerprint") or enriched_data.get("fingerprint")
+    session_results().put(slot, f"scout:{key}", (team_name, team_id, dp))
+
+def store_comparison_result(comp):
+    session_results().put('res_comp', f"comp:{comp[2]['fingerprint']}", comp)
+
+def store_ranking_result(ranking):
+    session_results().put('res_rank', f"rank:{ranking['fingerprint']}", ranking)
+
+def clear_result(slot):
+    session_results().drop(slot)
+    # A job still running for the old selection keeps going, but no longer lands here
+    st.session_state.pop(f"job_{slot}", None)
+    st.session_state.pop(f"notice_{slot}", None)
+
+def render_memory_panel():
+    """Session result slots and shared-cache footprint for the DEBUG diagnostics expander."""
+    import pandas as pd
+    st.markdown("<h4 style='color:#00d4ff !important; font-family:Orbitron;'>🧠 MEMORY</h4>", unsafe_allow_html=True)
+    results = session_results()
+    shared = SHARED_RESULTS.stats()
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Session pinned", f"{results.pinned_bytes() / 2**20:.1f} / {results.budget_bytes / 2**20:.0f} MiB")
+    m2.metric("Shared results", f"{shared['bytes'] / 2**20:.1f} / {shared['max_bytes'] / 2**20:.0f} MiB", f"{shared['entries']} entries", delta_color="off")
+    m3.metric("Team universe", f"{estimate_size(st.session_state.get('guniv', [])) / 2**20:.2f} MiB", "shared", delta_color="off")
+    usage = results.usage()
+    if usage:
+        st.table(pd.DataFrame(usage).set_index("slot"))
+    job = st.session_state.get('prefetch')
+    if job:
+        st.caption(f"Prefetch: {job.status()}")
+    breakers = breaker_states()
+    if breakers:
+        st.table(pd.DataFrame(breakers).set_index("endpoint"))
+
+# Cached bodies only run on a miss; they flag it here so the caller can count hits
+_pdf_render_state = threading.local()
+
+@st.cache_data(show_spinner="Preparing Mission Dossier...", max_entries=64)
+def get_cached_pdf(report_fp, t_name, _ed, _pb, _sr, _wt, _cs):
+    # Keyed only by the report fingerprint; underscore args are skipped by Streamlit's hasher
+    stored = get_report_store().load_pdf(report_fp)
+    if stored:
+        return stored
+    _pdf_render_state.miss = True
+    return generate_pdf_report(t_name, _ed, _pb, _sr, _wt, _cs)
+
+@st.cache_data(show_spinner="Preparing Matchup Dossier...", max_entries=64)
+def get_cached_comparison_pdf(comp_fp, _na, _nb, _res, _stats):
+    _pdf_render_state.miss = True
+    return generate_comparison_pdf(_na, _nb, _res, _stats)
+
+def request_pdf(flag_key):
+    """Download-prep callback: marks the dossier for rendering on this rerun."""
+    st.session_state[flag_key] = True
+
+def on_demand_pdf_download(flag_key, prep_label, render, **download_kwargs):
+    """
+    Shows a prepare button until the coach asks for the PDF; only then calls
+    `render` (a cached generator) and swaps in the real download button.
+    """
+    if not st.session_state.get(flag_key):
+        st.button(
+            prep_label,
+            key=f"prep_{download_kwargs.get('key', flag_key)}",
+            on_click=request_pdf,
+            args=(flag_key,),
+            use_container_width=download_kwargs.get("use_container_width", False)
+        )
+        return
+    try:
+        _pdf_render_state.miss = False
+        pdf_bytes = render()
+        record_cache("pdf", hit=not _pdf_render_state.miss)
+        st.download_button(data=pdf_bytes, mime="application/pdf", **download_kwargs)
+    except Exception as e:
+        st.error(f"PDF Error: {e}")
+
+def render_telemetry_panel(mode_key):
+    """Stage latency, cache hit/miss and recent spans for the DEBUG diagnostics expander."""
+    import pandas as pd
+    st.markdown("<h4 style='color:#00d4ff !important; font-family:Orbitron;'>⏱️ PIPELINE TELEMETRY</h4>", unsafe_allow_html=True)
+    stages = stage_summary()
+    if stages:
+        st.table(pd.DataFrame(stages).set_index("stage"))
+    else:
+        st.info("No spans recorded in this server process yet.")
+
+    caches = cache_summary()
+    if caches:
+        st.table(pd.DataFrame.from_dict(caches, orient="index"))
+
+    spans = recent_spans(30)
+    if spans:
+        st.dataframe(pd.DataFrame(spans), use_container_width=True)
+
+    st.download_button(
+        label="⬇️ EXPORT TRACES (OTLP JSON)",
+        data=json.dumps(export_otlp_json()),
+        file_name="stratos_traces.json",
+        mime="application/json",
+        key=f"dl_traces_{mode_key}"
+    )
 
 # --- CALLBACKS TO PREVENT JUMPING ---
 def on_scout_tour_change():
     """Handles tournament selection in Tab 1."""
     sel_tn = st.session_state.get('scout_tour')
-    if 'res_t1' in st.session_state: del st.session_state['res_t1']
+    clear_result('res_t1')
+    st.session_state['tteams_pending'] = None
     if not sel_tn:
         st.session_state['tteams'] = []
         st.session_state['last_tid'] = None
+        st.session_state['prefetch'] = prefetch_tournament(None, [], previous=st.session_state.get('prefetch'))
         return
     
     tours = st.session_state.get('tours', [])
     tid = next((t['id'] for t in tours if t['name'] == sel_tn), None)
     if tid:
-        # We don't call full_screen_loader here as it's a callback
-        # But we fetch the data so it's ready for the next render
-        st.session_state['tteams'] = discover_teams_from_tournament(tid)
+        # Discovery runs on a background worker; the team picker shows a pending
+        # state and poll_team_discovery fills it in when the future resolves
+        st.session_state['tteams'] = []
         st.session_state['last_tid'] = tid
         st.session_state['scout_team'] = None # Reset team selection
+        future = discover_teams_async(tid)
+        if future.done():
+            apply_team_discovery(tid, future)
+        else:
+            st.session_state['tteams_pending'] = (tid, future)
+
+def apply_team_discovery(tid, future):
+    """Stores a finished team list and starts warming it (see prefetch.py)."""
+    teams = future.result() if not future.exception() else []
+    st.session_state['tteams'] = teams
+    st.session_state['tteams_pending'] = None
+    # Warm series lists/states for these teams so "Generate Report" hits the series cache
+    st.session_state['prefetch'] = prefetch_tournament(tid, teams, previous=st.session_state.get('prefetch'))
+
+@st.fragment(run_every=0.5)
+def poll_team_discovery():
+    """Only rendered while a discovery is pending; reruns the app once the team list lands."""
+    pending = st.session_state.get('tteams_pending')
+    if not pending:
+        return
+    tid, future = pending
+    if tid != st.session_state.get('last_tid'):
+        st.session_state['tteams_pending'] = None
+        return
+    if future.done():
+        apply_team_discovery(tid, future)
+        st.rerun()
 
 def on_global_change():
     """Reset global search results when search target changes."""
-    if 'res_t2' in st.session_state: del st.session_state['res_t2']
+    clear_result('res_t2')
 
 def on_comp_change():
     """Reset comparison results when teams change."""
-    if 'res_comp' in st.session_state: del st.session_state['res_comp']
+    clear_result('res_comp')
+
+def on_rank_change():
+    """Reset the power ranking when the tournament changes."""
+    clear_result('res_rank')
 
 
+def show_staleness(*datasets):
+    """Caption when any of the data was served from expired GRID cache entries."""
+    ages = [d.get("stale_age_s") for d in datasets if d.get("stale_age_s")]
+    if ages:
+        st.warning(f"🕒 GRID is slow or unavailable. Parts of this report use cached data up to {describe_age(max(ages))} old; a refresh is running in the background.")
+
 def display_scouting_results(team_name, team_id, mode_key, data_pack):
     """Cleanly displays previously fetched scouting data."""
     enriched_data, playbook, structured_roster, winning_trends, counter_strategy = data_pack
+    show_staleness(enriched_data)
     
     # If LLM analysis failed but we have GRID data, show what we have
     is_partial = playbook is None
@@ -613,6 +845,7 @@ def display_scouting_results(team_name, team_id, mode_key, data_pack):
     st.markdown("<div class='section-title'>📅 Recent Match History</div>", unsafe_allow_html=True)
     st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Details of the most recent matches including dates, opponents, and final scores retrieved from GRID.</p>", unsafe_allow_html=True)
     if enriched_data["series"]:
+        import pandas as pd  # deferred: only needed once there is a table to draw
         match_data = []
         for s in enriched_data["series"]:
             match_data.append({
@@ -629,6 +862,8 @@ def display_scouting_results(team_name, team_id, mode_key, data_pack):
     else:
         st.info("No engagement history discovered.")
 
+    render_recent_form(team_name)
+
     # --- 3. ROSTER ---
     st.markdown("<div class='section-title'>👥 Player Analysis</div>", unsafe_allow_html=True)
     st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Individual player performance breakdown, including combat ratings and specific tactical roles.</p>", unsafe_allow_html=True)
@@ -660,6 +895,9 @@ def display_scouting_results(team_name, team_id, mode_key, data_pack):
                 with st.expander("VIEW INTEL"):
                     st.markdown(f"<p style='color:#10b981 !important;'><b>💪 STRENGTH:</b> {pa.get('strength', 'High impact')}</p>", unsafe_allow_html=True)
                     st.markdown(f"<p style='color:#ef4444 !important;'><b>⚠️ WEAKNESS:</b> {pa.get('weakness', 'Vulnerable')}</p>", unsafe_allow_html=True)
+                    career = get_player_index().player(pr['name'])
+                    if career:
+                        st.caption(f"📇 Career: {career['series']} series · KDA {career['avg_kda']} · {', '.join(t['team'] for t in career['teams'])}")
 
     # --- 4. PLAYBOOK ---
     st.markdown("<div class='section-title'>🧠 AI Strategic Playbook</div>", unsafe_allow_html=True)
@@ -685,20 +923,22 @@ def display_scouting_results(team_name, team_id, mode_key, data_pack):
 
     st.markdown("<br>", unsafe_allow_html=True)
     
+    # --- LIVE SERIES ---
+    render_live_tracker(team_name, enriched_data["series"], mode_key)
+
     # --- 5. EXPORT OPTIONS ---
     if not is_partial:
         st.markdown("<div class='section-title'>📤 Download Report</div>", unsafe_allow_html=True)
-        try:
-            pdf_bytes = get_cached_pdf(team_name, enriched_data, playbook, structured_roster, winning_trends, counter_strategy)
-            st.download_button(
-                label="📕 DOWNLOAD SCOUTING REPORT (PDF)", 
-                data=pdf_bytes, 
-                file_name=f"{team_name}_scouting_report.pdf", 
-                mime="application/pdf", 
-                key=f"dl_pdf_{mode_key}_{team_id}"
-            )
-        except Exception as e:
-            st.error(f"PDF Error: {e}")
+        report_fp = enriched_data.get("report_fingerprint") or report_fingerprint(team_name, data_pack)
+        # PDF bytes are only rendered once the coach asks for them, then served from cache by fingerprint
+        on_demand_pdf_download(
+            f"pdf_req_{mode_key}_{report_fp}",
+            "📕 PREPARE SCOUTING REPORT (PDF)",
+            lambda: get_cached_pdf(report_fp, team_name, enriched_data, playbook, structured_roster, winning_trends, counter_strategy),
+            label="📕 DOWNLOAD SCOUTING REPORT (PDF)",
+            file_name=f"{team_name}_scouting_report.pdf",
+            key=f"dl_pdf_{mode_key}_{team_id}"
+        )
 
     # ALWAYS SHOW DIAGNOSTICS if debug is on, OR if we had insufficient data
     if DEBUG_MODE or is_partial:
@@ -706,42 +946,240 @@ def display_scouting_results(team_name, team_id, mode_key, data_pack):
             if is_partial:
                 st.error("⚠️ DATA ANOMALY: The GRID API returned series metadata, but the state data for these sessions was incompatible or missing.")
             st.json(enriched_data)
+            if DEBUG_MODE:
+                render_telemetry_panel(mode_key)
+                render_memory_panel()
+
+def render_live_tracker(team_name, series, mode_key):
+    """Picks an in-progress series for this team (recent ones from the scouted `series`) and follows it in live_panel."""
+    st.markdown("<div class='section-title'>🔴 Live Series</div>", unsafe_allow_html=True)
+    st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Follow an ongoing series: only changed games are re-aggregated on each GRID update.</p>", unsafe_allow_html=True)
+    options = {f"{s['date']} · {s['tournament']} · {s['series_id']}": s['series_id'] for s in series[:5]}
+    l1, l2, l3 = st.columns([3, 2, 1])
+    picked = l1.selectbox("Series", list(options), key=f"live_pick_{mode_key}")
+    typed_id = l2.text_input("…or series id", key=f"live_id_{mode_key}")
+    if l3.button("🔴 TRACK", key=f"live_btn_{mode_key}", use_container_width=True):
+        series_id = typed_id.strip() or options.get(picked)
+        if series_id:
+            st.session_state[f"live_{mode_key}"] = (series_id, team_name)
+    if st.session_state.get(f"live_{mode_key}"):
+        live_panel(mode_key)
+
+@st.fragment(run_every=LIVE_POLL_INTERVAL)
+def live_panel(mode_key):
+    """Redraws from the shared tracker's latest snapshot; the polling itself runs on the tracker thread."""
+    import pandas as pd
+    series_id, team_name = st.session_state[f"live_{mode_key}"]
+    tracker = track_series(series_id, team_name)
+    update = tracker.view()
+    status = tracker.status()
+    if update is None:
+        st.info(f"⏳ Waiting for the first GRID state of series {series_id}...")
+        if status["error"]:
+            st.caption(f"⚠️ {status['error']}")
+        return
+    if not update["in_series"]:
+        st.warning(f"⚠️ {team_name} is not one of the teams in series {series_id}.")
+        return
 
-def run_scouting_workflow(team_name, team_id, tournament_id=None):
-    """Core logic to handle data collection via status bar."""
-    with st.status("⚡ INITIATING STRATEGIC DATA EXTRACTION...", expanded=True) as status:
-        st.write("🛰️ Connecting to GRID Esports Data API...")
-        s_info_list = fetch_series_info_for_team(team_id, tournament_id=tournament_id)
-        
-        if not s_info_list:
-            status.update(label="❌ NO COMBAT DATA FOUND", state="error")
-            st.error("⚠️ No recent data found for this team. Please select other teams.")
-            return None
-        
-        st.write("🔬 Analyzing Match Statistics...")
-        enriched_data = collect_team_data(team_name, s_info_list)
-        
-        # Double check if we have series data after enrichment
-        if not enriched_data.get("series"):
-            status.update(label="❌ INSUFFICIENT DATA", state="error")
-            st.warning("⚠️ Data found, but it is too limited for AI modeling.")
-            # Return empty LLM parts so display_scouting_results can still show the diagnostic JSON
-            return (enriched_data, None, None, None, None)
-
-        st.write("🧠 Generating AI Scouting Insights...")
-        playbook, structured_roster, winning_trends, counter_strategy = generate_scouting_report(team_name, enriched_data)
-        status.update(label=f"ANALYSIS COMPLETE: {team_name.upper()} REPORT GENERATED", state="complete")
-        
-        return (enriched_data, playbook, structured_roster, winning_trends, counter_strategy)
+    state = "🔴 LIVE" if not update["finished"] else ("🏆 WON" if update["series_win"] else "❌ LOST")
+    m1, m2, m3 = st.columns(3)
+    m1.metric(f"{update['team']} vs {update['opponent']}", state)
+    m2.metric("Maps won", f"{update['maps_won']} / {len(update['game_stats'])}")
+    m3.metric("Feed version", str(update["version"]), f"{status['polls']} polls", delta_color="off")
+    if update["game_stats"]:
+        games = pd.DataFrame(update["game_stats"])
+        games.index = games.index + 1
+        st.table(games)
+    if update["top_players"]:
+        st.table(pd.DataFrame(update["top_players"]).set_index("name"))
+    if update["changed_games"]:
+        st.caption(f"Last update re-aggregated game(s) {', '.join(map(str, update['changed_games']))}.")
+    if status["error"]:
+        st.caption(f"⚠️ Last poll failed: {status['error']}")
+
+def render_rating_prior(team_a, team_b):
+    """
+    Instant rating-based prior for the selected pair ({'name', 'id'} teams): no
+    GRID or LLM calls on the script thread. An unrated team's recent results are
+    read in the background with the winner-only "summary" profile.
+    """
+    engine = get_rating_engine()
+    ra, rb = engine.rating(team_a['name']), engine.rating(team_b['name'])
+    for team, r in ((team_a, ra), (team_b, rb)):
+        if r is None:
+            warm_results(team)
+    team_a, team_b = team_a['name'], team_b['name']
+    p1, p2, p3 = st.columns(3)
+    for col, name, r in ((p1, team_a, ra), (p3, team_b, rb)):
+        col.metric(f"{name} rating", f"{r.rating:.0f} ± {r.rd:.0f}" if r else "unrated", f"{r.wins}W-{r.games - r.wins}L tracked" if r else None, delta_color="off")
+    if ra and rb:
+        p2.metric(f"P({team_a} wins)", f"{engine.win_probability(team_a, team_b) * 100:.0f}%")
+    else:
+        p2.caption("📈 Reading recent results for the unrated team(s); the prior fills in on the next refresh.")
+
+FORM_WINDOWS = [
+    ("All tracked", {}),
+    ("Last 5 series", {"series": 5}),
+    ("Last 10 series", {"series": 10}),
+    ("Last 30 days", {"days": 30}),
+    ("Last 90 days", {"days": 90}),
+    (f"Decayed ({FORM_HALF_LIFE:g}-day half-life)", {"half_life": FORM_HALF_LIFE})
+]
+
+def render_recent_form(team_name):
+    """Every form window side by side; each row is a lookup in the form index, not a re-aggregation."""
+    import pandas as pd
+    index = get_form_index()
+    views = [(label, index.form(team_name, **kwargs)) for label, kwargs in FORM_WINDOWS]
+    if views[0][1] is None:
+        return
+    st.markdown("<div class='section-title'>📈 Recent Form</div>", unsafe_allow_html=True)
+    st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>The same metrics over recent windows and with older series decayed, across every series of this team the app has read.</p>", unsafe_allow_html=True)
+    st.table(pd.DataFrame([{
+        "Window": label, "Series": v["series"], "Win %": v["win_rate"], "Map Win %": v["map_win_rate"],
+        "Kills / Map": v["avg_kills"], "Deaths / Map": v["avg_deaths"], "Net Worth / Map": v["avg_net_worth"]
+    } for label, v in views]).set_index("Window"))
+    decayed = views[-1][1]["top_players"]
+    if decayed:
+        st.caption("🔥 In form (decayed KDA): " + " · ".join(f"{p['name']} {p['avg_kda']}" for p in decayed[:3]))
+
+def render_player_search():
+    """Player lookup across every team: a read of the player index, no GRID calls."""
+    import pandas as pd
+    with st.expander("🔎 PLAYER SEARCH"):
+        query = st.text_input("Player name", key="player_query", placeholder="Type part of a player name...")
+        if not query:
+            st.caption(f"📇 {get_player_index().stats()['players']} players indexed from scouted series.")
+            return
+        hits = get_player_index().search(query)
+        if not hits:
+            st.info("No indexed player matches that name yet.")
+            return
+        st.dataframe(pd.DataFrame([{
+            "Player": h["name"], "Team": h["team"], "Series": h["series"], "Games": h["participation"],
+            "KDA": h["avg_kda"], "Avg Kills": h["avg_kills"], "Avg Deaths": h["avg_deaths"],
+            "Avg Net Worth": h["avg_networth"], "Teams": ", ".join(t["team"] for t in h["teams"]), "Last Seen": h["last_seen"]
+        } for h in hits]).set_index("Player"), use_container_width=True)
+
+def render_power_ranking(ranking):
+    """Ranked table, pairwise win-probability heatmap and the field summary for one tournament."""
+    import pandas as pd
+    import altair as alt  # deferred: ships with streamlit, only needed for the heatmap
+    show_staleness(ranking)
+    collection = ranking["collection"]
+    st.caption(f"♻️ {collection['series_fetched']} unique series covered {collection['series_requested']} team results.")
+
+    table = pd.DataFrame(ranking["table"]).rename(columns={
+        "rank": "#", "team": "Team", "power": "Power", "series": "Series",
+        "win_rate": "Win Rate", "map_win_rate": "Map Win %", "kda": "Avg KDA"
+    })
+    st.dataframe(
+        table.set_index("#"),
+        use_container_width=True,
+        column_config={"Power": st.column_config.ProgressColumn("Power", help="Mean win probability vs the rest of the field", min_value=0.0, max_value=1.0, format="%.2f")}
+    )
+    if ranking["unranked"]:
+        st.caption(f"⚠️ No usable series: {', '.join(ranking['unranked'])}")
+
+    st.markdown("<div class='section-title' style='font-size:1.1rem; border-bottom: 1px solid #1e3a5f;'>📐 HEAD-TO-HEAD WIN PROBABILITY</div>", unsafe_allow_html=True)
+    teams = ranking["teams"]
+    cells = pd.DataFrame(
+        [{"Team": a, "Opponent": b, "P(win)": p} for a, row in zip(teams, ranking["matrix"]) for b, p in zip(teams, row) if a != b]
+    )
+    heatmap = alt.Chart(cells).mark_rect().encode(
+        x=alt.X("Opponent:N", sort=teams),
+        y=alt.Y("Team:N", sort=teams),
+        color=alt.Color("P(win):Q", scale=alt.Scale(domain=[0, 1], scheme="redblue")),
+        tooltip=["Team", "Opponent", alt.Tooltip("P(win):Q", format=".0%")]
+    )
+    st.altair_chart(heatmap, use_container_width=True)
+
+    st.markdown("<div class='trend-box'><span style='color:#00d4ff;font-family:Orbitron;font-size:0.9rem;'>🧠 FIELD SUMMARY</span></div>", unsafe_allow_html=True)
+    st.markdown(ranking["summary"] or "AI summary unavailable; the ranking above is purely statistical.")
+
+def start_scouting_job(res_slot, team_name, team_id, tournament_id=None):
+    """Enqueues the scouting job (which serves a fresh stored report when there is one) and returns."""
+    clear_result(res_slot)
+    job_id = get_job_queue().submit("scout", name=team_name, id=team_id, tournament_id=tournament_id)
+    st.session_state[f"job_{res_slot}"] = {"id": job_id, "kind": "scout", "team_name": team_name, "team_id": team_id}
+
+def start_comparison_job(team_a, team_b):
+    clear_result('res_comp')
+    job_id = get_job_queue().submit("compare", team_a={"name": team_a['name'], "id": team_a['id']}, team_b={"name": team_b['name'], "id": team_b['id']})
+    st.session_state['job_res_comp'] = {"id": job_id, "kind": "compare"}
+
+def start_ranking_job(tournament):
+    clear_result('res_rank')
+    job_id = get_job_queue().submit("rank", tournament_id=tournament['id'], tournament_name=tournament['name'])
+    st.session_state['job_res_rank'] = {"id": job_id, "kind": "rank"}
+
+def finish_job(res_slot, ticket, result):
+    """Moves a finished job's result into the session's result slot (or leaves a notice)."""
+    if ticket["kind"] == "rank":
+        if result:
+            store_ranking_result(result)
+        else:
+            st.session_state[f"notice_{res_slot}"] = ("error", "⚠️ No team in this tournament has usable series data.")
+        return
+    if ticket["kind"] == "compare":
+        if result and result[2]:
+            store_comparison_result(result)
+        else:
+            st.session_state[f"notice_{res_slot}"] = ("error", "⚠️ Comparison failed: no usable data for one of the teams.")
+        return
+    if not result:
+        st.session_state[f"notice_{res_slot}"] = ("error", "⚠️ No recent data found for this team. Please select other teams.")
+        return
+    # Partial pack: series metadata found, but nothing usable for the LLM.
+    # display_scouting_results still shows the diagnostic JSON.
+    if result[1] is None:
+        st.session_state[f"notice_{res_slot}"] = ("warning", "⚠️ Data found, but it is too limited for AI modeling.")
+    store_scouting_result(res_slot, ticket["team_name"], ticket["team_id"], result)
+
+@st.fragment(run_every=1.0)
+def poll_job(res_slot, label):
+    """Live status of this session's job for `res_slot`; reruns the app once the result lands."""
+    ticket = st.session_state.get(f"job_{res_slot}")
+    if not ticket:
+        return
+    queue = get_job_queue()
+    job = queue.status(ticket["id"])
+    if job is None or job["state"] in ("done", "failed", "cancelled"):
+        st.session_state[f"job_{res_slot}"] = None
+        if job and job["state"] == "done":
+            finish_job(res_slot, ticket, queue.result(ticket["id"]))
+        else:
+            st.session_state[f"notice_{res_slot}"] = ("error", f"⚠️ Report job failed: {job['error'] if job else 'job expired'}")
+        st.rerun()
+
+    if job["state"] == "queued":
+        label = f"⏳ QUEUED (#{job['queue_position']}) — {label}"
+    with st.status(label, expanded=True):
+        for message in job["events"]:
+            st.write(message)
+
+def render_job_area(res_slot, label):
+    st.markdown("<div style='height:100px;'></div>", unsafe_allow_html=True)
+    # Center the status by putting it in a narrow col
+    _, log_col, _ = st.columns([1, 2, 1])
+    with log_col:
+        poll_job(res_slot, label)
+
+def show_notice(res_slot):
+    notice = st.session_state.pop(f"notice_{res_slot}", None)
+    if notice:
+        level, message = notice
+        (st.error if level == "error" else st.warning)(message)
 
 # --- UI TABS ---
-t1, t2, t3 = st.tabs([" 🏆 Quick Scouting ", " 🌍 Global Team Search ", " ⚔️ Matchup Analysis "])
+t1, t2, t3, t4 = st.tabs([" 🏆 Quick Scouting ", " 🌍 Global Team Search ", " ⚔️ Matchup Analysis ", " 🏅 Power Ranking "])
 
 def reset_t1():
-    if 'res_t1' in st.session_state: del st.session_state['res_t1']
+    clear_result('res_t1')
 
 def reset_t2():
-    if 'res_t2' in st.session_state: del st.session_state['res_t2']
+    clear_result('res_t2')
 
 with t1:
     # 🎯 TARGET ACQUISITION (TOP FIXED)
@@ -764,15 +1202,19 @@ with t1:
         with sel_c2:
             st.markdown("<label>Select Target Team</label>", unsafe_allow_html=True)
             tteams = st.session_state.get('tteams', [])
+            discovering = bool(st.session_state.get('tteams_pending'))
             sel_team = st.selectbox(
                 "Select Target Team", 
                 [t['name'] for t in tteams], 
                 index=None, 
-                placeholder="Target Team...", 
+                placeholder="⏳ Scanning circuit for teams..." if discovering else "Target Team...", 
                 key="scout_team", 
                 on_change=reset_t1,
+                disabled=discovering,
                 label_visibility="collapsed"
             )
+            if discovering:
+                poll_team_discovery()
 
         with sel_c3:
             st.markdown("<div style='height:28px;'></div>", unsafe_allow_html=True)
@@ -783,24 +1225,20 @@ with t1:
     
     if execute_btn and sel_team:
         ite = next(t for t in tteams if t['name'] == sel_team)
-        with main_area.container():
-            st.markdown("<div style='height:100px;'></div>", unsafe_allow_html=True)
-            # Center the status by putting it in a narrow col
-            _, log_col, _ = st.columns([1, 2, 1])
-            with log_col:
-                dp = run_scouting_workflow(sel_team, ite['id'], st.session_state.get('last_tid'))
-        
-        if dp:
-            st.session_state['res_t1'] = (sel_team, ite['id'], dp)
-            # We don't call main_area.empty() here to avoid the "jumping" effect
-            # Instead, the next block will overwrite the main_area content
+        start_scouting_job('res_t1', sel_team, ite['id'], st.session_state.get('last_tid'))
 
-    if 'res_t1' in st.session_state:
-        n, i, data = st.session_state['res_t1']
+    res_t1 = load_result('res_t1')
+    if st.session_state.get('job_res_t1'):
+        with main_area.container():
+            render_job_area('res_t1', "⚡ INITIATING STRATEGIC DATA EXTRACTION...")
+    elif res_t1:
+        n, i, data = res_t1
         with main_area.container():
+            show_notice('res_t1')
             display_scouting_results(n, i, "t1", data)
     else:
         with main_area.container():
+            show_notice('res_t1')
             st.markdown("<div style='height:400px; display:flex; flex-direction:column; align-items:center; justify-content:center; border:2px dashed #1e3a5f; border-radius:20px;'><h3 style='color:#1e3a5f; font-family:Orbitron;'>Ready for Analysis</h3><p style='color:#1e3a5f;'>Select a tournament and team above to begin.</p></div>", unsafe_allow_html=True)
 
 
@@ -816,83 +1254,72 @@ with t2:
             st.markdown("<div style='height:30px;'></div>", unsafe_allow_html=True)
             g_execute = st.button("🚀 Start Global Analysis", use_container_width=True, key="btn_global")
 
+    render_player_search()
+
     g_main = st.empty()
     
     if g_execute and sel_gu:
         ite = next(t for t in univ if t['display'] == sel_gu)
+        start_scouting_job('res_t2', ite['name'], ite['id'])
+
+    res_t2 = load_result('res_t2')
+    if st.session_state.get('job_res_t2'):
         with g_main.container():
-            st.markdown("<div style='height:100px;'></div>", unsafe_allow_html=True)
-            _, lcol, _ = st.columns([1, 2, 1])
-            with lcol:
-                dp = run_scouting_workflow(ite['name'], ite['id'])
-        if dp:
-            st.session_state['res_t2'] = (ite['name'], ite['id'], dp)
-            g_main.empty()
-
-    if 'res_t2' in st.session_state:
-        n, i, data = st.session_state['res_t2']
+            render_job_area('res_t2', "⚡ INITIATING STRATEGIC DATA EXTRACTION...")
+    elif res_t2:
+        n, i, data = res_t2
         with g_main.container():
+            show_notice('res_t2')
             display_scouting_results(n, i, "g2", data)
     else:
         with g_main.container():
+            show_notice('res_t2')
             st.markdown("<div style='height:400px; display:flex; flex-direction:column; align-items:center; justify-content:center; border:2px dashed #1e3a5f; border-radius:20px;'><h3 style='color:#1e3a5f; font-family:Orbitron;'>Global Search Standby</h3><p style='color:#1e3a5f;'>Select a team to begin global analysis</p></div>", unsafe_allow_html=True)
 
 # --- UI TABS ---
 
 with t3:
-    # Matchup Analysis now uses the pre-synchronized 'ca' and 'cb' lists
+    # Matchup Analysis uses the pre-synchronized 'guniv' list for both pickers
     st.markdown("<div class='section-title'>⚔️ Team Comparison Analysis</div>", unsafe_allow_html=True)
     st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Select two teams to compare their stats side-by-side and see an AI-generated battle verdict.</p>", unsafe_allow_html=True)
     with st.container(border=True):
         c_cols = st.columns([1, 1, 0.8])
         with c_cols[0]:
-            sa = st.selectbox("TEAM ALPHA", [t['display'] for t in st.session_state.get('ca', [])], key="sa", placeholder="Select first team...", index=None, on_change=on_comp_change)
+            sa = st.selectbox("TEAM ALPHA", [t['display'] for t in st.session_state.get('guniv', [])], key="sa", placeholder="Select first team...", index=None, on_change=on_comp_change)
         with c_cols[1]:
-            sb = st.selectbox("TEAM BETA", [t['display'] for t in st.session_state.get('cb', [])], key="sb", placeholder="Select second team...", index=None, on_change=on_comp_change)
+            sb = st.selectbox("TEAM BETA", [t['display'] for t in st.session_state.get('guniv', [])], key="sb", placeholder="Select second team...", index=None, on_change=on_comp_change)
         with c_cols[2]:
             st.markdown("<br>", unsafe_allow_html=True)
             c_execute = st.button("⚔️ Start Comparison", use_container_width=True, key="btn_matchup")
+        if sa and sb:
+            render_rating_prior(
+                next(t for t in st.session_state['guniv'] if t['display'] == sa),
+                next(t for t in st.session_state['guniv'] if t['display'] == sb)
+            )
 
     c_main = st.empty()
 
     if c_execute and sa and sb:
-        oa = next(t for t in st.session_state['ca'] if t['display'] == sa)
-        ob = next(t for t in st.session_state['cb'] if t['display'] == sb)
-        
-        with c_main.container():
-            st.markdown("<div style='height:100px;'></div>", unsafe_allow_html=True)
-            _, c_log, _ = st.columns([1, 2, 1])
-            with c_log:
-                with st.status("⚔️ SIMULATING COMBAT ENGAGEMENT...", expanded=True) as status:
-                    st.write(f"📊 Gathering {oa['name']} match data...")
-                    da = collect_team_data(oa['name'], fetch_series_info_for_team(oa['id'], limit=10))
-                    st.write(f"📊 Gathering {ob['name']} match data...")
-                    db = collect_team_data(ob['name'], fetch_series_info_for_team(ob['id'], limit=10))
-                    st.write("🧠 Comparing team playstyles...")
-                    res = generate_comparison_report(oa['name'], da, ob['name'], db)
-                    status.update(label="COMPARISON COMPLETE!", state="complete")
-        
-        if res:
-            st.session_state['res_comp'] = (oa['name'], ob['name'], res, da, db)
-            c_main.empty()
+        oa = next(t for t in st.session_state['guniv'] if t['display'] == sa)
+        ob = next(t for t in st.session_state['guniv'] if t['display'] == sb)
+        start_comparison_job(oa, ob)
 
-    if 'res_comp' in st.session_state:
-        na, nb, res, da, db = st.session_state['res_comp']
+    res_comp = load_result('res_comp')
+    if st.session_state.get('job_res_comp'):
+        with c_main.container():
+            render_job_area('res_comp', "⚔️ SIMULATING COMBAT ENGAGEMENT...")
+    elif res_comp:
+        import pandas as pd  # deferred: only needed once there is a matchup to tabulate
+        na, nb, res, da, db = res_comp
         
         # Calculate Stats for Side-by-Side
-        def get_brief_stats(data):
-            twins = sum(1 for s in data["series"] if s["series_win"])
-            tser = len(data["series"])
-            wr = f"{round((twins/tser)*100,1) if tser > 0 else 0}%"
-            kda = round(sum(p['avg_kda'] for p in data['top_players'])/len(data['top_players']),1) if data['top_players'] else 0
-            return wr, tser, kda, data.get('map_win_rate', 0)
-
         wra, tsa, kdaa, mwra = get_brief_stats(da)
         wrb, tsb, kdab, mwrb = get_brief_stats(db)
 
         with c_main.container():
             st.markdown("<div class='section-title'>🥊 Matchup Analysis</div>", unsafe_allow_html=True)
             st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Detailed side-by-side comparison of the two selected teams with AI-predicted outcomes.</p>", unsafe_allow_html=True)
+            show_staleness(da, db)
             
             # --- SIDE BY SIDE STATS ---
             st.markdown("<div class='section-title' style='font-size:1.1rem; border-bottom: 1px solid #1e3a5f;'>📊 TACTICAL SIDE-BY-SIDE</div>", unsafe_allow_html=True)
@@ -919,7 +1346,15 @@ with t3:
                     f"{nb} (KDA)": pb_top[idx]['avg_kda'] if idx < len(pb_top) else "-",
                 })
             st.table(pd.DataFrame(p_comp_data).set_index("Rank"))
-
+            keys = [(name, get_player_index().key_player(name)) for name in (na, nb)]
+            keys = [f"{name}: {kp['name']} ({kp['avg_kda']} KDA)" for name, kp in keys if kp]
+            if keys:
+                st.caption(f"📇 Career key players from the player index · {' · '.join(keys)}")
+
+            pred = res.get("prediction")
+            if pred and pred["verdict"] != res["verdict"]:
+                drivers = ", ".join(pred["drivers"]) or "no clear edge"
+                st.markdown(f"<div class='trend-box'><span style='color:#00d4ff;font-family:Orbitron;font-size:0.9rem;'>📐 STATISTICAL VERDICT</span><br><p style='font-size:1.05rem; color:#ffffff !important;'><b>{pred['favorite']}</b> {pred['probability'] * 100:.0f}% · {pred['confidence']} confidence{'' if pred.get('calibrated') else ' · uncalibrated'} · edges: {drivers}</p></div>", unsafe_allow_html=True)
             st.markdown(f"<div class='trend-box'><span style='color:#00d4ff;font-family:Orbitron;font-size:0.9rem;'>🏆 ANALYSIS VERDICT</span><br><p style='font-size:1.2rem; color:#ffffff !important;'>{res['verdict']}</p></div>", unsafe_allow_html=True)
             
             row1_c1, row1_c2 = st.columns(2)
@@ -957,23 +1392,46 @@ with t3:
             # --- COMPARISON EXPORT ---
             st.markdown("<div class='section-title'>📤 Download Comparison Report</div>", unsafe_allow_html=True)
             st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Export this head-to-head comparison as a professional PDF report.</p>", unsafe_allow_html=True)
-            try:
-                # Prepare stats bundle for PDF
-                stats_bundle = {
-                    "team_a": {"Win Rate": wra, "Series Played": tsa, "Average KDA": kdaa, "Map Win %": f"{mwra}%"},
-                    "team_b": {"Win Rate": wrb, "Series Played": tsb, "Average KDA": kdab, "Map Win %": f"{mwrb}%"}
-                }
-                comp_pdf = generate_comparison_pdf(na, nb, res, stats_bundle)
-                st.download_button(
-                    label="📕 DOWNLOAD COMPARISON DOSSIER (PDF)",
-                    data=comp_pdf,
-                    file_name=f"{na}_vs_{nb}_scouting_report.pdf",
-                    mime="application/pdf",
-                    key="dl_comp_pdf",
-                    use_container_width=True
-                )
-            except Exception as e:
-                st.error(f"PDF Error: {e}")
+            comp_fp = res.get("fingerprint") or comparison_fingerprint(na, nb, res, da, db)
+            on_demand_pdf_download(
+                f"pdf_req_comp_{comp_fp}",
+                "📕 PREPARE COMPARISON DOSSIER (PDF)",
+                lambda: get_cached_comparison_pdf(comp_fp, na, nb, res, build_stats_bundle(da, db)),
+                label="📕 DOWNLOAD COMPARISON DOSSIER (PDF)",
+                file_name=f"{na}_vs_{nb}_scouting_report.pdf",
+                key="dl_comp_pdf",
+                use_container_width=True
+            )
     else:
         with c_main.container():
+            show_notice('res_comp')
             st.markdown("<div style='height:400px; display:flex; flex-direction:column; align-items:center; justify-content:center; border:2px dashed #0077ff; border-radius:20px;'><h3 style='color:#0077ff; font-family:Orbitron;'>Comparison Engine Ready</h3><p style='color:#0077ff;'>Select two teams to begin analysis</p></div>", unsafe_allow_html=True)
+
+
+with t4:
+    st.markdown("<div class='section-title'>🏅 Tournament Power Ranking</div>", unsafe_allow_html=True)
+    st.markdown("<p style='margin-top: -20px; color: #888; font-size: 0.9rem;'>Rank every team in a tournament from one shared data pass, with the full head-to-head probability matrix.</p>", unsafe_allow_html=True)
+    with st.container(border=True):
+        r_cols = st.columns([2, 0.8])
+        with r_cols[0]:
+            rank_tn = st.selectbox("TOURNAMENT", [t['name'] for t in st.session_state.get('tours', [])], key="rank_tour", placeholder="Choose a circuit...", index=None, on_change=on_rank_change)
+        with r_cols[1]:
+            st.markdown("<br>", unsafe_allow_html=True)
+            r_execute = st.button("🏅 Rank Field", use_container_width=True, key="btn_rank")
+
+    r_main = st.empty()
+
+    if r_execute and rank_tn:
+        start_ranking_job(next(t for t in st.session_state['tours'] if t['name'] == rank_tn))
+
+    res_rank = load_result('res_rank')
+    if st.session_state.get('job_res_rank'):
+        with r_main.container():
+            render_job_area('res_rank', "🏅 RANKING THE FIELD...")
+    elif res_rank:
+        with r_main.container():
+            render_power_ranking(res_rank)
+    else:
+        with r_main.container():
+            show_notice('res_rank')
+            st.markdown("<div style='height:400px; display:flex; flex-direction:column; align-items:center; justify-content:center; border:2px dashed #0077ff; border-radius:20px;'><h3 style='color:#0077ff; font-family:Orbitron;'>Ranking Engine Ready</h3><p style='color:#0077ff;'>Select a tournament to rank its teams</p></div>", unsafe_allow_html=True)
@@ -0,0 +1,315 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+import grid_client
+import llm_analyzer
+from grid_models import SeriesState
+from mock_grid import MockGridServer, FakeLLM, load_recording
+from synthetic_data import TITLES, generate_recording, series_state_pairs
+
+# ==================================================
+# OFFLINE BENCHMARK SUITE: python benchmark.py run
+# ==================================================
+DEFAULT_RECORDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sample_grid_recording.json")
+DEFAULT_SCALES = "10,100,1000"
+
+def _log(message):
+    print(message, file=sys.stderr)
+
+def _timed(fn, repeat, warmup=1):
+    """Runs fn `warmup` untimed times then `repeat` timed times; returns (last_result, [seconds, ...])."""
+    times = []
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return result, times
+
+def _row(name, scale, times, items=None):
+    ordered = sorted(times)
+    mean = statistics.fmean(times)
+    return {
+        "benchmark": name,
+        "scale": scale,
+        "mean_ms": round(mean * 1000, 2),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+        "items_per_s": round(items / mean, 1) if items and mean > 0 else None
+    }
+
+def _cold(fn):
+    """Clears the series cache and team index first so GRID benchmarks keep measuring the network path."""
+    def run():
+        grid_client.clear_series_cache()
+        grid_client.TEAM_INDEX.clear()
+        return fn()
+    return run
+
+def run_scale(recording, scale, repeat, latency_ms, jitter_ms, llm_latency_ms):
+    """One full pass of every benchmark against a mock server sized to `scale` series."""
+    from report_generator import generate_pdf_report, generate_comparison_pdf
+    from pipeline import build_stats_bundle
+
+    team = recording["team"]
+    tournament_id = recording["tournaments"][0]["id"]
+    rows = []
+
+    with MockGridServer(recording, scale=scale, latency_ms=latency_ms, jitter_ms=jitter_ms) as mock:
+        grid_client.configure_endpoints(mock.central_data_url, mock.series_state_url)
+        llm_analyzer.set_llm_override(FakeLLM(latency_ms=llm_latency_ms))
+        try:
+            _, t = _timed(_cold(lambda: grid_client.discover_teams_from_tournament(tournament_id)), repeat)
+            rows.append(_row("discover_teams_from_tournament", scale, t, scale))
+            _, t = _timed(_cold(lambda: grid_client.discover_teams_from_tournament_list([tournament_id])), repeat)
+            rows.append(_row("discover_teams_from_tournament_list", scale, t, scale))
+
+            s_info, t = _timed(_cold(lambda: grid_client.fetch_series_info_for_team(team["id"], limit=scale)), repeat)
+            rows.append(_row("fetch_series_info_for_team", scale, t, scale))
+            enriched, t = _timed(_cold(lambda: grid_client.collect_team_data(team["name"], s_info, max_matches=scale)), repeat)
+            rows.append(_row("collect_team_data", scale, t, len(s_info)))
+            _, t = _timed(_cold(lambda: grid_client.collect_team_data(team["name"], s_info, max_matches=scale, profile="summary")), repeat)
+            rows.append(_row("collect_team_data[summary]", scale, t, len(s_info)))
+            _, t = _timed(lambda: grid_client.collect_team_data(team["name"], s_info, max_matches=scale), repeat)
+            rows.append(_row("collect_team_data[warm]", scale, t, len(s_info)))
+
+            report, t = _timed(lambda: llm_analyzer.generate_scouting_report(team["name"], enriched), repeat)
+            rows.append(_row("generate_scouting_report", scale, t))
+            comp, t = _timed(lambda: llm_analyzer.generate_comparison_report(team["name"], enriched, "Opponent", enriched), repeat)
+            rows.append(_row("generate_comparison_report", scale, t))
+
+            for name, fn in [
+                ("generate_pdf_report", lambda: generate_pdf_report(team["name"], enriched, *report)),
+                ("generate_comparison_pdf", lambda: generate_comparison_pdf(team["name"], "Opponent", comp, build_stats_bundle(enriched, enriched)))
+            ]:
+                try:
+                    _, t = _timed(fn, repeat)
+                    rows.append(_row(name, scale, t))
+                except Exception as e:
+                    _log(f"⚠️ {name} @ {scale}: {e}")
+        finally:
+            llm_analyzer.set_llm_override(None)
+    return rows
+
+def compare_to_baseline(rows, baseline_rows, max_regression, min_delta_ms=2.0):
+    """
+    Returns the rows whose mean latency regressed beyond max_regression (fraction)
+    and by at least min_delta_ms, so sub-millisecond noise doesn't fail the run.
+    """
+    base = {(r["benchmark"], r["scale"]): r for r in baseline_rows}
+    regressions = []
+    for r in rows:
+        b = base.get((r["benchmark"], r["scale"]))
+        if not b or b["mean_ms"] <= 0:
+            continue
+        if r["mean_ms"] > b["mean_ms"] * (1 + max_regression) and r["mean_ms"] - b["mean_ms"] >= min_delta_ms:
+            regressions.append({**r, "baseline_ms": b["mean_ms"], "change": f"+{round((r['mean_ms'] / b['mean_ms'] - 1) * 100)}%"})
+    return regressions
+
+def print_table(rows):
+    print(f"{'benchmark':<38}{'scale':>7}{'mean ms':>11}{'p50 ms':>11}{'max ms':>11}{'items/s':>11}")
+    for r in rows:
+        print(f"{r['benchmark']:<38}{r['scale']:>7}{r['mean_ms']:>11}{r['p50_ms']:>11}{r['max_ms']:>11}{str(r['items_per_s'] or '-'):>11}")
+
+# ==================================================
+# AGGREGATION SEMANTICS CHECK (SEEDED PROPERTY RUNS)
+# ==================================================
+def reference_aggregate(target_team_name, series_states):
+    """
+    Frozen copy of the original collect_team_data aggregation. Optimized
+    versions of grid_client.aggregate_team_series must produce the same output.
+    """
+    collected = []
+    player_data = defaultdict(lambda: {"k": 0, "d": 0, "a": 0, "nw": 0, "games": 0})
+    tournament_stats = defaultdict(lambda: {"w": 0, "l": 0})
+    losses, wins = [], []
+
+    for s_info, state in series_states:
+        t_name = s_info["tournament"]
+        matching_team = next((t for t in state["teams"] if target_team_name.lower() in t["name"].lower() or t["name"].lower() in target_team_name.lower()), None)
+        if not matching_team:
+            continue
+        actual_name = matching_team["name"]
+        our_series_win = matching_team["won"]
+        opponent = next((t["name"] for t in state["teams"] if t["name"] != actual_name), "Unknown")
+        tournament_stats[t_name]["w" if our_series_win else "l"] += 1
+        (wins if our_series_win else losses).append({"opponent": opponent, "tournament": t_name})
+
+        summary = {"series_id": s_info["id"], "tournament": t_name, "opponent": opponent, "series_win": our_series_win,
+                   "date": s_info.get("date", "N/A"), "game_stats": [], "key_player": "N/A"}
+        series_players = defaultdict(lambda: {"k": 0, "d": 0, "a": 0})
+        for game in state.get("games", []):
+            our_stat = next((t for t in game.get("teams", []) if t["name"] == actual_name), None)
+            opp_stat = next((t for t in game.get("teams", []) if t["name"] != actual_name), None)
+            if not our_stat:
+                continue
+            summary["game_stats"].append({
+                "map": game.get("map", {}).get("name", "Unknown") if game.get("map") else "Unknown",
+                "won": our_stat.get("won", False),
+                "side": our_stat.get("side", "Unknown"),
+                "score": f"{our_stat.get('score', 0)}-{opp_stat.get('score', 0) if opp_stat else 0}",
+                "kills": our_stat.get("kills"),
+                "deaths": our_stat.get("deaths"),
+                "net_worth": our_stat.get("netWorth")
+            })
+            for p in our_stat.get("players", []):
+                p_name = p.get("name")
+                if not p_name:
+                    continue
+                for key, field in (("k", "kills"), ("d", "deaths"), ("a", "killAssistsGiven")):
+                    player_data[p_name][key] += (p.get(field) or 0)
+                    series_players[p_name][key] += (p.get(field) or 0)
+                player_data[p_name]["nw"] += (p.get("netWorth") or 0)
+                player_data[p_name]["games"] += 1
+        if series_players:
+            summary["key_player"] = max(series_players.keys(), key=lambda p: (series_players[p]["k"] + series_players[p]["a"]) / (series_players[p]["d"] if series_players[p]["d"] > 0 else 1))
+        collected.append(summary)
+
+    refined = []
+    for p, st in player_data.items():
+        if st["games"] > 0:
+            refined.append({
+                "name": p,
+                "avg_kda": round((st["k"] + st["a"]) / st["d"] if st["d"] > 0 else (st["k"] + st["a"]), 2),
+                "avg_kills": round(st["k"] / st["games"], 2),
+                "avg_deaths": round(st["d"] / st["games"], 2),
+                "avg_networth": int(st["nw"] / st["games"]),
+                "participation": st["games"]
+            })
+    top_players = sorted(refined, key=lambda x: x["avg_kda"], reverse=True)[:5]
+    for p in top_players:
+        p["impact_score"] = round((p["avg_kda"] * 5) + (p["avg_networth"] / 2000), 1)
+    map_wins = sum(1 for s in collected for g in s["game_stats"] if g["won"])
+    total_maps = sum(len(s["game_stats"]) for s in collected)
+    return {
+        "series": collected, "top_players": top_players, "losses": losses, "wins": wins,
+        "tournament_summary": dict(tournament_stats), "total_series": len(collected),
+        "map_win_rate": round((map_wins/total_maps)*100, 1) if total_maps > 0 else 0, "total_maps": total_maps
+    }
+
+def _comparable(enriched):
+    data = enriched.to_dict() if hasattr(enriched, "to_dict") else dict(enriched)
+    data.pop("fingerprint", None)
+    return json.loads(json.dumps(data, sort_keys=True, default=str))
+
+def verify_aggregation(runs, seed, max_series):
+    """Runs seeded synthetic leagues through aggregate_team_series and the frozen reference."""
+    rng = random.Random(seed)
+    failures = 0
+    for run in range(runs):
+        rec = generate_recording(
+            rng.randint(0, max_series),
+            title=rng.choice(sorted(TITLES)),
+            n_teams=rng.randint(2, 20),
+            seed=rng.randrange(1 << 30),
+            null_rate=rng.choice([0.0, 0.0, 0.05, 0.3]),
+            focus_share=rng.choice([1.0, 0.5, 0.1])
+        )
+        team = rec["team"]["name"]
+        got = _comparable(grid_client.aggregate_team_series(team, series_state_pairs(rec)))
+        want = _comparable(reference_aggregate(team, series_state_pairs(rec)))
+        typed = _comparable(grid_client.aggregate_team_series(team, ((i, SeriesState.from_dict(s)) for i, s in series_state_pairs(rec))))
+        if got != want or typed != want:
+            failures += 1
+            diff = sorted(k for k in set(got) | set(want) if got.get(k) != want.get(k) or typed.get(k) != want.get(k))
+            _log(f"❌ run {run}: {len(rec['series'])} {rec['_note'].split()[1]} series differ in {diff}")
+    _log(f"{'✅' if not failures else '❌'} {runs - failures}/{runs} synthetic runs match the reference aggregation")
+    return failures == 0
+
+# ==================================================
+# RECORDING (LIVE GRID -> FIXTURE)
+# ==================================================
+def record(team_name, team_id, out_path, limit):
+    """Captures a team's series list and series states from the live API into a replayable fixture."""
+    tours = grid_client.fetch_recent_tournaments(limit=5)
+    s_info = grid_client.fetch_series_info_for_team(team_id, limit=limit)
+    if not s_info:
+        _log("❌ No series returned; check GRID_API_KEY and the team id.")
+        return False
+
+    states = {}
+    for s in s_info:
+        res = grid_client.post(grid_client.SERIES_STATE_URL, grid_client.QUERY_SERIES_STATE_DEEP, {"seriesId": str(s["id"])})
+        if (res.get("data") or {}).get("seriesState"):
+            states[str(s["id"])] = res["data"]
+
+    recording = {
+        "team": {"name": team_name, "id": str(team_id)},
+        "tournaments": tours or [{"id": "0", "name": "Unknown"}],
+        "series": [{"id": str(s["id"]), "tournament": s["tournament"], "startTimeScheduled": s["date"]} for s in s_info if str(s["id"]) in states],
+        "series_states": states
+    }
+    with open(out_path, "w") as f:
+        json.dump(recording, f, indent=1)
+    _log(f"📁 Recorded {len(states)} series states to {out_path}")
+    return bool(states)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Offline pipeline benchmarks against a mock GRID server.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the benchmark suite")
+    p_run.add_argument("--recording", default=DEFAULT_RECORDING)
+    p_run.add_argument("--synthetic", default=None, choices=sorted(TITLES), help="Generate seeded data for this title instead of replaying a recording")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--scales", default=DEFAULT_SCALES, help=f"Comma list of series counts (default {DEFAULT_SCALES})")
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--latency-ms", type=float, default=0.0, help="Mock GRID mean latency per request")
+    p_run.add_argument("--jitter-ms", type=float, default=0.0, help="Mock GRID latency std-dev")
+    p_run.add_argument("--llm-latency-ms", type=float, default=0.0, help="Fake LLM latency per call")
+    p_run.add_argument("--save", default=None, help="Write results JSON here")
+    p_run.add_argument("--baseline", default=None, help="Fail if slower than this results JSON")
+    p_run.add_argument("--max-regression", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    p_run.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore slowdowns smaller than this")
+
+    p_ver = sub.add_parser("verify", help="Check aggregation against the reference on synthetic data")
+    p_ver.add_argument("--runs", type=int, default=200)
+    p_ver.add_argument("--seed", type=int, default=0)
+    p_ver.add_argument("--max-series", type=int, default=60)
+
+    p_rec = sub.add_parser("record", help="Record live GRID responses into a fixture")
+    p_rec.add_argument("name")
+    p_rec.add_argument("id")
+    p_rec.add_argument("--out", default="fixtures/grid_recording.json")
+    p_rec.add_argument("--limit", type=int, default=20)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "record":
+        return 0 if record(args.name, args.id, args.out, args.limit) else 1
+    if args.command == "verify":
+        return 0 if verify_aggregation(args.runs, args.seed, args.max_series) else 1
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    if args.synthetic:
+        recording = generate_recording(max(scales), title=args.synthetic, seed=args.seed)
+    else:
+        recording = load_recording(args.recording)
+    rows = []
+    for scale in scales:
+        _log(f"⚡ Benchmarking at {scale} series...")
+        rows.extend(run_scale(recording, scale, args.repeat, args.latency_ms, args.jitter_ms, args.llm_latency_ms))
+    print_table(rows)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(rows, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(rows, json.load(f), args.max_regression, args.min_delta_ms)
+        for r in regressions:
+            _log(f"❌ REGRESSION {r['benchmark']} @ {r['scale']}: {r['mean_ms']} ms vs {r['baseline_ms']} ms ({r['change']})")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
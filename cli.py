@@ -0,0 +1,393 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from team_models import json_default
+
+# ==================================================
+# HEADLESS CLI: python cli.py {scout,compare,batch,watch,live,ratings,players,form,rank,importtime}
+# ==================================================
+def _log(message):
+    print(message, file=sys.stderr)
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_') or "team"
+
+def _write(path, content, mode="w"):
+    with open(path, mode) as f:
+        f.write(content)
+    _log(f"📁 {path}")
+
+def write_scouting_outputs(out_dir, team_name, data_pack, formats):
+    """Writes the scouting pack as JSON / Markdown / PDF into out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    enriched_data, playbook, structured_roster, winning_trends, counter_strategy = data_pack
+    base = os.path.join(out_dir, f"{_slug(team_name)}_scouting_report")
+
+    if "json" in formats:
+        _write(f"{base}.json", json.dumps({
+            "team": team_name,
+            "enriched_data": enriched_data,
+            "playbook": playbook,
+            "roster": structured_roster,
+            "winning_trends": winning_trends,
+            "counter_strategy": counter_strategy
+        }, indent=2, default=json_default))
+
+    if playbook is None:
+        _log(f"⚠️ {team_name}: insufficient data, skipping Markdown/PDF.")
+        return
+
+    from report_generator import generate_markdown_report, generate_pdf_report
+    if "md" in formats:
+        _write(f"{base}.md", generate_markdown_report(team_name, *data_pack))
+    if "pdf" in formats:
+        _write(f"{base}.pdf", generate_pdf_report(team_name, *data_pack), mode="wb")
+
+def write_comparison_outputs(out_dir, comp_pack, formats):
+    """Writes the comparison pack as JSON / Markdown / PDF into out_dir."""
+    from pipeline import build_stats_bundle
+    os.makedirs(out_dir, exist_ok=True)
+    na, nb, res, da, db = comp_pack
+    base = os.path.join(out_dir, f"{_slug(na)}_vs_{_slug(nb)}_scouting_report")
+
+    if "json" in formats:
+        _write(f"{base}.json", json.dumps({
+            "team_a": na, "team_b": nb, "comparison": res, "data_a": da, "data_b": db
+        }, indent=2, default=json_default))
+
+    from report_generator import generate_comparison_markdown, generate_comparison_pdf
+    if "md" in formats:
+        _write(f"{base}.md", generate_comparison_markdown(na, nb, res))
+    if "pdf" in formats:
+        _write(f"{base}.pdf", generate_comparison_pdf(na, nb, res, build_stats_bundle(da, db)), mode="wb")
+
+def run_scout(name, team_id, tournament_id, out_dir, formats):
+    from pipeline import scout_team
+    dp = scout_team(name, team_id, tournament_id=tournament_id, progress=_log)
+    if not dp:
+        _log(f"❌ {name}: no recent GRID data found.")
+        return False
+    write_scouting_outputs(out_dir, name, dp, formats)
+    return dp[1] is not None
+
+def run_compare(team_a, team_b, out_dir, formats):
+    from pipeline import compare_teams
+    comp = compare_teams(team_a, team_b, progress=_log)
+    write_comparison_outputs(out_dir, comp, formats)
+    return True
+
+def run_batch(jobs_path, out_dir, formats):
+    """
+    Runs every job in a JSON list. Each entry is either
+    {"type": "scout", "name": ..., "id": ..., "tournament_id": ...} or
+    {"type": "compare", "team_a": {"name", "id"}, "team_b": {"name", "id"}}.
+    """
+    with open(jobs_path) as f:
+        jobs = json.load(f)
+
+    failures = 0
+    for idx, job in enumerate(jobs, 1):
+        kind = job.get("type", "scout")
+        _log(f"⚡ [{idx}/{len(jobs)}] {kind}")
+        try:
+            if kind == "compare":
+                ok = run_compare(job["team_a"], job["team_b"], out_dir, formats)
+            else:
+                ok = run_scout(job["name"], job["id"], job.get("tournament_id"), out_dir, formats)
+        except Exception as e:
+            _log(f"❌ Job {idx} failed: {e}")
+            ok = False
+        failures += 0 if ok else 1
+    return failures == 0
+
+def run_watch(watchlist_path, store_path, interval, once):
+    """Keeps the report store warm for the watchlist; --once for cron, otherwise loops."""
+    from report_store import ReportStore, load_watchlist, run_watchlist_once, WATCH_INTERVAL
+    store = ReportStore(store_path)
+    interval = WATCH_INTERVAL if interval is None else interval
+    while True:
+        entries = load_watchlist(watchlist_path)
+        if not entries:
+            _log(f"❌ Watchlist {watchlist_path or 'watchlist.json'} is missing or empty.")
+            return False
+        counts = run_watchlist_once(store, entries, progress=_log)
+        _log(f"📦 {counts} -> {store.path}")
+        if once:
+            return counts["failed"] == 0
+        time.sleep(interval)
+
+def run_live(name, series_id, interval, max_polls):
+    """Follows an in-progress series, printing a line whenever the GRID feed version moves."""
+    from live import LiveSeries, LIVE_POLL_INTERVAL
+    tracker = LiveSeries(series_id, name)
+    interval = LIVE_POLL_INTERVAL if interval is None else interval
+    polls = 0
+    while not max_polls or polls < max_polls:
+        update = tracker.poll()
+        polls += 1
+        if update:
+            if not update["in_series"]:
+                _log(f"❌ {name} is not playing in series {series_id}.")
+                return False
+            _log(f"🔴 v{update['version']} {update['team']} vs {update['opponent']}: {update['maps_won']}/{len(update['game_stats'])} maps, updated games {update['changed_games']}")
+            if update["finished"]:
+                _log(f"{'🏆' if update['series_win'] else '❌'} Series over.")
+                print(json.dumps(update, indent=2))
+                return True
+        elif tracker.error:
+            _log(f"⚠️ {tracker.error}")
+        time.sleep(interval)
+    return True
+
+def run_ratings(top, team_a, team_b):
+    """Prints the rating leaderboard, or one pair's win probability."""
+    from ratings import default_engine
+    engine = default_engine()
+    engine.flush()      # a one-shot process can't wait for the background flusher
+    if team_a and team_b:
+        p = engine.win_probability(team_a, team_b)
+        if p is None:
+            _log(f"❌ No rating yet for {team_a if engine.rating(team_a) is None else team_b}.")
+            return False
+        print(json.dumps({"team_a": engine.rating(team_a).to_dict(), "team_b": engine.rating(team_b).to_dict(), "p_team_a_wins": round(p, 4)}, indent=2))
+        return True
+    board = engine.leaderboard(top)
+    for i, row in enumerate(board, 1):
+        print(f"{i:>3}. {row['team']:<32} {row['rating']:>7.1f} ± {row['rd']:<6.1f} {row['wins']}W-{row['games'] - row['wins']}L")
+    _log(f"📈 {engine.stats()}")
+    return bool(board)
+
+def run_players(query, team, top):
+    """Player index lookups: a team's current roster, or a name search."""
+    from players import default_index
+    index = default_index()
+    rows = index.roster(team, top=top) if team else index.search(query or "", limit=top)
+    for row in rows:
+        career = index.player(row["name"])
+        print(f"{row['name']:<24} {career['team']:<28} KDA {row['avg_kda']:>5}  {career['series']:>3} series  {row['participation']:>3} games")
+    _log(f"📇 {index.stats()}")
+    return bool(rows)
+
+def run_form(name, team_id, tournament_id, days, series, half_life, as_of):
+    """Collects a team's recent series, then prints its form for the requested window from the form index."""
+    from grid_client import fetch_series_info_for_team, collect_team_data
+    from form import default_form_index
+    index = default_form_index()
+    collect_team_data(name, fetch_series_info_for_team(team_id, tournament_id=tournament_id))
+    view = index.form(name, days=days, series=series, half_life=half_life, as_of=as_of)
+    if view is None:
+        _log(f"❌ {name}: no finished series found.")
+        return False
+    print(json.dumps(view, indent=2))
+    _log(f"📈 {index.stats()}")
+    return True
+
+def run_rank(tournament_id, name, limit, summarize, out_dir, formats):
+    """Power-ranks every team in a tournament and writes JSON / Markdown."""
+    from pipeline import rank_tournament
+    ranking = rank_tournament(tournament_id, name, progress=_log, limit=limit, summarize=summarize)
+    if not ranking:
+        _log(f"❌ Tournament {tournament_id}: no team has usable series.")
+        return False
+    for row in ranking["table"]:
+        print(f"{row['rank']:>3}. {row['team']:<32} {row['power'] * 100:>5.1f}%  {row['series']:>2} series  WR {row['win_rate']}")
+    if ranking["unranked"]:
+        _log(f"⚠️ No usable series: {', '.join(ranking['unranked'])}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{_slug(ranking['tournament']['name'])}_power_ranking")
+    if "json" in formats:
+        _write(f"{base}.json", json.dumps(ranking, indent=2, default=json_default))
+    if "md" in formats:
+        from report_generator import generate_ranking_markdown
+        _write(f"{base}.md", generate_ranking_markdown(ranking))
+    return True
+
+def run_calibrate(tournament_id, limit, save):
+    """Collects a tournament's field, then checks and fits the predictor against the stored rating results."""
+    from grid_client import discover_teams_from_tournament, collect_field_data
+    from ratings import default_engine
+    from predictor import calibrate, save_calibration
+    engine = default_engine()
+    field, _ = collect_field_data(discover_teams_from_tournament(tournament_id), tournament_id=tournament_id, max_matches=limit)
+    names = sorted(name for name, data in field.items() if data["series"])
+    report = calibrate(names, [field[name] for name in names], engine.results())
+    if not report["results"]:
+        _log(f"❌ No stored results between teams of tournament {tournament_id} with earlier series to predict from.")
+        return False
+    print(json.dumps(report, indent=2))
+    _log(f"📐 {report['results']} results: Brier {report['current']['brier']} -> {report['fitted']['brier']}, "
+         f"log-loss {report['current']['log_loss']} -> {report['fitted']['log_loss']} with slope {report['fitted_scale']}")
+    if save:
+        _log(f"📁 {save_calibration(report)}")
+    return True
+
+# ==================================================
+# IMPORT-TIME BUDGET (python -X importtime)
+# ==================================================
+IMPORT_BUDGET_MODULES = ["pipeline", "grid_client", "llm_analyzer", "report_generator"]
+HEAVY_MODULES = ["streamlit", "pandas", "fpdf", "langchain_core", "langchain_openai"]
+
+def measure_import_time(module):
+    """
+    Imports `module` in a fresh interpreter under -X importtime.
+    Returns (cumulative_us, [(cumulative_us, name), ...], loaded_heavy_modules).
+    """
+    import subprocess
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"import {module} failed")
+
+    entries = []
+    total = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        entries.append((int(cumulative), name))
+        if name == module:
+            total = int(cumulative)
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return total or 0, sorted(entries, reverse=True), heavy
+
+def run_importtime(modules, budget_ms, top):
+    """Fails when any module exceeds the budget or drags in a heavy dependency at import."""
+    ok = True
+    for module in modules:
+        try:
+            total_us, entries, heavy = measure_import_time(module)
+        except RuntimeError as e:
+            _log(f"❌ {module}: {e}")
+            ok = False
+            continue
+
+        total_ms = total_us / 1000
+        within = total_ms <= budget_ms and not heavy
+        ok = ok and within
+        _log(f"{'✅' if within else '❌'} {module}: {total_ms:.1f} ms (budget {budget_ms} ms)")
+        if heavy:
+            _log(f"   eager heavy imports: {', '.join(heavy)}")
+        for cumulative, name in entries[:top]:
+            _log(f"   {cumulative / 1000:8.1f} ms  {name}")
+    return ok
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Cloud9 Stratos headless scouting pipeline.")
+    parser.add_argument("--out", default="reports", help="Output directory (default: reports)")
+    parser.add_argument("--formats", default="json,md,pdf", help="Comma list of json,md,pdf")
+    parser.add_argument("--trace", default=None, help="Write OpenTelemetry (OTLP JSON) spans to this file")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus /metrics on this port while running")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_scout = sub.add_parser("scout", help="Scouting report for one team")
+    p_scout.add_argument("name", help="Team name as listed by GRID")
+    p_scout.add_argument("id", help="GRID team id")
+    p_scout.add_argument("--tournament-id", default=None)
+
+    p_comp = sub.add_parser("compare", help="Matchup report for two teams")
+    p_comp.add_argument("name_a")
+    p_comp.add_argument("id_a")
+    p_comp.add_argument("name_b")
+    p_comp.add_argument("id_b")
+
+    p_batch = sub.add_parser("batch", help="Run a JSON list of scout/compare jobs")
+    p_batch.add_argument("jobs", help="Path to the jobs JSON file")
+
+    p_watch = sub.add_parser("watch", help="Precompute and refresh stored reports for a watchlist")
+    p_watch.add_argument("--watchlist", default=None, help="Watchlist JSON (default: $WATCHLIST_PATH or watchlist.json)")
+    p_watch.add_argument("--store", default=None, help="SQLite report store (default: $REPORT_STORE_PATH)")
+    p_watch.add_argument("--interval", type=float, default=None, help="Seconds between passes (default: $WATCH_INTERVAL)")
+    p_watch.add_argument("--once", action="store_true", help="Single pass, e.g. from cron")
+
+    p_live = sub.add_parser("live", help="Follow an in-progress series")
+    p_live.add_argument("name", help="Team to follow, as listed by GRID")
+    p_live.add_argument("series_id")
+    p_live.add_argument("--interval", type=float, default=None, help="Seconds between polls (default: $LIVE_POLL_INTERVAL)")
+    p_live.add_argument("--max-polls", type=int, default=0, help="Stop after this many polls (0 = until the series ends)")
+
+    p_rat = sub.add_parser("ratings", help="Team rating leaderboard, or P(A beats B)")
+    p_rat.add_argument("--top", type=int, default=25)
+    p_rat.add_argument("--pair", nargs=2, metavar=("TEAM_A", "TEAM_B"), default=None)
+
+    p_pl = sub.add_parser("players", help="Search the player index, or list a team's roster")
+    p_pl.add_argument("query", nargs="?", default=None, help="Part of a player name")
+    p_pl.add_argument("--team", default=None, help="List this team's current players instead")
+    p_pl.add_argument("--top", type=int, default=20)
+
+    p_form = sub.add_parser("form", help="A team's windowed or time-decayed recent form")
+    p_form.add_argument("name", help="Team name as listed by GRID")
+    p_form.add_argument("id", help="GRID team id")
+    p_form.add_argument("--tournament-id", default=None)
+    p_form.add_argument("--days", type=int, default=None, help="Only series from the last N days")
+    p_form.add_argument("--series", type=int, default=None, help="Only the last N series")
+    p_form.add_argument("--half-life", type=float, default=None, help="Exponential decay half-life in days (instead of a window)")
+    p_form.add_argument("--as-of", default=None, help="YYYY-MM-DD end of the window (default: today)")
+
+    p_rank = sub.add_parser("rank", help="Power ranking of every team in a tournament")
+    p_rank.add_argument("tournament_id")
+    p_rank.add_argument("--name", default=None, help="Tournament name for the report title")
+    p_rank.add_argument("--limit", type=int, default=10, help="Recent series per team")
+    p_rank.add_argument("--no-summary", action="store_true", help="Skip the LLM summary of the field")
+
+    p_cal = sub.add_parser("calibrate", help="Brier / log-loss of the matchup predictor on stored results; saves a fitted Platt slope")
+    p_cal.add_argument("tournament_id")
+    p_cal.add_argument("--limit", type=int, default=50, help="Recent series per team")
+    p_cal.add_argument("--no-save", action="store_true", help="Report only; keep the current slope")
+
+    p_imp = sub.add_parser("importtime", help="Check module import time against a budget")
+    p_imp.add_argument("modules", nargs="*", default=IMPORT_BUDGET_MODULES)
+    p_imp.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "400")))
+    p_imp.add_argument("--top", type=int, default=5, help="Slowest imports to list per module")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    formats = {f.strip() for f in args.formats.split(",") if f.strip()}
+    if args.metrics_port:
+        from telemetry import start_metrics_server
+        start_metrics_server(args.metrics_port)
+    if args.command in ("scout", "compare", "batch", "watch", "rank", "calibrate"):
+        # Every series these commands read also feeds the persisted ratings and player index
+        from ratings import default_engine
+        from players import default_index
+        default_engine()
+        default_index()
+
+    if args.command == "scout":
+        ok = run_scout(args.name, args.id, args.tournament_id, args.out, formats)
+    elif args.command == "compare":
+        ok = run_compare({"name": args.name_a, "id": args.id_a}, {"name": args.name_b, "id": args.id_b}, args.out, formats)
+    elif args.command == "importtime":
+        ok = run_importtime(args.modules, args.budget_ms, args.top)
+    elif args.command == "watch":
+        ok = run_watch(args.watchlist, args.store, args.interval, args.once)
+    elif args.command == "ratings":
+        ok = run_ratings(args.top, *(args.pair or (None, None)))
+    elif args.command == "form":
+        ok = run_form(args.name, args.id, args.tournament_id, args.days, args.series, args.half_life, args.as_of)
+    elif args.command == "players":
+        ok = run_players(args.query, args.team, args.top)
+    elif args.command == "rank":
+        ok = run_rank(args.tournament_id, args.name, args.limit, not args.no_summary, args.out, formats)
+    elif args.command == "calibrate":
+        ok = run_calibrate(args.tournament_id, args.limit, not args.no_save)
+    elif args.command == "live":
+        ok = run_live(args.name, args.series_id, args.interval, args.max_polls)
+    else:
+        ok = run_batch(args.jobs, args.out, formats)
+
+    if args.trace:
+        from telemetry import write_otlp_json
+        write_otlp_json(args.trace)
+        _log(f"📈 Traces written to {args.trace}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
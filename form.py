@@ -0,0 +1,273 @@
+import os
+import heapq
+import bisect
+import threading
+from datetime import date
+from grid_client import find_team, game_stat_row, summarize_players
+from ratings import team_key
+from telemetry import span, set_attributes, incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+# Half-lives (days) whose decayed sums are kept up to date on every series; other half-lives are computed on demand
+FORM_HALF_LIFE = float(os.getenv("FORM_HALF_LIFE", "30"))
+FORM_HALF_LIVES = tuple(sorted({FORM_HALF_LIFE, *(float(h) for h in os.getenv("FORM_HALF_LIVES", "14,90").split(",") if h.strip())}))
+MAX_EXPONENT = 500        # re-anchor decayed sums before 2 ** exponent gets near float range
+
+# Per-series team totals, in this order, for the prefix sums and decayed sums
+FIELDS = ("series", "wins", "maps_won", "maps", "kills", "deaths", "net_worth")
+PLAYER_FIELDS = ("k", "d", "a", "nw", "games")
+
+def _ordinal(day):
+    try:
+        return date.fromisoformat(str(day)[:10]).toordinal()
+    except ValueError:
+        return None
+
+def _series_record(actual_name, state):
+    """(team totals in FIELDS order, {player: (k, d, a, nw, games)}) for one team's side of a series."""
+    won = next((t.get("won") for t in state["teams"] if t["name"] == actual_name), False)
+    totals = [1, 1 if won else 0, 0, 0, 0, 0, 0]
+    players = {}
+    for game in state.get("games") or []:
+        our_stat, row = game_stat_row(game, actual_name)
+        if not our_stat:
+            continue
+        totals[2] += 1 if row["won"] else 0
+        totals[3] += 1
+        totals[4] += row["kills"] or 0
+        totals[5] += row["deaths"] or 0
+        totals[6] += row["net_worth"] or 0
+        for p in our_stat.get("players") or []:
+            if p.get("name"):
+                k, d, a, nw, g = players.get(p["name"], (0, 0, 0, 0, 0))
+                players[p["name"]] = (k + (p.get("kills") or 0), d + (p.get("deaths") or 0),
+                                      a + (p.get("killAssistsGiven") or 0), nw + (p.get("netWorth") or 0), g + 1)
+    return tuple(totals), players
+
+def _summary(totals, first=None, last=None):
+    n, wins, maps_won, maps, kills, deaths, nw = totals
+    return {
+        "series": round(n, 2),
+        "wins": round(wins, 2),
+        "win_rate": round(wins / n * 100, 1) if n else 0,
+        "map_win_rate": round(maps_won / maps * 100, 1) if maps else 0,
+        "avg_kills": round(kills / maps, 2) if maps else 0,
+        "avg_deaths": round(deaths / maps, 2) if maps else 0,
+        "avg_net_worth": int(nw / maps) if maps else 0,
+        "from": first,
+        "to": last
+    }
+
+# ==================================================
+# ONE TEAM'S FORM
+# ==================================================
+class TeamForm:
+    """
+    A team's finished series in date order with running prefix sums (any
+    "last N series" / "last N days" window is two bisects and a subtraction)
+    and exponentially decayed sums per configured half-life (O(1) per new
+    series, in any arrival order). New series are merged into the sorted
+    arrays once per batch, on the next read, so newest-first listings don't
+    rebuild the prefix sums per series.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.keys = []           # (ordinal, series id), sorted
+        self.records = []        # (totals, players) aligned with keys
+        self.prefix = [(0,) * len(FIELDS)]
+        self.pending = []        # (key, (totals, players)) added since the last merge
+        self.anchor = None       # ordinal the decayed weights are relative to
+        self.decayed = {hl: [0.0] * len(FIELDS) for hl in FORM_HALF_LIVES}
+        self.decayed_players = {hl: {} for hl in FORM_HALF_LIVES}
+
+    def add(self, ordinal, series_id, totals, players):
+        self.pending.append(((ordinal, series_id), (totals, players)))
+        self._add_decayed(ordinal, totals, players, 1)
+
+    def _merge(self):
+        """Folds pending series into keys/records and rebuilds the prefix sums from the oldest one on."""
+        if not self.pending:
+            return
+        self.pending.sort(key=lambda item: item[0])
+        idx = bisect.bisect_left(self.keys, self.pending[0][0])
+        merged = list(heapq.merge(zip(self.keys[idx:], self.records[idx:]), self.pending, key=lambda item: item[0]))
+        self.keys[idx:] = [key for key, _ in merged]
+        self.records[idx:] = [record for _, record in merged]
+        del self.prefix[idx + 1:]
+        for recorded, _ in self.records[idx:]:
+            self.prefix.append(tuple(p + t for p, t in zip(self.prefix[-1], recorded)))
+        self.pending = []
+
+    def remove(self, ordinal, series_id):
+        self._merge()
+        idx = bisect.bisect_left(self.keys, (ordinal, series_id))
+        totals, players = self.records.pop(idx)
+        del self.keys[idx]
+        del self.prefix[idx + 1:]
+        for recorded, _ in self.records[idx:]:
+            self.prefix.append(tuple(p + t for p, t in zip(self.prefix[-1], recorded)))
+        self._add_decayed(ordinal, totals, players, -1)
+
+    def _add_decayed(self, ordinal, totals, players, sign):
+        if self.anchor is None:
+            self.anchor = ordinal
+        for hl in FORM_HALF_LIVES:
+            if (ordinal - self.anchor) / hl > MAX_EXPONENT:
+                self._reanchor(ordinal)
+            w = sign * 2.0 ** ((ordinal - self.anchor) / hl)
+            sums = self.decayed[hl]
+            for i, t in enumerate(totals):
+                sums[i] += w * t
+            per_player = self.decayed_players[hl]
+            for name, stats in players.items():
+                acc = per_player.setdefault(name, [0.0] * len(PLAYER_FIELDS))
+                for i, v in enumerate(stats):
+                    acc[i] += w * v
+
+    def _reanchor(self, ordinal):
+        for hl in FORM_HALF_LIVES:
+            scale = 2.0 ** ((self.anchor - ordinal) / hl)
+            self.decayed[hl] = [v * scale for v in self.decayed[hl]]
+            for acc in self.decayed_players[hl].values():
+                acc[:] = [v * scale for v in acc]
+        self.anchor = ordinal
+
+    # --- windows ---
+    def _range(self, days=None, series=None, as_of=None):
+        hi = len(self.keys) if as_of is None else bisect.bisect_left(self.keys, (as_of + 1, ""))
+        lo = 0
+        if days is not None:
+            end = as_of if as_of is not None else date.today().toordinal()
+            lo = bisect.bisect_left(self.keys, (end - days + 1, ""))
+        if series is not None:
+            lo = max(lo, hi - series)
+        return min(lo, hi), hi
+
+    def window(self, days=None, series=None, as_of=None):
+        """Totals over the last `days` days and/or last `series` series up to `as_of` (ordinal; default today / everything)."""
+        self._merge()
+        lo, hi = self._range(days, series, as_of)
+        totals = tuple(b - a for a, b in zip(self.prefix[lo], self.prefix[hi]))
+        first = date.fromordinal(self.keys[lo][0]).isoformat() if hi > lo else None
+        last = date.fromordinal(self.keys[hi - 1][0]).isoformat() if hi > lo else None
+        players = {}
+        for _, recorded in self.records[lo:hi]:
+            for name, stats in recorded.items():
+                acc = players.setdefault(name, {"k": 0, "d": 0, "a": 0, "nw": 0, "games": 0})
+                for field, v in zip(PLAYER_FIELDS, stats):
+                    acc[field] += v
+        return {**_summary(totals, first, last), "top_players": summarize_players(players)}
+
+    def decayed_form(self, half_life=None, as_of=None):
+        """
+        Exponentially time-decayed totals over the series up to `as_of`
+        (ordinal; default today, like window()): a series `half_life` days older
+        than `as_of` counts half as much. Later series are left out.
+        """
+        self._merge()
+        hl = FORM_HALF_LIFE if half_life is None else float(half_life)
+        as_of = as_of if as_of is not None else date.today().toordinal()
+        hi = bisect.bisect_left(self.keys, (as_of + 1, ""))
+        if hl in self.decayed and hi == len(self.keys):
+            scale = 2.0 ** ((self.anchor - as_of) / hl) if self.anchor is not None else 0.0
+            totals = [v * scale for v in self.decayed[hl]]
+            raw_players = {name: [v * scale for v in acc] for name, acc in self.decayed_players[hl].items()}
+        else:
+            # Half-life outside FORM_HALF_LIVES, or an as_of before the newest series:
+            # one pass over the compact per-series records up to as_of
+            totals, raw_players = [0.0] * len(FIELDS), {}
+            for (ordinal, _), (recorded, players) in zip(self.keys[:hi], self.records[:hi]):
+                w = 2.0 ** ((ordinal - as_of) / hl)
+                for i, t in enumerate(recorded):
+                    totals[i] += w * t
+                for name, stats in players.items():
+                    acc = raw_players.setdefault(name, [0.0] * len(PLAYER_FIELDS))
+                    for i, v in enumerate(stats):
+                        acc[i] += w * v
+        players = {name: dict(zip(PLAYER_FIELDS, acc)) for name, acc in raw_players.items() if acc[4] > 1e-9}
+        top = summarize_players(players)
+        for p in top:
+            p["participation"] = round(p["participation"], 1)
+        first = date.fromordinal(self.keys[0][0]).isoformat() if hi else None
+        return {**_summary(totals, first, date.fromordinal(as_of).isoformat()), "half_life_days": hl, "top_players": top}
+
+# ==================================================
+# SERIES-STREAM FORM INDEX
+# ==================================================
+class FormIndex:
+    """
+    Per-team TeamForm for every finished series read through grid_client
+    (a series listener, like ratings and players). In memory, next to the
+    series cache it mirrors.
+    """
+
+    def __init__(self):
+        self._teams = {}        # team key -> TeamForm
+        self._seen = {}         # series id -> (ordinal, had games)
+        self._lock = threading.Lock()
+
+    def ingest(self, series_info, state):
+        series_id = str(series_info["id"])
+        has_games = bool(state.get("games"))
+        ordinal = _ordinal(series_info.get("date"))
+        if ordinal is None or not any(t.get("won") for t in state.get("teams") or []):
+            return False      # undated, live or abandoned
+        with self._lock:
+            seen = self._seen.get(series_id)
+            if seen and (seen[1] or not has_games):
+                return False
+            for t in state["teams"]:
+                if not t.get("name"):
+                    continue
+                form = self._teams.get(team_key(t["name"]))
+                if form is None:
+                    form = self._teams[team_key(t["name"])] = TeamForm(t["name"])
+                if seen:
+                    form.remove(seen[0], series_id)     # summary-profile copy upgraded to one with games
+                form.add(ordinal, series_id, *_series_record(t["name"], state))
+            self._seen[series_id] = (ordinal, has_games)
+        incr("form_series_total")
+        return True
+
+    def team(self, team_name):
+        key = team_key(team_name)
+        with self._lock:
+            form = self._teams.get(key)
+            if form is None:
+                match = find_team([{"name": f.name} for f in self._teams.values()], team_name)
+                form = self._teams.get(team_key(match["name"])) if match else None
+        return form
+
+    def form(self, team_name, days=None, series=None, half_life=None, as_of=None):
+        """
+        Recent form for a team: a window (`days` and/or `series`) or, with
+        `half_life`, the decayed view. None when the team has no indexed series.
+        """
+        form = self.team(team_name)
+        if form is None:
+            return None
+        as_of = _ordinal(as_of) if isinstance(as_of, str) else as_of
+        with span("form.query", team=team_name) as sp, self._lock:
+            result = form.decayed_form(half_life, as_of) if half_life else form.window(days, series, as_of)
+            set_attributes(sp, series=result["series"])
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"series": len(self._seen), "teams": len(self._teams), "half_lives": list(FORM_HALF_LIVES)}
+
+_default_form = None
+_default_form_lock = threading.Lock()
+
+def default_form_index():
+    """Process-wide FormIndex, fed by grid_client's series listener."""
+    global _default_form
+    with _default_form_lock:
+        if _default_form is None:
+            import grid_client
+            _default_form = FormIndex()
+            grid_client.add_series_listener(_default_form.ingest)
+        return _default_form
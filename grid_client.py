@@ -1,7 +1,16 @@
 import os
+import json
+import time
+import hashlib
+import threading
 import requests
 from dotenv import load_dotenv
-from collections import defaultdict
+from contextlib import contextmanager
+from collections import defaultdict, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from telemetry import span, mark_error, set_attributes, incr, record_cache
+from grid_models import loads, decode_series_state
+from team_models import TeamData, SeriesSummary
 
 # ==================================================
 # CONFIGURATION & LOAD ENV
@@ -9,8 +18,43 @@ from collections import defaultdict
 load_dotenv()
 GRID_API_KEY = os.getenv("GRID_API_KEY")
 
-CENTRAL_DATA_URL = "https://api-op.grid.gg/central-data/graphql"
-SERIES_STATE_URL = "https://api-op.grid.gg/live-data-feed/series-state/graphql"
+CENTRAL_DATA_URL = os.getenv("GRID_CENTRAL_DATA_URL", "https://api-op.grid.gg/central-data/graphql")
+SERIES_STATE_URL = os.getenv("GRID_SERIES_STATE_URL", "https://api-op.grid.gg/live-data-feed/series-state/graphql")
+
+# Typed seriesState structs use ~45% less memory than dicts but cost some CPU to build;
+# worth it when long histories are held in memory.
+TYPED_SERIES_STATES = os.getenv("GRID_TYPED_STATES", "0") == "1"
+
+# Series cache: team series lists go stale as new matches are scheduled, finished
+# series states barely change. Both are shared by every session in the process.
+SERIES_LIST_TTL = float(os.getenv("SERIES_LIST_TTL", "300"))
+SERIES_STATE_TTL = float(os.getenv("SERIES_STATE_TTL", "1800"))
+# States with no winner yet (live or not started) are kept only this long and never served stale
+SERIES_LIVE_TTL = float(os.getenv("SERIES_LIVE_TTL", "60"))
+SERIES_CACHE_MAX = int(os.getenv("SERIES_CACHE_MAX", "2000"))
+# Expired entries are kept this much longer and served (marked stale) while a
+# background refresh runs, or for as long as GRID is unreachable.
+SERIES_STALE_TTL = float(os.getenv("SERIES_STALE_TTL", str(6 * 3600)))
+
+# Per-endpoint circuit breaker: after BREAKER_FAILURES consecutive failed calls the
+# endpoint is skipped for BREAKER_COOLDOWN seconds, then one trial call is let through.
+REQUEST_TIMEOUT = float(os.getenv("GRID_TIMEOUT", "20"))
+BREAKER_FAILURES = int(os.getenv("GRID_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("GRID_BREAKER_COOLDOWN", "30"))
+
+# Hedged seriesState requests: a call still running past the HEDGE_PERCENTILE of recent
+# latencies gets one duplicate; at most HEDGE_BUDGET hedges per request sent, overall.
+HEDGE_ENABLED = os.getenv("GRID_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("GRID_HEDGE_PERCENTILE", "95"))
+HEDGE_BUDGET = float(os.getenv("GRID_HEDGE_BUDGET", "0.05"))
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.02   # never hedge sooner than this (seconds)
+
+# Team discovery: allSeries pages per tournament (50 series each), tournaments per aliased
+# request, and how long a tournament -> teams scan is served from TEAM_INDEX.
+DISCOVERY_MAX_PAGES = int(os.getenv("DISCOVERY_MAX_PAGES", "4"))
+DISCOVERY_BATCH = 10
+TEAM_LIST_TTL = float(os.getenv("TEAM_LIST_TTL", "900"))
 
 HEADERS = {
     "Content-Type": "application/json",
@@ -18,26 +62,404 @@ HEADERS = {
 }
 
 
+def configure_endpoints(central_data_url=None, series_state_url=None):
+    """Points the client at another GRID-compatible host (e.g. the benchmark mock server)."""
+    global CENTRAL_DATA_URL, SERIES_STATE_URL
+    if central_data_url:
+        CENTRAL_DATA_URL = central_data_url
+    if series_state_url:
+        SERIES_STATE_URL = series_state_url
+
+
 # ==================================================
 # CORE POST HELPER
 # ==================================================
+def _endpoint_name(url):
+    return "series-state" if url == SERIES_STATE_URL else "central-data" if url == CENTRAL_DATA_URL else url
+
+def _operation_name(query):
+    # "query SeriesState($seriesId: ID!) {...}" -> "SeriesState"
+    head = query.strip().split("(", 1)[0].split("{", 1)[0].split()
+    return head[1] if len(head) > 1 else "anonymous"
+
+class CircuitBreaker:
+    """
+    closed -> open after `failures` consecutive failures; open -> half_open once
+    `cooldown` has passed, letting a single trial call through; that call closes
+    the breaker again or re-opens it.
+    """
+
+    def __init__(self, name, failures=None, cooldown=None):
+        self.name = name
+        self.failures = BREAKER_FAILURES if failures is None else failures
+        self.cooldown = BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._trial = False
+            if self.state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def is_open(self):
+        """True while calls are being refused (no side effects, unlike allow())."""
+        with self._lock:
+            return self.state != "closed" and not (self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown)
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.consecutive, self.opened_at, self._trial = "closed", 0, None, False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive += 1
+            if self.state == "half_open" or self.consecutive >= self.failures:
+                if self.state != "open":
+                    incr("grid_circuit_opened_total", endpoint=self.name)
+                self.state, self.opened_at, self._trial = "open", time.monotonic(), False
+
+    def status(self):
+        with self._lock:
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at)) if self.state == "open" else 0.0
+            return {"endpoint": self.name, "state": self.state, "consecutive_failures": self.consecutive, "retry_in_s": round(retry_in, 1)}
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(url):
+    name = _endpoint_name(url)
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def breaker_states():
+    """One status row per endpoint that has been called, for the diagnostics panel."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [b.status() for b in breakers]
+
+def _upstream_failure(exc):
+    # Timeouts, connection errors and 5xx/429 count against the endpoint; other 4xx are our fault
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return isinstance(exc, requests.RequestException)
+
+class _Flight:
+    """One in-flight GRID request that identical concurrent callers wait on."""
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = {"errors": [{"message": "Coalesced GRID request did not complete"}]}
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
 def post(url, query, variables=None):
+    """
+    Single-flight POST: concurrent calls with the same (endpoint, query,
+    variables) share one upstream request and its (read-only) response.
+    """
+    key = (url, query, json.dumps(variables, sort_keys=True, default=str))
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+
+    if not leader:
+        incr("grid_coalesced_total", endpoint=_endpoint_name(url))
+        with span("grid.coalesced", endpoint=_endpoint_name(url), operation=_operation_name(query)):
+            if flight.done.wait(REQUEST_TIMEOUT + 5):
+                return flight.result
+        return _post(url, query, variables)
+
     try:
-        response = requests.post(
-            url,
-            json={"query": query, "variables": variables},
-            headers=HEADERS,
-            timeout=60
-        )
-        response.raise_for_status()
-        res_json = response.json()
-        
-        if "errors" in res_json:
-            pass # Silent handling for production speed
+        flight.result = _post(url, query, variables)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+    return flight.result
+
+def _post(url, query, variables=None):
+    breaker = breaker_for(url)
+    if not breaker.allow():
+        # Fail fast instead of queueing callers behind a dead upstream
+        incr("grid_circuit_rejected_total", endpoint=breaker.name)
+        return {"errors": [{"message": f"GRID {breaker.name} unavailable (circuit open)"}], "circuit_open": True}
+    if HEDGE_ENABLED and url == SERIES_STATE_URL:
+        return _hedged_send(url, query, variables, breaker)
+    return _send(url, query, variables, breaker)
+
+def _send(url, query, variables, breaker, hedge=False):
+    with span("grid.post", endpoint=_endpoint_name(url), operation=_operation_name(query), hedge=hedge) as sp:
+        started = time.perf_counter()
+        try:
+            response = requests.post(
+                url,
+                json={"query": query, "variables": variables},
+                headers=HEADERS,
+                timeout=REQUEST_TIMEOUT
+            )
+            set_attributes(sp, http_status=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+            # orjson / msgspec when installed, stdlib json otherwise
+            res_json = loads(response.content)
             
-        return res_json
-    except Exception as e:
-        return {"errors": [{"message": str(e)}]}
+            if "errors" in res_json:
+                # Still returned to callers as before, but no longer invisible
+                incr("graphql_errors_total", len(res_json["errors"] or []), endpoint=_endpoint_name(url))
+                mark_error(sp, str((res_json["errors"] or [{}])[0].get("message", "GraphQL error")))
+                
+            breaker.record_success()
+            latency_for(url, query).add(time.perf_counter() - started)
+            return res_json
+        except Exception as e:
+            mark_error(sp, str(e))
+            if _upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return {"errors": [{"message": str(e)}]}
+
+# ==================================================
+# HEDGED REQUESTS
+# ==================================================
+class LatencyWindow:
+    """Last `size` successful call latencies for one endpoint + query, with percentile lookups."""
+
+    def __init__(self, size=200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct):
+        """Nearest-rank percentile, or None until HEDGE_MIN_SAMPLES calls have been seen."""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class HedgeBudget:
+    """Token bucket: each primary request earns `ratio` tokens, each hedge spends one."""
+
+    def __init__(self, ratio, burst=10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def spend(self):
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+_latencies = {}          # (endpoint, query text) -> LatencyWindow
+_latencies_lock = threading.Lock()
+HEDGE_BUDGET_BUCKET = HedgeBudget(HEDGE_BUDGET)
+_hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="grid-hedge")
+
+def latency_for(url, query):
+    # Keyed by the query text, not just the endpoint: live.py's version probes and the
+    # summary/standard/deep seriesState profiles have very different latencies
+    key = (_endpoint_name(url), query)
+    with _latencies_lock:
+        if key not in _latencies:
+            _latencies[key] = LatencyWindow()
+        return _latencies[key]
+
+def hedge_delay(url, query):
+    """Seconds to wait before hedging `query` on `url`, or None while there is too little history for it."""
+    threshold = latency_for(url, query).percentile(HEDGE_PERCENTILE)
+    return None if threshold is None else max(HEDGE_MIN_DELAY, threshold)
+
+def _hedged_send(url, query, variables, breaker):
+    """
+    Sends the request; if it is still out after hedge_delay() and the budget
+    allows, sends one duplicate and returns whichever answers first. The
+    loser is left to finish in the background (requests can't be cancelled).
+    """
+    HEDGE_BUDGET_BUCKET.earn()
+    delay = hedge_delay(url, query)
+    primary = _hedge_pool.submit(_send, url, query, variables, breaker)
+    if delay is None:
+        return primary.result()
+    done, _ = wait([primary], timeout=delay)
+    if done or not HEDGE_BUDGET_BUCKET.spend():
+        return primary.result()
+
+    incr("grid_hedges_total", endpoint=breaker.name)
+    hedge = _hedge_pool.submit(_send, url, query, variables, breaker, True)
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            # Take the first usable answer; an error only wins if both attempts fail
+            if "errors" not in result or not pending:
+                if future is hedge:
+                    incr("grid_hedge_wins_total", endpoint=breaker.name)
+                return result
+    return primary.result()
+
+def _fingerprint_default(obj):
+    return obj.to_dict() if hasattr(obj, "to_dict") else str(obj)
+
+def content_fingerprint(*parts):
+    """Stable short hash of JSON-serializable content, used as a cheap cache key."""
+    payload = json.dumps(parts, sort_keys=True, default=_fingerprint_default, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class TTLCache:
+    """
+    Thread-safe LRU with per-entry expiry; hits and misses go to telemetry under `name`.
+    Entries past `ttl` stay readable through get_stale() for another `stale_ttl` seconds;
+    put() can override both per entry.
+    """
+
+    def __init__(self, name, ttl, maxsize, stale_ttl=0):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self._items = OrderedDict()   # key -> (stored_at, value, ttl, stale_ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item and time.monotonic() - item[0] <= item[2]:
+                self._items.move_to_end(key)
+                record_cache(self.name, hit=True)
+                return item[1]
+            if item and time.monotonic() - item[0] > item[2] + item[3]:
+                del self._items[key]
+        record_cache(self.name, hit=False)
+        return None
+
+    def get_stale(self, key):
+        """(value, age_s) for an expired entry still inside the stale window, else None."""
+        with self._lock:
+            item = self._items.get(key)
+            if not item:
+                return None
+            age = time.monotonic() - item[0]
+            if age > item[2] + item[3]:
+                del self._items[key]
+                return None
+        incr("cache_stale_served_total", cache=self.name)
+        return item[1], age
+
+    def put(self, key, value, ttl=None, stale_ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        with self._lock:
+            self._items[key] = (time.monotonic(), value, ttl, stale_ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            return bool(item) and time.monotonic() - item[0] <= item[2]
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+SERIES_LIST_CACHE = TTLCache("series_list", SERIES_LIST_TTL, SERIES_CACHE_MAX, stale_ttl=SERIES_STALE_TTL)
+SERIES_STATE_CACHE = TTLCache("series_state", SERIES_STATE_TTL, SERIES_CACHE_MAX, stale_ttl=SERIES_STALE_TTL)
+
+def clear_series_cache():
+    SERIES_LIST_CACHE.clear()
+    SERIES_STATE_CACHE.clear()
+
+# ==================================================
+# STALE-WHILE-REVALIDATE
+# ==================================================
+_revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="grid-revalidate")
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+_staleness = threading.local()
+
+@contextmanager
+def track_staleness():
+    """
+    Records stale cache entries served on this thread inside the block.
+    Yields {"count", "max_age_s"}; count stays 0 when everything was fresh.
+    """
+    previous = getattr(_staleness, "record", None)
+    record = _staleness.record = {"count": 0, "max_age_s": 0.0}
+    try:
+        yield record
+    finally:
+        _staleness.record = previous
+
+def _note_stale(age):
+    record = getattr(_staleness, "record", None)
+    if record is not None:
+        record["count"] += 1
+        record["max_age_s"] = max(record["max_age_s"], age)
+
+def _revalidate(cache, key, load):
+    with _revalidating_lock:
+        if (cache.name, key) in _revalidating:
+            return
+        _revalidating.add((cache.name, key))
+
+    def run():
+        try:
+            load()
+            incr("cache_revalidations_total", cache=cache.name)
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard((cache.name, key))
+    _revalidator.submit(run)
+
+def _read_through(cache, key, url, load):
+    """
+    Fresh hit -> returned. Expired but within the stale window -> returned at
+    once (noted for track_staleness) and refreshed in the background unless the
+    endpoint's breaker is open. Nothing cached -> `load()` inline; `load` stores
+    its own result.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    stale = cache.get_stale(key)
+    if stale is None:
+        return load()
+    value, age = stale
+    _note_stale(age)
+    if not breaker_for(url).is_open():
+        _revalidate(cache, key, load)
+    return value
 
 def ensure_data(res):
     if not res: return None
@@ -66,40 +488,169 @@ def fetch_tournaments_safe():
     """Stable tournament fetch for the UI browser."""
     return fetch_recent_tournaments(limit=50), None
 
+# ==================================================
+# TOURNAMENT <-> TEAM INDEX
+# ==================================================
+class TeamIndex:
+    """
+    tournament id -> {(team id, team name, series tournament name)} and team id
+    -> tournament ids, filled by every discovery scan. Scans stopped at
+    DISCOVERY_MAX_PAGES are indexed too, with the cursor to resume them from.
+    Entries expire after `ttl` so new registrations show up.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._by_tournament = {}                # tournament id -> (indexed_at, frozenset of entries)
+        self._by_team = defaultdict(set)        # team id -> tournament ids
+        self._partial = {}                      # tournament id -> allSeries cursor its page-capped scan stopped at
+        self._lock = threading.Lock()
+
+    def add(self, tournament_id, entries, cursor=None):
+        entries = frozenset(entries)
+        with self._lock:
+            self._by_tournament[str(tournament_id)] = (time.monotonic(), entries)
+            if cursor:
+                self._partial[str(tournament_id)] = cursor
+            else:
+                self._partial.pop(str(tournament_id), None)
+            for team_id, _, _ in entries:
+                self._by_team[team_id].add(str(tournament_id))
+
+    def resume_cursor(self, tournament_id):
+        """Cursor to continue a page-capped scan from, or None when the indexed team list is complete."""
+        with self._lock:
+            return self._partial.get(str(tournament_id))
+
+    def get(self, tournament_id):
+        """The tournament's entries, or None when it was never (or too long ago) scanned."""
+        with self._lock:
+            item = self._by_tournament.get(str(tournament_id))
+            if item and time.monotonic() - item[0] > self.ttl:
+                del self._by_tournament[str(tournament_id)]
+                item = None
+        record_cache("team_index", hit=item is not None)
+        return item[1] if item else None
+
+    def __contains__(self, tournament_id):
+        with self._lock:
+            item = self._by_tournament.get(str(tournament_id))
+            return bool(item) and time.monotonic() - item[0] <= self.ttl
+
+    def tournaments_for_team(self, team_id):
+        """Indexed tournament ids the team has series in (unexpired scans only)."""
+        with self._lock:
+            tids = list(self._by_team.get(str(team_id), ()))
+        return sorted(t for t in tids if t in self)
+
+    def __len__(self):
+        return len(self._by_tournament)
+
+    def clear(self):
+        with self._lock:
+            self._by_tournament.clear()
+            self._by_team.clear()
+            self._partial.clear()
+
+TEAM_INDEX = TeamIndex(TEAM_LIST_TTL)
+
+def _tournament_series_query(count):
+    # One aliased allSeries per tournament (t0, t1, ...) so every page is attributable to the
+    # tournament it was requested for, even when its series sit in child tournaments
+    params = ", ".join(f"$t{i}: [ID!], $a{i}: Cursor" for i in range(count))
+    fields = "\n".join(
+        f"""  t{i}: allSeries(first: 50, after: $a{i}, filter: {{ tournament: {{ id: {{ in: $t{i} }}, includeChildren: {{ equals: true }} }} }}) {{
+    edges {{ node {{ teams {{ baseInfo {{ id name }} }} tournament {{ name }} }} }}
+    pageInfo {{ hasNextPage endCursor }}
+  }}"""
+        for i in range(count)
+    )
+    return f"query ScanTournamentTeams({params}) {{\n{fields}\n}}"
+
+def scan_tournament_teams(tournament_ids, resume=None):
+    """
+    Pages through allSeries for each tournament (DISCOVERY_BATCH per request,
+    up to DISCOVERY_MAX_PAGES each) and returns {tournament id: entries}.
+    Every tournament scanned without errors is added to TEAM_INDEX; one cut
+    off at the page cap keeps its cursor there. `resume` ({tournament id:
+    (cursor, entries so far)}) continues such scans instead of starting over.
+    """
+    resume = resume or {}
+    cursors = {str(t): resume.get(str(t), (None, ()))[0] for t in tournament_ids}   # still to fetch -> next cursor
+    found = {tid: set(resume.get(tid, (None, ()))[1]) for tid in cursors}
+    pages = defaultdict(int)
+    with span("grid.scan_tournament_teams", tournaments=len(cursors)) as sp:
+        while cursors:
+            batch = list(cursors.items())[:DISCOVERY_BATCH]
+            variables = {}
+            for i, (tid, cursor) in enumerate(batch):
+                variables[f"t{i}"], variables[f"a{i}"] = [tid], cursor
+            data = ensure_data(post(CENTRAL_DATA_URL, _tournament_series_query(len(batch)), variables))
+            for i, (tid, _) in enumerate(batch):
+                conn = (data or {}).get(f"t{i}")
+                if not conn:
+                    del cursors[tid]       # failed: leave unindexed so the next lookup retries
+                    continue
+                for edge in conn.get("edges") or []:
+                    node = edge["node"]
+                    t_context = (node.get("tournament") or {}).get("name", "")
+                    for t in node.get("teams") or []:
+                        if t.get("baseInfo"):
+                            found[tid].add((t["baseInfo"]["id"], t["baseInfo"]["name"], t_context))
+                pages[tid] += 1
+                info = conn.get("pageInfo") or {}
+                if info.get("hasNextPage") and info.get("endCursor") and pages[tid] < DISCOVERY_MAX_PAGES:
+                    cursors[tid] = info["endCursor"]
+                    continue
+                del cursors[tid]
+                TEAM_INDEX.add(tid, found[tid], cursor=info.get("endCursor") if info.get("hasNextPage") else None)
+        set_attributes(sp, pages=sum(pages.values()))
+    return found
+
+def _indexed_or_scanned(tournament_ids):
+    ids = [str(t) for t in tournament_ids]
+    entries = {tid: TEAM_INDEX.get(tid) for tid in ids}
+    missing = [tid for tid, e in entries.items() if e is None]
+    if missing:
+        entries.update(scan_tournament_teams(missing))
+    for tid in ids:
+        if TEAM_INDEX.resume_cursor(tid):
+            _finish_scan(tid)
+    return entries
+
+def _finish_scan(tournament_id):
+    """
+    Continues a page-capped scan in the background (DISCOVERY_MAX_PAGES more
+    pages per lookup) while callers get the teams indexed so far.
+    """
+    key = ("team_index", tournament_id)
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def run():
+        try:
+            cursor, entries = TEAM_INDEX.resume_cursor(tournament_id), TEAM_INDEX.get(tournament_id)
+            if cursor and entries is not None:
+                scan_tournament_teams([tournament_id], resume={tournament_id: (cursor, entries)})
+                incr("team_index_resumed_scans_total")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+    _revalidator.submit(run)
+
 def discover_teams_from_tournament_list(tournament_ids):
-    """Fetches all teams competing in a provided list of tournament IDs."""
+    """Fetches all teams competing in a provided list of tournament IDs (indexed tournaments skip GRID)."""
     if not tournament_ids: return []
     
-    query = """
-    query GetTeamsFromTournaments($tournamentIds: [ID!]) {
-      allSeries(first: 50, filter: { tournament: { id: { in: $tournamentIds }, includeChildren: { equals: true } } }) {
-        edges { 
-          node { 
-            teams { 
-              baseInfo { id name } 
-            } 
-            tournament { name }
-          } 
-        } 
-      }
-    }
-    """
-    res = post(CENTRAL_DATA_URL, query, {"tournamentIds": [str(tid) for tid in tournament_ids]})
-    data = ensure_data(res)
-    if not data: return []
-    
     teams = {} 
-    for s in data["allSeries"]["edges"]:
-        t_context = s["node"]["tournament"]["name"]
-        if s["node"]["teams"]:
-            for t in s["node"]["teams"]:
-                if t.get("baseInfo"):
-                    name = t["baseInfo"]["name"]
-                    tid = t["baseInfo"]["id"]
-                    if name not in teams:
-                        teams[name] = {"id": tid, "tournaments": {t_context}}
-                    else:
-                        teams[name]["tournaments"].add(t_context)
+    for entries in _indexed_or_scanned(tournament_ids).values():
+        for tid, name, t_context in entries:
+            if name not in teams:
+                teams[name] = {"id": tid, "tournaments": {t_context}}
+            else:
+                teams[name]["tournaments"].add(t_context)
     
     result = []
     for name, info in teams.items():
@@ -114,36 +665,18 @@ def discover_teams_from_tournament_list(tournament_ids):
     return sorted(result, key=lambda x: x["name"])
 
 def discover_teams_from_tournament(tournament_id):
-    """Fetches all teams competing in a specific tournament ID."""
-    query = """
-    query GetTeams($tournamentId: [ID!]) {
-      allSeries(first: 50, filter: { tournament: { id: { in: $tournamentId }, includeChildren: { equals: true } } }) {
-        edges { 
-          node { 
-            teams { 
-              baseInfo { id name } 
-            } 
-          } 
-        } 
-      }
-    }
-    """
-    res = post(CENTRAL_DATA_URL, query, {"tournamentId": [str(tournament_id)]})
-    data = ensure_data(res)
-    if not data: return []
-    
-    teams = {} 
-    for s in data["allSeries"]["edges"]:
-        if s["node"]["teams"]:
-            for t in s["node"]["teams"]:
-                if t.get("baseInfo"):
-                    teams[t["baseInfo"]["name"]] = t["baseInfo"]["id"]
-    
-    result = [{"name": name, "id": teams[name]} for name in sorted(list(teams.keys()))]
-    return result
+    """Fetches all teams competing in a specific tournament ID (from TEAM_INDEX when already scanned)."""
+    entries = _indexed_or_scanned([tournament_id])[str(tournament_id)]
+    teams = {name: tid for tid, name, _ in entries}
+    return [{"name": name, "id": teams[name]} for name in sorted(teams)]
 
 def fetch_series_info_for_team(team_id, tournament_id=None, limit=20):
-    """Fetches series IDs and Tournament names for a team."""
+    """Fetches series IDs and Tournament names for a team (read through SERIES_LIST_CACHE)."""
+    cache_key = (str(team_id), str(tournament_id) if tournament_id else None, limit)
+    return _read_through(SERIES_LIST_CACHE, cache_key, CENTRAL_DATA_URL,
+                         lambda: _load_series_info(cache_key, team_id, tournament_id, limit))
+
+def _load_series_info(cache_key, team_id, tournament_id, limit):
     filter_vars = {
         "teamIds": { "in": [str(team_id)] },
         "types": "ESPORTS"
@@ -175,7 +708,7 @@ def fetch_series_info_for_team(team_id, tournament_id=None, limit=20):
     })
     data = ensure_data(res)
     if not data: return []
-    return [
+    series = [
         {
             "id": s["node"]["id"], 
             "tournament": s["node"]["tournament"]["name"],
@@ -183,61 +716,213 @@ def fetch_series_info_for_team(team_id, tournament_id=None, limit=20):
         } 
         for s in data["allSeries"]["edges"]
     ]
+    SERIES_LIST_CACHE.put(cache_key, series)
+    return series
 
 # ==================================================
 # 2️⃣ ENHANCED DATA COLLECTION
 # ==================================================
-QUERY_SERIES_STATE_DEEP = """
-query SeriesState($seriesId: ID!) {
-  seriesState(id: $seriesId) {
-    version
-    teams { name won }
-    games {
-      sequenceNumber
-      map { name }
-      teams {
-        name won side score
-        ... on GameTeamStateLol {
-          kills deaths netWorth money
-          players { name kills deaths killAssistsGiven netWorth }
-        }
-        ... on GameTeamStateCs2 {
-          kills deaths netWorth money
-          players { name kills deaths killAssistsGiven netWorth }
-        }
-        ... on GameTeamStateValorant {
-          kills deaths netWorth money
-          players { name kills deaths killAssistsGiven netWorth }
-        }
-        ... on GameTeamStateDefault {
-          kills deaths netWorth
-          players { name kills deaths killAssistsGiven netWorth }
+# One field spec drives every seriesState query. Profiles pick how much of it to select:
+#   summary  -> series winner only (opponent lists, W/L records)
+#   standard -> per-game team + player combat stats used by collect_team_data
+#   deep     -> standard plus economy fields (money)
+SERIES_STATE_PROFILES = {
+    "summary":  {"games": False, "team_stats": [], "players": []},
+    "standard": {"games": True, "team_stats": ["kills", "deaths", "netWorth"],
+                 "players": ["name", "kills", "deaths", "killAssistsGiven", "netWorth"]},
+    "deep":     {"games": True, "team_stats": ["kills", "deaths", "netWorth", "money"],
+                 "players": ["name", "kills", "deaths", "killAssistsGiven", "netWorth"]}
+}
+# Per-title GameTeamState fragments and the fields each one lacks
+GAME_TEAM_FRAGMENTS = {
+    "GameTeamStateLol": set(),
+    "GameTeamStateCs2": set(),
+    "GameTeamStateValorant": set(),
+    "GameTeamStateDefault": {"money"}
+}
+
+_QUERY_CACHE = {}
+
+def build_series_state_query(profile="standard"):
+    """Renders (and memoizes) the seriesState query for a profile."""
+    if profile in _QUERY_CACHE:
+        return _QUERY_CACHE[profile]
+    if profile not in SERIES_STATE_PROFILES:
+        raise ValueError(f"Unknown series-state profile {profile!r}; expected one of {sorted(SERIES_STATE_PROFILES)}")
+    spec = SERIES_STATE_PROFILES[profile]
+
+    games = ""
+    if spec["games"]:
+        fragments = []
+        for fragment, missing in GAME_TEAM_FRAGMENTS.items():
+            stats = " ".join(f for f in spec["team_stats"] if f not in missing)
+            players = f"\n          players {{ {' '.join(spec['players'])} }}" if spec["players"] else ""
+            fragments.append(f"        ... on {fragment} {{\n          {stats}{players}\n        }}")
+        games = (
+            "\n    games {\n      sequenceNumber\n      map { name }\n      teams {\n        name won side score\n"
+            + "\n".join(fragments)
+            + "\n      }\n    }"
+        )
+
+    query = (
+        "\nquery SeriesState($seriesId: ID!) {\n  seriesState(id: $seriesId) {\n    version\n    teams { name won }"
+        + games
+        + "\n  }\n}\n"
+    )
+    _QUERY_CACHE[profile] = query
+    return query
+
+QUERY_SERIES_STATE_DEEP = build_series_state_query("deep")
+
+def collect_team_data(target_team_name, series_info_list, max_matches=10, profile="standard"):
+    """
+    Fetches and aggregates a team's recent series. `profile="summary"` is enough
+    for win/loss records and opponent lists; game and player stats stay empty.
+    """
+    with span("grid.collect_team_data", team=target_team_name, series_requested=len(series_info_list[:max_matches]), profile=profile) as sp:
+        enriched = aggregate_team_series(target_team_name, fetch_series_states(series_info_list[:max_matches], profile=profile))
+        set_attributes(sp, series_collected=enriched["total_series"], maps=enriched["total_maps"])
+        return enriched
+
+def collect_field_data(teams, tournament_id=None, max_matches=10, profile="standard"):
+    """
+    collect_team_data for a whole field of {'name', 'id'} teams in one pass: a
+    series shared by two listed teams is fetched (and sent to listeners) once.
+    Returns ({team name: TeamData}, {"series_requested", "series_fetched"}).
+    """
+    with span("grid.collect_field_data", teams=len(teams), profile=profile) as sp:
+        lists = {t["name"]: fetch_series_info_for_team(t["id"], tournament_id=tournament_id)[:max_matches] for t in teams}
+        states = {}
+        for series in lists.values():
+            for s_info in series:
+                if s_info["id"] not in states:
+                    states[s_info["id"]] = fetch_series_state(s_info["id"], profile=profile, series_info=s_info)
+        field = {
+            name: aggregate_team_series(name, [(s, states[s["id"]]) for s in series if states[s["id"]]])
+            for name, series in lists.items()
         }
-      }
+        stats = {"series_requested": sum(len(series) for series in lists.values()), "series_fetched": len(states)}
+        set_attributes(sp, **stats)
+        return field, stats
+
+def fetch_series_states(series_info_list, profile="standard", typed=None):
+    """
+    Yields (series_info, seriesState) for every series whose state came back usable.
+    With `typed`, states are compact grid_models.SeriesState structs that still
+    answer `.get()` / `[...]` like the raw dicts. States are read through
+    SERIES_STATE_CACHE, which the background prefetcher also fills.
+    """
+    for s_info in series_info_list:
+        state = fetch_series_state(s_info["id"], profile=profile, typed=typed, series_info=s_info)
+        if state:
+            yield s_info, state
+
+def series_state_cached(series_id, profile="standard"):
+    """True when a fresh state for this series is already in SERIES_STATE_CACHE (no telemetry)."""
+    return (str(series_id), profile) in SERIES_STATE_CACHE
+
+def fetch_series_state(series_id, profile="standard", typed=None, series_info=None):
+    """
+    One seriesState (cached per series id + profile), or None when GRID has
+    nothing usable. Passing the series' `series_info` row also hands the state
+    to the series listeners.
+    """
+    cache_key = (str(series_id), profile)
+    typed = TYPED_SERIES_STATES if typed is None else typed
+    state = _read_through(SERIES_STATE_CACHE, cache_key, SERIES_STATE_URL,
+                          lambda: _load_series_state(cache_key, series_id, profile, typed))
+    if state and series_info is not None and _series_listeners:
+        _notify_series(series_info, state)
+    return state
+
+_series_listeners = []
+
+def add_series_listener(callback):
+    """
+    Registers callback(series_info, series_state), called for every usable
+    state read with its series_info (cache hits included, so callbacks must
+    de-duplicate by series id and stay cheap).
+    """
+    if callback not in _series_listeners:
+        _series_listeners.append(callback)
+
+def _notify_series(series_info, state):
+    for callback in list(_series_listeners):
+        try:
+            callback(series_info, state)
+        except Exception as e:
+            # A broken listener must never fail a scouting run
+            incr("series_listener_errors_total", error=type(e).__name__)
+
+def _load_series_state(cache_key, series_id, profile, typed):
+    res = post(SERIES_STATE_URL, build_series_state_query(profile), {"seriesId": str(series_id)})
+    state = decode_series_state(res) if typed else (res.get("data") or {}).get("seriesState")
+    if not state:
+        return None
+    if any(t.get("won") for t in state.get("teams") or []):
+        SERIES_STATE_CACHE.put(cache_key, state)
+    else:
+        # Still live (or not started): re-read soon, and never hand out an old score as stale data
+        SERIES_STATE_CACHE.put(cache_key, state, ttl=SERIES_LIVE_TTL, stale_ttl=0)
+    return state
+
+def find_team(teams, target_team_name):
+    """The seriesState team whose name contains (or is contained in) target_team_name."""
+    target = target_team_name.lower()
+    return next((t for t in teams if target in t["name"].lower() or t["name"].lower() in target), None)
+
+def game_stat_row(game, actual_name):
+    """(our GameTeamState or None, game_stats row) for one game of a series."""
+    our_stat = next((t for t in game.get("teams", []) if t["name"] == actual_name), None)
+    if not our_stat:
+        return None, None
+    opp_stat = next((t for t in game.get("teams", []) if t["name"] != actual_name), None)
+    return our_stat, {
+        "map": game.get("map", {}).get("name", "Unknown") if game.get("map") else "Unknown",
+        "won": our_stat.get("won", False),
+        "side": our_stat.get("side", "Unknown"),
+        "score": f"{our_stat.get('score', 0)}-{opp_stat.get('score', 0) if opp_stat else 0}",
+        "kills": our_stat.get("kills"),
+        "deaths": our_stat.get("deaths"),
+        "net_worth": our_stat.get("netWorth")
     }
-  }
-}
-"""
 
-def collect_team_data(target_team_name, series_info_list, max_matches=10):
+def summarize_players(player_data, top=5):
+    """Per-player k/d/a/nw/games totals -> the top players by KDA, with impact scores."""
+    refined_players = []
+    for p, s in player_data.items():
+        if s["games"] > 0:
+            kda = round((s["k"] + s["a"]) / s["d"] if s["d"] > 0 else (s["k"] + s["a"]), 2)
+            avg_kills = round(s["k"] / s["games"], 2)
+            avg_deaths = round(s["d"] / s["games"], 2)
+            
+            refined_players.append({
+                "name": p,
+                "avg_kda": kda,
+                "avg_kills": avg_kills,
+                "avg_deaths": avg_deaths,
+                "avg_networth": int(s["nw"] / s["games"]),
+                "participation": s["games"]
+            })
+    
+    top_players = sorted(refined_players, key=lambda x: x["avg_kda"], reverse=True)[:top]
+    for p in top_players:
+        p["impact_score"] = round((p["avg_kda"] * 5) + (p["avg_networth"] / 2000), 1)
+    return top_players
+
+def aggregate_team_series(target_team_name, series_states):
+    """Pure aggregation of (series_info, seriesState) pairs into team_models.TeamData (dict-compatible)."""
     collected = []
     player_data = defaultdict(lambda: {"k": 0, "d": 0, "a": 0, "nw": 0, "games": 0})
     tournament_stats = defaultdict(lambda: {"w": 0, "l": 0})
     losses = []
     wins = []
     
-    for s_info in series_info_list[:max_matches]:
+    for s_info, state in series_states:
         sid = s_info["id"]
         t_name = s_info["tournament"]
         
-        res = post(SERIES_STATE_URL, QUERY_SERIES_STATE_DEEP, {"seriesId": str(sid)})
-        data = res.get("data")
-        if not data or not data.get("seriesState"):
-            continue
-            
-        state = data["seriesState"]
-        
-        matching_team = next((t for t in state["teams"] if target_team_name.lower() in t["name"].lower() or t["name"].lower() in target_team_name.lower()), None)
+        matching_team = find_team(state["teams"], target_team_name)
         
         if matching_team:
             actual_name = matching_team["name"]
@@ -264,19 +949,10 @@ def collect_team_data(target_team_name, series_info_list, max_matches=10):
             series_players = defaultdict(lambda: {"k": 0, "d": 0, "a": 0})
             
             for game in state.get("games", []):
-                our_stat = next((t for t in game.get("teams", []) if t["name"] == actual_name), None)
-                opp_stat = next((t for t in game.get("teams", []) if t["name"] != actual_name), None)
+                our_stat, row = game_stat_row(game, actual_name)
                 
                 if our_stat:
-                    summary["game_stats"].append({
-                        "map": game.get("map", {}).get("name", "Unknown") if game.get("map") else "Unknown",
-                        "won": our_stat.get("won", False),
-                        "side": our_stat.get("side", "Unknown"),
-                        "score": f"{our_stat.get('score', 0)}-{opp_stat.get('score', 0) if opp_stat else 0}",
-                        "kills": our_stat.get("kills"),
-                        "deaths": our_stat.get("deaths"),
-                        "net_worth": our_stat.get("netWorth")
-                    })
+                    summary["game_stats"].append(row)
                     
                     for p in our_stat.get("players", []):
                         p_name = p.get("name")
@@ -294,32 +970,14 @@ def collect_team_data(target_team_name, series_info_list, max_matches=10):
                 best_p = max(series_players.keys(), key=lambda p: (series_players[p]["k"] + series_players[p]["a"]) / (series_players[p]["d"] if series_players[p]["d"] > 0 else 1))
                 summary["key_player"] = best_p
             
-            collected.append(summary)
+            collected.append(SeriesSummary.from_dict(summary))
     
-    refined_players = []
-    for p, s in player_data.items():
-        if s["games"] > 0:
-            kda = round((s["k"] + s["a"]) / s["d"] if s["d"] > 0 else (s["k"] + s["a"]), 2)
-            avg_kills = round(s["k"] / s["games"], 2)
-            avg_deaths = round(s["d"] / s["games"], 2)
-            
-            refined_players.append({
-                "name": p,
-                "avg_kda": kda,
-                "avg_kills": avg_kills,
-                "avg_deaths": avg_deaths,
-                "avg_networth": int(s["nw"] / s["games"]),
-                "participation": s["games"]
-            })
-    
-    top_players = sorted(refined_players, key=lambda x: x["avg_kda"], reverse=True)[:5]
-    for p in top_players:
-        p["impact_score"] = round((p["avg_kda"] * 5) + (p["avg_networth"] / 2000), 1)
+    top_players = summarize_players(player_data)
         
     map_wins = sum(1 for s in collected for g in s["game_stats"] if g["won"])
     total_maps = sum(len(s["game_stats"]) for s in collected)
 
-    return {
+    enriched = {
         "series": collected,
         "top_players": top_players,
         "losses": losses,
@@ -329,3 +987,6 @@ def collect_team_data(target_team_name, series_info_list, max_matches=10):
         "map_win_rate": round((map_wins/total_maps)*100, 1) if total_maps > 0 else 0,
         "total_maps": total_maps
     }
+    # Computed once here so downstream caches never have to hash the whole structure
+    enriched["fingerprint"] = content_fingerprint(target_team_name, enriched)
+    return TeamData.from_dict(enriched)
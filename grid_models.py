@@ -0,0 +1,125 @@
+import json
+from collections.abc import Mapping
+
+# ==================================================
+# OPTIONAL FAST JSON DECODER
+# ==================================================
+try:
+    import orjson
+    loads = orjson.loads
+    DECODER = "orjson"
+except ImportError:
+    try:
+        import msgspec
+        loads = msgspec.json.decode
+        DECODER = "msgspec"
+    except ImportError:
+        loads = json.loads
+        DECODER = "json"
+
+# ==================================================
+# TYPED seriesState STRUCTS (__slots__, dict-compatible)
+# ==================================================
+_MISSING = object()
+_setattr = object.__setattr__
+
+class WireStruct(Mapping):
+    """
+    Compact, read-only view of one GraphQL object. Attribute names match the
+    wire (camelCase) keys so existing `.get("netWorth")` / `["won"]` callers keep
+    working; fields the query didn't select behave like absent dict keys.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    NESTED = {}   # field -> (struct class, is_list)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELDSET = frozenset(cls.FIELDS)
+        cls.SCALARS = tuple(f for f in cls.FIELDS if f not in cls.NESTED)
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = cls.__new__(cls)
+        setter, get = _setattr, data.get
+        for field in cls.SCALARS:
+            setter(obj, field, get(field, _MISSING))
+        for field, (sub, many) in cls.NESTED.items():
+            value = get(field, _MISSING)
+            if value is not _MISSING and value is not None:
+                build = sub.from_dict
+                value = [build(v) if v is not None else None for v in value] if many else build(value)
+            setter(obj, field, value)
+        return obj
+
+    def get(self, key, default=None):
+        # Every slot is always set (to _MISSING when absent), so a plain getattr suffices;
+        # the FIELDSET guard only keeps method names from leaking through as "keys"
+        value = getattr(self, key, _MISSING) if key in self.FIELDSET else _MISSING
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = getattr(self, key, _MISSING) if key in self.FIELDSET else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.FIELDSET and getattr(self, key) is not _MISSING
+
+    def __iter__(self):
+        return (f for f in self.FIELDS if getattr(self, f) is not _MISSING)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={self[k]!r}' for k in self)})"
+
+    def to_dict(self):
+        """Plain nested dicts/lists, identical to the original JSON."""
+        out = {}
+        for field in self:
+            value = getattr(self, field)
+            if isinstance(value, WireStruct):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, WireStruct) else v for v in value]
+            out[field] = value
+        return out
+
+class PlayerState(WireStruct):
+    FIELDS = ("name", "kills", "deaths", "killAssistsGiven", "netWorth")
+    __slots__ = FIELDS
+
+class MapInfo(WireStruct):
+    FIELDS = ("name",)
+    __slots__ = FIELDS
+
+class GameTeamState(WireStruct):
+    FIELDS = ("name", "won", "side", "score", "kills", "deaths", "netWorth", "money", "players")
+    __slots__ = FIELDS
+    NESTED = {"players": (PlayerState, True)}
+
+class Game(WireStruct):
+    FIELDS = ("sequenceNumber", "map", "teams")
+    __slots__ = FIELDS
+    NESTED = {"map": (MapInfo, False), "teams": (GameTeamState, True)}
+
+class TeamState(WireStruct):
+    FIELDS = ("name", "won")
+    __slots__ = FIELDS
+
+class SeriesState(WireStruct):
+    FIELDS = ("version", "teams", "games")
+    __slots__ = FIELDS
+    NESTED = {"teams": (TeamState, True), "games": (Game, True)}
+
+def decode_series_state(payload):
+    """Raw response bytes (or an already-decoded dict) -> SeriesState, or None when absent."""
+    data = loads(payload) if isinstance(payload, (bytes, bytearray, str)) else payload
+    state = ((data or {}).get("data") or {}).get("seriesState")
+    return SeriesState.from_dict(state) if state else None
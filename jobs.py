@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import queue
+import uuid
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from telemetry import incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# "thread" workers share this process's series cache and prefetcher;
+# "process" workers isolate CPU-heavy PDF/LLM work but each keep their own caches
+JOB_WORKER_MODE = os.getenv("JOB_WORKER_MODE", "thread")
+JOB_HISTORY = 200          # finished jobs kept for polling
+
+ACTIVE_STATES = ("queued", "running")
+
+# ==================================================
+# WORKER ENTRY POINT (THREAD OR PROCESS)
+# ==================================================
+def run_job(job_id, kind, params, events):
+    """Executes one pipeline job, streaming (job_id, event, message, ts) tuples into `events`."""
+    from prefetch import foreground
+    from ratings import default_engine
+    from players import default_index
+    from form import default_form_index
+    default_engine()   # no-ops in thread mode; register the series listeners in a worker process
+    default_index()
+    default_form_index()
+
+    def progress(message):
+        events.put((job_id, "progress", message, time.time()))
+
+    events.put((job_id, "running", None, time.time()))
+    with foreground():
+        if kind == "scout":
+            from report_store import scout_with_store
+            dp, source = scout_with_store(params["name"], params["id"], params.get("tournament_id"), progress=progress)
+            if source == "store":
+                progress("📦 Served the stored report: GRID lists no new series for this team.")
+            return dp
+        if kind == "compare":
+            from pipeline import compare_teams
+            return compare_teams(params["team_a"], params["team_b"], progress=progress)
+        if kind == "rank":
+            from pipeline import rank_tournament
+            return rank_tournament(params["tournament_id"], params.get("tournament_name"), progress=progress)
+    raise ValueError(f"Unknown job kind {kind!r}")
+
+# ==================================================
+# LOCAL JOB QUEUE
+# ==================================================
+class JobQueue:
+    """
+    Bounded pool of pipeline workers. The web tier submits a job, gets an id
+    back and polls status()/result(); progress messages arrive as events.
+    Identical jobs already queued or running are coalesced onto one id.
+    """
+
+    def __init__(self, workers=None, mode=None, initializer=None, initargs=()):
+        self.workers = JOB_WORKERS if workers is None else workers
+        self.mode = mode or JOB_WORKER_MODE
+        if self.mode == "process":
+            ctx = multiprocessing.get_context("spawn")   # no forking a threaded Streamlit server
+            self._manager = ctx.Manager()
+            self._events = self._manager.Queue()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx, initializer=initializer, initargs=initargs)
+        else:
+            self._manager = None
+            self._events = queue.Queue()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job", initializer=initializer, initargs=initargs)
+        self._jobs = OrderedDict()
+        self._active = {}          # dedupe key -> job id
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._pump = threading.Thread(target=self._pump_events, name="job-events", daemon=True)
+        self._pump.start()
+
+    def submit(self, kind, **params):
+        key = (kind, json.dumps(params, sort_keys=True, default=str))
+        with self._lock:
+            existing = self._active.get(key)
+            if existing and self._jobs[existing]["state"] in ACTIVE_STATES:
+                incr("jobs_coalesced_total", kind=kind)
+                return existing
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                "id": job_id, "kind": kind, "params": params, "state": "queued",
+                "events": [], "result": None, "error": None,
+                "submitted_at": time.time(), "started_at": None, "finished_at": None
+            }
+            self._active[key] = job_id
+            self._trim()
+        incr("jobs_submitted_total", kind=kind)
+        future = self._pool.submit(run_job, job_id, kind, params, self._events)
+        future.add_done_callback(lambda f, job_id=job_id, key=key: self._finish(job_id, key, f))
+        return job_id
+
+    def status(self, job_id):
+        """Job record without the result payload, or None for unknown/expired ids."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            view = {k: v for k, v in job.items() if k != "result"}
+            view["events"] = list(job["events"])
+            view["queue_position"] = self._queue_position(job_id) if job["state"] == "queued" else 0
+            return view
+
+    def result(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["result"] if job else None
+
+    def jobs(self):
+        with self._lock:
+            return [{k: v for k, v in job.items() if k not in ("result", "events")} for job in self._jobs.values()]
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        self._closed.set()
+        if self._manager:
+            self._manager.shutdown()
+
+    # --- internals ---
+    def _queue_position(self, job_id):
+        queued = [j for j, job in self._jobs.items() if job["state"] == "queued"]
+        return queued.index(job_id) + 1 if job_id in queued else 0
+
+    def _trim(self):
+        finished = [j for j, job in self._jobs.items() if job["state"] not in ACTIVE_STATES]
+        for job_id in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self._jobs[job_id]
+
+    def _pump_events(self):
+        while not self._closed.is_set():
+            try:
+                job_id, event, message, ts = self._events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            self._apply_event(job_id, event, message, ts)
+
+    def _apply_event(self, job_id, event, message, ts):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if event == "running" and job["state"] == "queued":
+                job["state"], job["started_at"] = "running", ts
+            elif event == "progress":
+                job["events"].append(message)
+
+    def _finish(self, job_id, key, future):
+        # Drain progress first so a finished job never misses its last messages
+        while True:
+            try:
+                self._apply_event(*self._events.get_nowait())
+            except (queue.Empty, EOFError, OSError):
+                break
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if self._active.get(key) == job_id:
+                del self._active[key]
+            if job is None:
+                return
+            job["finished_at"] = time.time()
+            if future.cancelled():
+                job["state"] = "cancelled"
+            elif future.exception() is not None:
+                job["state"], job["error"] = "failed", str(future.exception())
+            else:
+                job["state"], job["result"] = "done", future.result()
+        incr("jobs_finished_total", state=job["state"])
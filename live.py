@@ -0,0 +1,210 @@
+import os
+import time
+import threading
+from collections import defaultdict
+import grid_client
+from grid_client import find_team, game_stat_row, summarize_players, build_series_state_query
+from telemetry import span, set_attributes, incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", "5"))
+LIVE_IDLE_TIMEOUT = float(os.getenv("LIVE_IDLE_TIMEOUT", "300"))   # stop polling once nobody has looked for this long
+
+# Cheap probe: only the version, so unchanged polls never pull the games payload
+VERSION_QUERY = """
+query SeriesVersion($seriesId: ID!) {
+  seriesState(id: $seriesId) { version }
+}
+"""
+
+def _series_state(query, series_id):
+    # Uncached on purpose: SERIES_STATE_CACHE is for finished series
+    res = grid_client.post(grid_client.SERIES_STATE_URL, query, {"seriesId": str(series_id)})
+    state = (res.get("data") or {}).get("seriesState")
+    error = None if state else str((res.get("errors") or [{}])[0].get("message", "No seriesState for this series"))
+    return state, error
+
+# ==================================================
+# INCREMENTAL SERIES AGGREGATES
+# ==================================================
+class LiveSeries:
+    """
+    Running aggregates for one in-progress series, seen from `team_name`'s side.
+    A new seriesState only re-aggregates games whose payload changed: their old
+    player contributions are retracted and the new ones added.
+    """
+
+    def __init__(self, series_id, team_name, profile="deep"):
+        self.series_id = str(series_id)
+        self.team_name = team_name
+        self.query = build_series_state_query(profile)
+        self.version = None
+        self.teams = []
+        self.actual_name = None
+        self.error = None
+        self.updated_at = None
+        self._games = {}       # sequence number -> last seen game payload
+        self._rows = {}        # sequence number -> game_stats row
+        self._contrib = {}     # sequence number -> {player: (k, d, a, nw)}
+        self._players = defaultdict(lambda: {"k": 0, "d": 0, "a": 0, "nw": 0, "games": 0})
+
+    def poll(self):
+        """Version probe, then the full state only if it moved. Returns the update, or None if nothing changed."""
+        with span("live.poll", series_id=self.series_id) as sp:
+            probe, self.error = _series_state(VERSION_QUERY, self.series_id)
+            if probe is None:
+                set_attributes(sp, outcome="error")
+                return None
+            if self.version is not None and probe.get("version") == self.version:
+                incr("live_polls_total", outcome="unchanged")
+                set_attributes(sp, outcome="unchanged")
+                return None
+            state, self.error = _series_state(self.query, self.series_id)
+            update = self.apply(state) if state else None
+            incr("live_polls_total", outcome="changed" if update else "error")
+            set_attributes(sp, outcome="changed" if update else "error", changed_games=len(update["changed_games"]) if update else 0)
+            return update
+
+    def apply(self, state):
+        """Folds a seriesState into the aggregates; None when its version was already applied."""
+        if self.version is not None and state.get("version") == self.version:
+            return None
+        self.teams = [{"name": t["name"], "won": t.get("won")} for t in state.get("teams") or []]
+        if self.actual_name is None:
+            team = find_team(self.teams, self.team_name)
+            self.actual_name = team["name"] if team else None
+
+        changed = []
+        for idx, game in enumerate(state.get("games") or []):
+            seq = game.get("sequenceNumber", idx + 1)
+            if self._games.get(seq) == game:
+                continue
+            self._retract(seq)
+            self._add(seq, game)
+            changed.append(seq)
+
+        self.version = state.get("version")
+        self.updated_at = time.time()
+        return self.snapshot(changed)
+
+    def _add(self, seq, game):
+        self._games[seq] = game
+        our_stat, row = game_stat_row(game, self.actual_name) if self.actual_name else (None, None)
+        if not our_stat:
+            return
+        self._rows[seq] = row
+        contrib = self._contrib[seq] = {}
+        for p in our_stat.get("players") or []:
+            if not p.get("name"):
+                continue
+            k, d, a, nw = (p.get("kills") or 0), (p.get("deaths") or 0), (p.get("killAssistsGiven") or 0), (p.get("netWorth") or 0)
+            totals = self._players[p["name"]]
+            totals["k"] += k
+            totals["d"] += d
+            totals["a"] += a
+            totals["nw"] += nw
+            totals["games"] += 1
+            contrib[p["name"]] = (k, d, a, nw)
+
+    def _retract(self, seq):
+        self._games.pop(seq, None)
+        self._rows.pop(seq, None)
+        for name, (k, d, a, nw) in self._contrib.pop(seq, {}).items():
+            totals = self._players[name]
+            totals["k"] -= k
+            totals["d"] -= d
+            totals["a"] -= a
+            totals["nw"] -= nw
+            totals["games"] -= 1
+            if totals["games"] <= 0:
+                del self._players[name]
+
+    def finished(self):
+        return any(t.get("won") for t in self.teams)
+
+    def snapshot(self, changed_games=()):
+        rows = [self._rows[seq] for seq in sorted(self._rows)]
+        return {
+            "series_id": self.series_id,
+            "version": self.version,
+            "team": self.actual_name or self.team_name,
+            "in_series": self.actual_name is not None,
+            "opponent": next((t["name"] for t in self.teams if t["name"] != self.actual_name), "Unknown"),
+            "finished": self.finished(),
+            "series_win": next((t.get("won") for t in self.teams if t["name"] == self.actual_name), None),
+            "maps_won": sum(1 for r in rows if r["won"]),
+            "game_stats": rows,
+            "top_players": summarize_players(self._players),
+            "changed_games": list(changed_games),
+            "updated_at": self.updated_at
+        }
+
+# ==================================================
+# SHARED BACKGROUND POLLERS
+# ==================================================
+class LiveTracker:
+    """
+    Polls one LiveSeries on a daemon thread; viewers read view(). Stops when
+    the series is decided or nobody has viewed it for LIVE_IDLE_TIMEOUT seconds.
+    """
+
+    def __init__(self, series_id, team_name, interval=None):
+        self.series = LiveSeries(series_id, team_name)
+        self.interval = LIVE_POLL_INTERVAL if interval is None else interval
+        self.latest = None
+        self.polls = 0
+        self._last_view = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name=f"live-{self.series.series_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def running(self):
+        return bool(self._thread) and self._thread.is_alive()
+
+    def idle(self):
+        return time.monotonic() - self._last_view > LIVE_IDLE_TIMEOUT
+
+    def view(self):
+        self._last_view = time.monotonic()
+        return self.latest
+
+    def status(self):
+        return {"polls": self.polls, "version": self.series.version, "running": self.running(), "error": self.series.error}
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                update = self.series.poll()
+            except Exception as e:
+                self.series.error, update = str(e), None
+            self.polls += 1
+            if update:
+                self.latest = update
+            if self.series.finished() or self.idle():
+                return
+            self._stop.wait(self.interval)
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+def track_series(series_id, team_name, interval=None):
+    """Process-wide tracker for (series, team): every session watching it shares one poller."""
+    key = (str(series_id), team_name)
+    with _trackers_lock:
+        # Stopped trackers nobody has looked at for LIVE_IDLE_TIMEOUT (finished ones included) are dropped;
+        # a finished series still on screen keeps its final snapshot
+        for stale in [k for k, t in _trackers.items() if k != key and not t.running() and t.idle()]:
+            del _trackers[stale]
+        tracker = _trackers.get(key)
+        if tracker is None or (not tracker.running() and not tracker.series.finished()):
+            tracker = _trackers[key] = LiveTracker(series_id, team_name, interval).start()
+        return tracker
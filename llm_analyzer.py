@@ -1,16 +1,18 @@
 import json
 import os
 import re
+import sys
 from dotenv import load_dotenv
-from langchain_openai import AzureChatOpenAI
-from langchain_core.messages import HumanMessage
-import streamlit as st
+from telemetry import span, set_attributes
+from predictor import prompt_context, PREDICTOR_IN_PROMPT
 load_dotenv(override=True)
 
 def get_env(key):
-    # 1. Try Streamlit Secrets (for Cloud deployment)
+    # 1. Try Streamlit Secrets (for Cloud deployment) - only when already running under Streamlit,
+    #    so headless workers never pay for importing it.
+    st = sys.modules.get("streamlit")
     try:
-        if key in st.secrets:
+        if st and key in st.secrets:
             return st.secrets[key]
     except:
         pass
@@ -20,8 +22,19 @@ def get_env(key):
     if val: return val.strip().strip("'").strip('"')
     return val
 
+# Any object with .invoke(messages).content; used by the offline benchmarks
+_LLM_OVERRIDE = None
+
+def set_llm_override(llm):
+    """Routes every LLM call to `llm` instead of Azure. Pass None to restore."""
+    global _LLM_OVERRIDE
+    _LLM_OVERRIDE = llm
+
 def get_llm():
     """Initializes the LLM only when needed to prevent startup crashes."""
+    if _LLM_OVERRIDE is not None:
+        return _LLM_OVERRIDE
+
     key = get_env("AZURE_OPENAI_KEY")
     endpoint = get_env("AZURE_OPENAI_ENDPOINT")
     deployment = get_env("AZURE_OPENAI_DEPLOYMENT")
@@ -30,6 +43,8 @@ def get_llm():
     if not (key and endpoint and deployment):
         return None
 
+    # langchain is heavy; only load it once credentials say we'll actually use it
+    from langchain_openai import AzureChatOpenAI
     return AzureChatOpenAI(
         api_key=key,
         azure_endpoint=endpoint,
@@ -38,6 +53,25 @@ def get_llm():
         temperature=0.2
     )
 
+def invoke_llm(llm, prompt, stage="llm"):
+    """Sends a single user prompt and returns the text content."""
+    from langchain_core.messages import HumanMessage
+    with span("llm.invoke", stage=stage, prompt_chars=len(prompt)) as sp:
+        content = llm.invoke([HumanMessage(content=prompt)]).content
+        set_attributes(sp, response_chars=len(content or ""))
+        return content
+
+# Bookkeeping keys on enriched data that carry no signal for the model
+PROMPT_EXCLUDED_KEYS = ("fingerprint", "report_fingerprint", "stale_age_s")
+
+def prompt_view(data):
+    """Enriched data minus bookkeeping keys, ready for json.dumps into a prompt."""
+    if hasattr(data, "to_dict"):
+        data = data.to_dict()
+    if not isinstance(data, dict):
+        return data
+    return {k: v for k, v in data.items() if k not in PROMPT_EXCLUDED_KEYS}
+
 def extract_section(text, tag):
     """Robustly extracts text between [[TAG]] and [[/TAG]]."""
     pattern = rf"\[\[{tag}\]\](.*?)\[\[/{tag}\]\]"
@@ -58,7 +92,7 @@ def generate_scouting_report(team_name, raw_data_dict):
             "execution_plan": "Gather more intelligence."
         }, [], "Patterns inconsistent.", "Awaiting more data."
 
-    data_str = json.dumps(raw_data_dict, indent=2)
+    data_str = json.dumps(prompt_view(raw_data_dict), indent=2)
     
     # --- PIPELINE 1: TACTICAL PLAYBOOK (TAGGED) ---
     playbook_prompt = f"""
@@ -114,7 +148,7 @@ IMPORTANT: Raw JSON only. No text.
             raise ValueError("LLM Credentials Missing")
 
         # Execute Tactical Pipeline (Tag-based, virtually uncrashable)
-        playbook_res = llm.invoke([HumanMessage(content=playbook_prompt)]).content
+        playbook_res = invoke_llm(llm, playbook_prompt, stage="playbook")
         playbook_sections = {
             "vulnerability": extract_section(playbook_res, "VULNERABILITY"),
             "roster_threats": extract_section(playbook_res, "THREATS"),
@@ -123,7 +157,7 @@ IMPORTANT: Raw JSON only. No text.
         }
         
         # Execute Intel Pipeline (JSON-based, for short data)
-        intel_res = llm.invoke([HumanMessage(content=intel_prompt)]).content
+        intel_res = invoke_llm(llm, intel_prompt, stage="intel")
         clean_intel = re.sub(r'```json|```', '', intel_res).strip()
         
         try:
@@ -159,26 +193,30 @@ IMPORTANT: Raw JSON only. No text.
         }
         return fallback_playbook, [], "Error", "Error"
 
-def generate_comparison_report(team_a_name, team_a_data, team_b_name, team_b_data):
+def generate_comparison_report(team_a_name, team_a_data, team_b_name, team_b_data, prediction=None, llm_verdict=True):
     """
     Generates a high-fidelity, sectional comparison report.
+    `prediction` (predictor.predict_matchup) is given to the LLM as a prior;
+    with `llm_verdict=False` its verdict is used and the LLM skips that section.
     """
     comp_data = {
-        "team_a": {"name": team_a_name, "stats": team_a_data},
-        "team_b": {"name": team_b_name, "stats": team_b_data}
+        "team_a": {"name": team_a_name, "stats": prompt_view(team_a_data)},
+        "team_b": {"name": team_b_name, "stats": prompt_view(team_b_data)}
     }
     data_str = json.dumps(comp_data, indent=2)
+    prior = f"STATISTICAL PRIOR: {prompt_context(prediction)}\n" if prediction and PREDICTOR_IN_PROMPT else ""
+    verdict_block = """
+[[MATCHUP_VERDICT]]
+A clinical decision on who wins and % confidence. 1 sentence reason.
+[[/MATCHUP_VERDICT]]
+""" if llm_verdict or not prediction else ""
 
     prompt = f"""
 You are a World-Class Esports Analyst. Compare {team_a_name} vs {team_b_name}.
 DATA: {data_str}
-
+{prior}
 Return a sectional analysis using these EXACT tags:
-
-[[MATCHUP_VERDICT]]
-A clinical decision on who wins and % confidence. 1 sentence reason.
-[[/MATCHUP_VERDICT]]
-
+{verdict_block}
 [[PLAYER_WAR]]
 Identify the 'Best Player' on both sides and explain the 1v1 battle that defines the game.
 [[/PLAYER_WAR]]
@@ -205,11 +243,11 @@ STRICT RULES:
     try:
         llm = get_llm()
         if not llm:
-            return { "verdict": "OpenAI Credentials Missing on Server.", "player_war": "N/A", "gap": "N/A", "priority": "N/A", "strategy": "N/A" }
+            return { "verdict": prediction["verdict"] if prediction else "OpenAI Credentials Missing on Server.", "player_war": "N/A", "gap": "N/A", "priority": "N/A", "strategy": "N/A" }
             
-        response = llm.invoke([HumanMessage(content=prompt)]).content
+        response = invoke_llm(llm, prompt, stage="comparison")
         return {
-            "verdict": extract_section(response, "MATCHUP_VERDICT"),
+            "verdict": extract_section(response, "MATCHUP_VERDICT") if verdict_block else prediction["verdict"],
             "player_war": extract_section(response, "PLAYER_WAR"),
             "gap": extract_section(response, "TACTICAL_GAP"),
             "priority": extract_section(response, "PRIORITY_TARGETS"),
@@ -217,8 +255,38 @@ STRICT RULES:
         }
     except Exception as e:
         return {
-            "verdict": "Combat data mismatch.",
+            "verdict": prediction["verdict"] if prediction else "Combat data mismatch.",
             "player_war": "Intel unreliable.",
             "gap": "Analysis aborted.",
             "strategy": "Proceed with extreme caution."
         }
+
+def generate_ranking_summary(tournament_name, table):
+    """
+    One LLM call for a whole power ranking: a short read of the field from the
+    ranked table (pipeline.rank_tournament rows). None without an LLM.
+    """
+    data_str = json.dumps(table, indent=2)
+    prompt = f"""
+You are a World-Class Esports Analyst. Below is a statistical power ranking of every team in {tournament_name}.
+"power" is each team's average win probability against the rest of the field.
+DATA: {data_str}
+
+Return a short read of the field using these EXACT tags:
+
+[[FIELD_SUMMARY]]
+- 4-6 bullets: the favourites, the tiers, the teams the numbers may be over- or under-rating (small samples), and one dark horse.
+[[/FIELD_SUMMARY]]
+
+STRICT RULES:
+- Clinical tone.
+- Markdown bullets.
+- Only use teams from DATA.
+"""
+    try:
+        llm = get_llm()
+        if not llm:
+            return None
+        return extract_section(invoke_llm(llm, prompt, stage="ranking"), "FIELD_SUMMARY")
+    except Exception:
+        return None
@@ -0,0 +1,186 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from grid_client import _operation_name
+
+# ==================================================
+# OFFLINE GRID STAND-IN (REPLAYS RECORDED RESPONSES)
+# ==================================================
+def load_recording(path):
+    with open(path) as f:
+        return json.load(f)
+
+def project_series_state(state, query):
+    """Rough GraphQL projection: drops games / players / money the query didn't select."""
+    if "games" not in query:
+        return {k: v for k, v in state.items() if k != "games"}
+    drop = {f for f in ("players", "money") if f not in query}
+    if not drop:
+        return state
+    return {**state, "games": [
+        {**g, "teams": [{k: v for k, v in t.items() if k not in drop} for t in g.get("teams", [])]}
+        for g in state.get("games", [])
+    ]}
+
+class MockGridServer:
+    """
+    Local HTTP server speaking just enough of GRID's central-data and
+    series-state GraphQL to drive grid_client. allSeries returns `scale`
+    series whose ids cycle through the recorded series states.
+    """
+
+    def __init__(self, recording, scale=None, latency_ms=0.0, jitter_ms=0.0, seed=7, port=0):
+        self.recording = recording
+        self.scale = scale or len(recording["series"])
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._recorded_ids = list(recording["series_states"].keys())
+        self._meta = {s["id"]: s for s in recording["series"]}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    # --- lifecycle ---
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def central_data_url(self):
+        return f"{self.base_url}/central-data/graphql"
+
+    @property
+    def series_state_url(self):
+        return f"{self.base_url}/live-data-feed/series-state/graphql"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-grid", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- behaviour ---
+    def _delay(self):
+        if not (self.latency_ms or self.jitter_ms):
+            return
+        with self._rng_lock:
+            ms = self._rng.gauss(self.latency_ms, self.jitter_ms) if self.jitter_ms else self.latency_ms
+        time.sleep(max(0.0, ms) / 1000)
+
+    def series_ids(self, count=None):
+        count = self.scale if count is None else min(count, self.scale)
+        return [f"{self._recorded_ids[i % len(self._recorded_ids)]}-{i}" for i in range(count)]
+
+    def _series_node(self, series_id):
+        recorded_id = series_id.rsplit("-", 1)[0]
+        meta = self._meta.get(recorded_id) or self.recording["series"][0]
+        state = self.recording["series_states"][recorded_id]["seriesState"]
+        return {
+            "id": series_id,
+            "tournament": {"name": meta["tournament"]},
+            "startTimeScheduled": meta.get("startTimeScheduled"),
+            "teams": [{"baseInfo": {"id": f"team-{t['name']}", "name": t["name"]}} for t in state["teams"]]
+        }
+
+    def respond(self, path, query, variables):
+        op = _operation_name(query)
+        variables = variables or {}
+
+        if op == "GetRecentTournaments":
+            return {"data": {"tournaments": {"edges": [{"node": t} for t in self.recording["tournaments"]]}}}
+
+        if op == "SeriesState" or path.startswith("/live-data-feed"):
+            recorded_id = str(variables.get("seriesId", "")).rsplit("-", 1)[0]
+            state = self.recording["series_states"].get(recorded_id)
+            return {"data": {"seriesState": project_series_state(state["seriesState"], query)}} if state else {"data": {"seriesState": None}}
+
+        if op == "ScanTournamentTeams":
+            # Aliased per-tournament scans (t0, t1, ...), 50 series per page, cursor = offset
+            ids = self.series_ids()
+            data = {}
+            for i in range(len([k for k in variables if k.startswith("t")])):
+                offset = int(variables.get(f"a{i}") or 0)
+                data[f"t{i}"] = {
+                    "edges": [{"node": self._series_node(sid)} for sid in ids[offset:offset + 50]],
+                    "pageInfo": {"hasNextPage": offset + 50 < len(ids), "endCursor": str(offset + 50)}
+                }
+            return {"data": data}
+
+        # Every other allSeries-shaped query (team series lists)
+        limit = variables.get("limit") or self.scale
+        return {"data": {"allSeries": {
+            "edges": [{"node": self._series_node(sid)} for sid in self.series_ids(limit)],
+            "pageInfo": {"hasNextPage": False}
+        }}}
+
+    def _handler(self):
+        mock = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                mock.requests += 1
+                mock._delay()
+                payload = json.dumps(mock.respond(self.path, body.get("query"), body.get("variables"))).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return _Handler
+
+# ==================================================
+# FAKE LLM
+# ==================================================
+class _FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+class FakeLLM:
+    """Deterministic stand-in for AzureChatOpenAI.invoke with optional latency."""
+
+    PLAYBOOK = (
+        "[[VULNERABILITY]]\n- Loses side-lane tempo after first objective.\n[[/VULNERABILITY]]\n"
+        "[[THREATS]]\n- Star carry snowballs through early skirmishes.\n[[/THREATS]]\n"
+        "[[STRATEGY]]\n- Contest first drake.\n- Punish jungle pathing.\n- Force late fights.\n[[/STRATEGY]]\n"
+        "[[PLAN]]\n- Early: ward river.\n- Mid: group mid.\n- Late: play for baron.\n[[/PLAN]]\n"
+        "[[MATCHUP_VERDICT]]\nTeam A wins, 60% confidence.\n[[/MATCHUP_VERDICT]]\n"
+        "[[PLAYER_WAR]]\n- Carry vs carry decides it.\n[[/PLAYER_WAR]]\n"
+        "[[TACTICAL_GAP]]\n- Bot lane priority.\n[[/TACTICAL_GAP]]\n"
+        "[[PRIORITY_TARGETS]]\nTeam A | Carry B | Highest gold share\nTeam B | Carry A | Snowball risk\n[[/PRIORITY_TARGETS]]\n"
+        "[[KILL_STRATEGY]]\n- Team A: tempo.\n- Team B: scale.\n[[/KILL_STRATEGY]]\n"
+        "[[FIELD_SUMMARY]]\n- Top seed is the clear favourite.\n[[/FIELD_SUMMARY]]"
+    )
+    INTEL = json.dumps({
+        "roster_analysis": [{"name": "Player", "category": "Killer", "strength": "Mechanics", "weakness": "Overextends"}],
+        "winning_trends": "Wins through early tempo.",
+        "counter_strategy": "Slow the game down."
+    })
+
+    def __init__(self, latency_ms=0.0):
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        prompt = messages[-1].content if messages else ""
+        return _FakeMessage(self.INTEL if "Return ONLY a valid JSON" in prompt else self.PLAYBOOK)
@@ -0,0 +1,148 @@
+from grid_client import fetch_series_info_for_team, collect_team_data, collect_field_data, discover_teams_from_tournament, content_fingerprint, track_staleness
+from llm_analyzer import generate_scouting_report, generate_comparison_report, generate_ranking_summary
+from predictor import predict_matchup, power_ranking, MATCHUP_VERDICT_MODE
+
+# ==================================================
+# HEADLESS SCOUTING PIPELINE (NO STREAMLIT)
+# ==================================================
+def _silent(message):
+    pass
+
+def describe_age(seconds):
+    return f"{round(seconds / 60)} min" if seconds >= 60 else "under a minute"
+
+def _mark_stale(enriched_data, staleness):
+    # Outside the data fingerprint on purpose: stale and fresh copies of the same series are the same report
+    if staleness["count"]:
+        enriched_data["stale_age_s"] = round(staleness["max_age_s"])
+
+def scout_team(team_name, team_id, tournament_id=None, progress=None):
+    """
+    Runs the full scouting flow for one team.
+    Returns None when GRID has no series, a partial pack (LLM parts None) when
+    the series states were unusable, or the full 5-tuple data pack.
+    """
+    progress = progress or _silent
+
+    progress("🛰️ Connecting to GRID Esports Data API...")
+    with track_staleness() as staleness:
+        s_info_list = fetch_series_info_for_team(team_id, tournament_id=tournament_id)
+        if not s_info_list:
+            return None
+
+        progress("🔬 Analyzing Match Statistics...")
+        enriched_data = collect_team_data(team_name, s_info_list)
+    _mark_stale(enriched_data, staleness)
+    if staleness["count"]:
+        progress(f"🕒 GRID slow or unavailable for part of this data; using cached copies up to {describe_age(staleness['max_age_s'])} old.")
+    if not enriched_data.get("series"):
+        return (enriched_data, None, None, None, None)
+
+    progress("🧠 Generating AI Scouting Insights...")
+    playbook, structured_roster, winning_trends, counter_strategy = generate_scouting_report(team_name, enriched_data)
+    dp = (enriched_data, playbook, structured_roster, winning_trends, counter_strategy)
+    enriched_data["report_fingerprint"] = report_fingerprint(team_name, dp)
+    return dp
+
+def report_fingerprint(team_name, data_pack):
+    """
+    Identity of a rendered report: the collection-time data fingerprint plus the
+    (small) LLM outputs. Only the LLM parts are hashed here, never the series data.
+    """
+    enriched_data, playbook, structured_roster, winning_trends, counter_strategy = data_pack
+    data_fp = enriched_data.get("fingerprint") or content_fingerprint(team_name, enriched_data)
+    return content_fingerprint(team_name, data_fp, playbook, structured_roster, winning_trends, counter_strategy)
+
+def compare_teams(team_a, team_b, progress=None, limit=10):
+    """
+    Collects both teams ({'name', 'id'}) and runs the matchup analysis.
+    Returns (name_a, name_b, comparison, data_a, data_b).
+    """
+    progress = progress or _silent
+
+    progress(f"📊 Gathering {team_a['name']} match data...")
+    with track_staleness() as staleness:
+        da = collect_team_data(team_a['name'], fetch_series_info_for_team(team_a['id'], limit=limit))
+    _mark_stale(da, staleness)
+    progress(f"📊 Gathering {team_b['name']} match data...")
+    with track_staleness() as staleness:
+        db = collect_team_data(team_b['name'], fetch_series_info_for_team(team_b['id'], limit=limit))
+    _mark_stale(db, staleness)
+    # Deterministic verdict first: shown before (or instead of) the LLM's
+    prediction = predict_matchup(team_a['name'], da, team_b['name'], db)
+    progress(f"📐 Model: {prediction['favorite']} favored at {prediction['probability'] * 100:.0f}% ({prediction['confidence']} confidence)")
+    progress("🧠 Comparing team playstyles...")
+    res = generate_comparison_report(team_a['name'], da, team_b['name'], db, prediction=prediction, llm_verdict=MATCHUP_VERDICT_MODE != "model")
+    res["prediction"] = prediction
+    res["fingerprint"] = comparison_fingerprint(team_a['name'], team_b['name'], res, da, db)
+    return (team_a['name'], team_b['name'], res, da, db)
+
+def comparison_fingerprint(name_a, name_b, res, da, db):
+    """Identity of a rendered matchup dossier, built from the per-team data fingerprints."""
+    sections = {k: v for k, v in res.items() if k != "fingerprint"}
+    return content_fingerprint(name_a, name_b, da.get("fingerprint"), db.get("fingerprint"), sections)
+
+def rank_tournament(tournament_id, tournament_name=None, teams=None, progress=None, limit=10, summarize=True):
+    """
+    Power ranking of every team in a tournament from one collection pass and
+    one probability matrix, plus at most one LLM summary. Returns None when no
+    team has usable series, else {"tournament", "table", "teams", "matrix",
+    "unranked", "summary", "collection", "fingerprint"} (and "stale_age_s").
+    """
+    progress = progress or _silent
+    tournament_name = tournament_name or f"tournament {tournament_id}"
+
+    progress(f"🛰️ Listing teams in {tournament_name}...")
+    teams = teams or discover_teams_from_tournament(tournament_id)
+    progress(f"📊 Gathering match data for {len(teams)} teams...")
+    with track_staleness() as staleness:
+        field, collection = collect_field_data(teams, tournament_id=tournament_id, max_matches=limit)
+    progress(f"♻️ {collection['series_fetched']} unique series cover {collection['series_requested']} team results.")
+    names = sorted(name for name, data in field.items() if data["series"])
+    if not names:
+        return None
+
+    progress(f"📐 Computing the {len(names)}x{len(names)} win-probability matrix...")
+    ranking = power_ranking(names, [field[name] for name in names])
+    table = []
+    for rank, (name, power) in enumerate(zip(ranking["teams"], ranking["power"]), 1):
+        wr, series, kda, mwr = get_brief_stats(field[name])
+        table.append({"rank": rank, "team": name, "power": power, "series": series, "win_rate": wr, "map_win_rate": mwr, "kda": kda})
+
+    summary = None
+    if summarize:
+        progress("🧠 Summarizing the field...")
+        summary = generate_ranking_summary(tournament_name, table)
+    res = {
+        "tournament": {"id": str(tournament_id), "name": tournament_name},
+        "table": table,
+        "teams": ranking["teams"],
+        "matrix": ranking["matrix"],
+        "unranked": sorted(set(field) - set(names)),
+        "summary": summary,
+        "collection": collection
+    }
+    if staleness["count"]:
+        res["stale_age_s"] = round(staleness["max_age_s"])
+    res["fingerprint"] = content_fingerprint(str(tournament_id), [field[name].get("fingerprint") for name in names], summary)
+    return res
+
+# ==================================================
+# SHARED STAT HELPERS
+# ==================================================
+def get_brief_stats(data):
+    """Win rate, series count, average KDA and map win rate for the matchup table."""
+    twins = sum(1 for s in data["series"] if s["series_win"])
+    tser = len(data["series"])
+    wr = f"{round((twins/tser)*100,1) if tser > 0 else 0}%"
+    kda = round(sum(p['avg_kda'] for p in data['top_players'])/len(data['top_players']),1) if data['top_players'] else 0
+    return wr, tser, kda, data.get('map_win_rate', 0)
+
+def build_stats_bundle(da, db):
+    """Stats bundle consumed by generate_comparison_pdf."""
+    wra, tsa, kdaa, mwra = get_brief_stats(da)
+    wrb, tsb, kdab, mwrb = get_brief_stats(db)
+    return {
+        "team_a": {"Win Rate": wra, "Series Played": tsa, "Average KDA": kdaa, "Map Win %": f"{mwra}%"},
+        "team_b": {"Win Rate": wrb, "Series Played": tsb, "Average KDA": kdab, "Map Win %": f"{mwrb}%"}
+    }
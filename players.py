@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import closing
+from grid_client import summarize_players
+from ratings import team_key, result_date
+from telemetry import span, set_attributes, incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+PLAYERS_PATH = os.getenv("PLAYERS_PATH", os.path.join("reports", "players.sqlite3"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS appearances (
+    series_id TEXT NOT NULL,
+    player TEXT NOT NULL,
+    name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    date TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    assists INTEGER NOT NULL,
+    net_worth INTEGER NOT NULL,
+    PRIMARY KEY (series_id, player)
+);
+CREATE INDEX IF NOT EXISTS appearances_by_player ON appearances (player, date);
+"""
+
+# ==================================================
+# ROLLING PER-PLAYER TOTALS
+# ==================================================
+class PlayerStats:
+    """Career totals for one player plus the teams they appeared for (name -> [first date, last date, series])."""
+    __slots__ = ("name", "team", "last_date", "series", "games", "k", "d", "a", "nw", "teams")
+
+    def __init__(self, name):
+        self.name = name
+        self.team = None
+        self.last_date = ""
+        self.series = 0
+        self.games = 0
+        self.k = self.d = self.a = self.nw = 0
+        self.teams = {}
+
+    def add(self, team, date, games, k, d, a, nw):
+        self.series += 1
+        self.games += games
+        self.k += k
+        self.d += d
+        self.a += a
+        self.nw += nw
+        # `date` is ISO or "" (undated): an undated series never decides the current team or last_seen
+        stint = self.teams.setdefault(team, [date, date, 0])
+        if date:
+            stint[0], stint[1] = min(stint[0], date) if stint[0] else date, max(stint[1], date)
+        stint[2] += 1
+        if self.team is None or (date and date >= self.last_date):
+            self.team, self.last_date = team, max(self.last_date, date)
+
+    def totals(self):
+        return {"k": self.k, "d": self.d, "a": self.a, "nw": self.nw, "games": self.games}
+
+    def to_dict(self):
+        row = summarize_players({self.name: self.totals()}, top=1)[0]
+        row.update({
+            "team": self.team,
+            "series": self.series,
+            "last_seen": self.last_date,
+            "teams": [{"team": t, "first": f, "last": l, "series": n} for t, (f, l, n) in sorted(self.teams.items(), key=lambda kv: kv[1][1], reverse=True)]
+        })
+        return row
+
+def series_appearances(state):
+    """{player name: (team, games, k, d, a, nw)} summed over every game of one seriesState."""
+    out = {}
+    for game in state.get("games") or []:
+        for team in game.get("teams") or []:
+            for p in team.get("players") or []:
+                if not p.get("name"):
+                    continue
+                _, games, k, d, a, nw = out.get(p["name"], (None, 0, 0, 0, 0, 0))
+                out[p["name"]] = (team["name"], games + 1, k + (p.get("kills") or 0), d + (p.get("deaths") or 0),
+                                  a + (p.get("killAssistsGiven") or 0), nw + (p.get("netWorth") or 0))
+    return out
+
+# ==================================================
+# PERSISTED, INCREMENTAL PLAYER INDEX
+# ==================================================
+class PlayerIndex:
+    """
+    Cross-team player stats over every finished series the app has read.
+    Appearances are stored once per (series, player) and folded into
+    in-memory totals as they arrive, so roster, key-player and search
+    lookups never re-aggregate series data.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or PLAYERS_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._players = {}                  # player key -> PlayerStats
+        self._by_team = defaultdict(set)    # team key -> player keys whose latest team it is
+        self._seen = set()                  # series ids already indexed
+        self._lock = threading.RLock()
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            rows = conn.execute("SELECT series_id, player, name, team, date, games, kills, deaths, assists, net_worth FROM appearances ORDER BY date").fetchall()
+        for series_id, key, name, team, date, games, k, d, a, nw in rows:
+            self._seen.add(series_id)
+            self._fold(key, name, team, date, games, k, d, a, nw)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _fold(self, key, name, team, date, games, k, d, a, nw):
+        date = result_date(date)      # rows stored before dates were normalized may say "Unknown"
+        stats = self._players.get(key)
+        if stats is None:
+            stats = self._players[key] = PlayerStats(name)
+        previous = stats.team
+        stats.add(team, date, games, k, d, a, nw)
+        if stats.team != previous:
+            if previous is not None:
+                self._by_team[team_key(previous)].discard(key)
+            self._by_team[team_key(stats.team)].add(key)
+
+    # --- ingestion ---
+    def ingest(self, series_info, state):
+        """grid_client series listener: indexes the players of each finished series once."""
+        series_id = str(series_info["id"])
+        if series_id in self._seen or not any(t.get("won") for t in state.get("teams") or []):
+            return False
+        appearances = series_appearances(state)
+        if not appearances:
+            return False      # summary-profile state: wait for one with player stats
+        date = result_date(series_info.get("date"))
+        with self._lock:
+            if series_id in self._seen:
+                return False
+            self._seen.add(series_id)
+            rows = [(series_id, team_key(name), name, team, date, *totals) for name, (team, *totals) in appearances.items()]
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("INSERT OR IGNORE INTO appearances VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            for _, key, name, team, date, games, k, d, a, nw in rows:
+                self._fold(key, name, team, date, games, k, d, a, nw)
+        incr("player_index_series_total")
+        return True
+
+    # --- lookups ---
+    def player(self, name):
+        """Career row for a player (summarize_players fields + team history), or None."""
+        with self._lock:
+            stats = self._players.get(team_key(name))
+            return stats.to_dict() if stats else None
+
+    def search(self, query, limit=20):
+        """Players whose name contains `query`, most games first."""
+        q = team_key(query)
+        with self._lock:
+            hits = sorted((s for k, s in self._players.items() if q in k), key=lambda s: s.games, reverse=True)[:limit]
+            return [s.to_dict() for s in hits]
+
+    def _team_players(self, team_name):
+        # Exact team key first, then the same contains-match find_team uses for seriesState names
+        key = team_key(team_name)
+        if self._by_team.get(key):
+            return self._by_team[key]
+        return next((keys for k, keys in self._by_team.items() if keys and (key in k or k in key)), set())
+
+    def roster(self, team_name, top=5):
+        """The team's current players ranked like collect_team_data's top_players (career totals)."""
+        with span("players.roster", team=team_name) as sp, self._lock:
+            players = {self._players[k].name: self._players[k].totals() for k in self._team_players(team_name)}
+            rows = summarize_players(players, top=top)
+            set_attributes(sp, players=len(players))
+        return rows
+
+    def key_player(self, team_name):
+        """The team's top current player by career KDA (one roster() row), or None."""
+        rows = self.roster(team_name, top=1)
+        return rows[0] if rows else None
+
+    def stats(self):
+        with self._lock:
+            return {"series": len(self._seen), "players": len(self._players), "teams": sum(1 for keys in self._by_team.values() if keys), "path": self.path}
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def default_index():
+    """Process-wide PlayerIndex at PLAYERS_PATH, fed by grid_client's series listener."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            import grid_client
+            _default_index = PlayerIndex()
+            grid_client.add_series_listener(_default_index.ingest)
+        return _default_index
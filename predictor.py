@@ -0,0 +1,252 @@
+import os
+import json
+import math
+from datetime import datetime, timezone
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+# "llm": the LLM writes the verdict (with the model's numbers as context);
+# "model": the verdict comes from the predictor and the LLM skips that section
+MATCHUP_VERDICT_MODE = os.getenv("MATCHUP_VERDICT", "llm")
+PREDICTOR_IN_PROMPT = os.getenv("PREDICTOR_IN_PROMPT", "1") == "1"
+PREDICTOR_SHRINK = 4.0     # series of evidence at which the model keeps half its confidence
+# Platt slope on the pairwise logit: `python cli.py calibrate` fits it on the stored rating
+# results and saves it here; PREDICTOR_SCALE overrides the saved fit
+PREDICTOR_CALIBRATION_PATH = os.getenv("PREDICTOR_CALIBRATION_PATH", os.path.join("reports", "predictor_calibration.json"))
+PREDICTOR_SCALE = os.getenv("PREDICTOR_SCALE")
+CALIBRATION_PRIOR = 1.0    # L2 pull of the fitted slope toward 1 (keeps it finite on tiny samples)
+FORM_DECAY = 0.8           # weight of each older series in the recent-form rate
+
+# Per-feature weights on the (team A - team B) gap. Hand-set priors: rate features are
+# in logit units, KDA and net worth in log units, so one weight unit means similar evidence.
+FEATURES = ("win_rate", "map_win_rate", "recent_form", "kda", "net_worth")
+WEIGHTS = (0.45, 0.35, 0.55, 0.6, 0.25)
+FEATURE_LABELS = {
+    "win_rate": "series record",
+    "map_win_rate": "map record",
+    "recent_form": "recent form",
+    "kda": "player KDA",
+    "net_worth": "economy"
+}
+
+# ==================================================
+# FEATURES
+# ==================================================
+def _logit_rate(wins, total):
+    # Laplace-smoothed so 3-0 and 0-3 records stay finite
+    p = (wins + 1) / (total + 2)
+    return math.log(p / (1 - p))
+
+def team_features(data, before=None):
+    """
+    Feature row (FEATURES order) and sample size from one collect_team_data
+    output. With `before` (ISO date), only series played earlier count, and the
+    player KDA and economy features are zeroed: per-series player totals aren't
+    kept, so whole-sample numbers would leak later results.
+    """
+    series = data["series"]
+    if before is not None:
+        series = [s for s in series if str(s.get("date", ""))[:10] < before and str(s.get("date", ""))[:1].isdigit()]
+    n = len(series)
+    wins = sum(1 for s in series if s["series_win"])
+    total_maps = sum(len(s["game_stats"]) for s in series) if before is not None else data.get("total_maps", 0)
+    map_wins = sum(1 for s in series for g in s["game_stats"] if g["won"])
+
+    # series arrive newest first; older results fade by FORM_DECAY per step
+    weights = [FORM_DECAY ** i for i in range(n)]
+    form_wins = sum(w for w, s in zip(weights, series) if s["series_win"])
+    form_total = sum(weights)
+
+    players = data["top_players"] if before is None else []
+    kda = sum(p["avg_kda"] for p in players) / len(players) if players else 0.0
+    net_worth = sum(p["avg_networth"] for p in players) / len(players) if players else 0.0
+    row = (
+        _logit_rate(wins, n),
+        _logit_rate(map_wins, total_maps),
+        _logit_rate(form_wins, form_total),
+        math.log1p(max(kda, 0.0)),
+        math.log1p(max(net_worth, 0.0))
+    )
+    return row, n
+
+def feature_matrix(datasets):
+    """(F, n): one feature row per team and each team's series count, as numpy arrays."""
+    import numpy as np  # deferred: only the predictor needs it
+    rows, counts = zip(*(team_features(d) for d in datasets)) if datasets else ((), ())
+    return np.array(rows, dtype=float).reshape(len(rows), len(FEATURES)), np.array(counts, dtype=float)
+
+def logit_matrix(F, n):
+    """
+    Uncalibrated pairwise logits: the weighted feature gap for every pair,
+    shrunk toward 0 by the smaller of the two sample sizes.
+    """
+    import numpy as np
+    gaps = F[:, None, :] - F[None, :, :]                 # (teams, teams, features)
+    logits = gaps @ np.array(WEIGHTS)
+    evidence = np.minimum(n[:, None], n[None, :])
+    return logits * (evidence / (evidence + PREDICTOR_SHRINK))
+
+_calibration = {"mtime": None, "scale": 1.0}
+
+def predictor_scale():
+    """(Platt slope, calibrated?): PREDICTOR_SCALE, else the saved fit, else (1.0, False)."""
+    if PREDICTOR_SCALE:
+        return float(PREDICTOR_SCALE), True
+    try:
+        mtime = os.path.getmtime(PREDICTOR_CALIBRATION_PATH)
+    except OSError:
+        return 1.0, False
+    if mtime != _calibration["mtime"]:
+        try:
+            with open(PREDICTOR_CALIBRATION_PATH, encoding="utf-8") as f:
+                _calibration["scale"] = float(json.load(f)["scale"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 1.0, False
+        _calibration["mtime"] = mtime
+    return _calibration["scale"], True
+
+def save_calibration(report):
+    """Stores a calibrate() report's fitted slope at PREDICTOR_CALIBRATION_PATH; returns the path."""
+    os.makedirs(os.path.dirname(os.path.abspath(PREDICTOR_CALIBRATION_PATH)), exist_ok=True)
+    payload = {"scale": report["fitted_scale"], "fitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), "report": report}
+    tmp = f"{PREDICTOR_CALIBRATION_PATH}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, PREDICTOR_CALIBRATION_PATH)
+    return PREDICTOR_CALIBRATION_PATH
+
+def win_probability_matrix(F, n):
+    """P[i, j] = P(team i beats team j) for every pair at once, after the Platt slope (predictor_scale)."""
+    import numpy as np
+    P = 1.0 / (1.0 + np.exp(-predictor_scale()[0] * logit_matrix(F, n)))
+    np.fill_diagonal(P, 0.5)
+    return P
+
+# ==================================================
+# PAIRWISE PREDICTION
+# ==================================================
+def _confidence(p):
+    edge = abs(p - 0.5)
+    return "high" if edge >= 0.2 else "medium" if edge >= 0.08 else "low"
+
+def predict_matchup(name_a, data_a, name_b, data_b):
+    """
+    Deterministic verdict for A vs B from the two collected datasets:
+    {"p_team_a", "favorite", "probability", "confidence", "drivers", "verdict"}.
+    """
+    import numpy as np
+    F, n = feature_matrix([data_a, data_b])
+    p_a = float(win_probability_matrix(F, n)[0, 1])
+    contributions = (F[0] - F[1]) * np.array(WEIGHTS)
+    favorite, p_fav = (name_a, p_a) if p_a >= 0.5 else (name_b, 1 - p_a)
+    calibrated = predictor_scale()[1]
+    sign = 1 if favorite == name_a else -1
+    drivers = [FEATURE_LABELS[FEATURES[i]] for i in np.argsort(-contributions * sign) if contributions[i] * sign > 0][:3]
+    reason = f" Edges: {', '.join(drivers)}." if drivers else ""
+    return {
+        "p_team_a": round(p_a, 4),
+        "favorite": favorite,
+        "probability": round(p_fav, 4),
+        "confidence": _confidence(p_a),
+        "drivers": drivers,
+        "calibrated": calibrated,
+        "features": {name: {f: round(float(v), 3) for f, v in zip(FEATURES, row)} for name, row in ((name_a, F[0]), (name_b, F[1]))},
+        "verdict": f"**{favorite}** favored at {p_fav * 100:.0f}% ({_confidence(p_a)} confidence, {'calibrated' if calibrated else 'uncalibrated'} statistical model).{reason}"
+    }
+
+def prompt_context(prediction):
+    """One-paragraph summary of a prediction for the comparison prompt."""
+    return (
+        f"A statistical model over this data gives {prediction['favorite']} a {prediction['probability'] * 100:.0f}% "
+        f"win probability ({prediction['confidence']} confidence; main edges: {', '.join(prediction['drivers']) or 'none'}). "
+        "Treat it as a prior, not a conclusion."
+    )
+
+# ==================================================
+# FIELD-WIDE POWER RANKING
+# ==================================================
+def power_ranking(names, datasets):
+    """
+    Ranks a whole field from one probability matrix. Power is a team's mean
+    P(win) against every other team. Returns {"teams", "power", "series", "matrix"},
+    all ordered by power.
+    """
+    import numpy as np
+    F, n = feature_matrix(datasets)
+    P = win_probability_matrix(F, n)
+    power = (P.sum(axis=1) - 0.5) / max(len(names) - 1, 1)
+    order = np.argsort(-power, kind="stable")
+    return {
+        "teams": [names[i] for i in order],
+        "power": power[order].round(4).tolist(),
+        "series": n[order].astype(int).tolist(),
+        "matrix": P[np.ix_(order, order)].round(4).tolist()
+    }
+
+# ==================================================
+# CALIBRATION AGAINST STORED RESULTS
+# ==================================================
+def _scores(z, scale):
+    import numpy as np
+    p = 1.0 / (1.0 + np.exp(-scale * z))                 # P(recorded winner wins)
+    return {
+        "brier": round(float(np.mean((1.0 - p) ** 2)), 4),
+        "log_loss": round(float(np.mean(np.logaddexp(0.0, -scale * z))), 4),
+        "accuracy": round(float(np.mean(z > 0)), 4)
+    }
+
+def _fit_scale(z):
+    """
+    Platt slope a >= 0 for p = sigmoid(a * z) on winner-vs-loser logits (0 =
+    no signal, every pair at 50%): Newton steps, halved until the convex loss drops.
+    """
+    import numpy as np
+
+    def loss(a):
+        return float(np.sum(np.logaddexp(0.0, -a * z))) + CALIBRATION_PRIOR * (a - 1.0) ** 2
+
+    a = 1.0
+    for _ in range(50):
+        p = 1.0 / (1.0 + np.exp(-a * z))
+        grad = float(np.sum(-z * (1.0 - p))) + 2 * CALIBRATION_PRIOR * (a - 1.0)
+        hess = float(np.sum(z * z * p * (1.0 - p))) + 2 * CALIBRATION_PRIOR
+        step = min(grad / hess, a)
+        while abs(step) > 1e-10 and loss(a - step) > loss(a):
+            step /= 2
+        a -= step
+        if abs(step) < 1e-8:
+            break
+    return a
+
+def calibrate(names, datasets, results):
+    """
+    Walk-forward check of the model on recorded results ((date, winner, loser),
+    e.g. RatingEngine.results()) between teams of one field: each result is
+    predicted from the series the two teams played before it. Fits the Platt
+    slope (see save_calibration) and returns Brier / log-loss at the current and
+    the fitted slope (a coin flip scores 0.25 / 0.6931).
+    """
+    import numpy as np
+    from grid_client import find_team
+    by_name = dict(zip(names, datasets))
+    listed = [{"name": name} for name in names]
+    z = []
+    for date, winner, loser in results:
+        w, l = find_team(listed, winner), find_team(listed, loser)
+        if not date or not w or not l or w is l:
+            continue
+        rows, counts = zip(*(team_features(by_name[t["name"]], before=date[:10]) for t in (w, l)))
+        F, n = np.array(rows), np.array(counts, dtype=float)
+        if n.min() == 0:
+            continue      # no earlier series for one side: the model has nothing to say
+        z.append(float(logit_matrix(F, n)[0, 1]))
+    z = np.array(z)
+    scale = predictor_scale()[0]
+    report = {"results": len(z), "current_scale": scale}
+    if not len(z):
+        return report
+
+    a = _fit_scale(z)
+    report.update({"current": _scores(z, scale), "fitted_scale": round(a, 4), "fitted": _scores(z, a)})
+    return report
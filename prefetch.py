@@ -0,0 +1,195 @@
+import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+import grid_client
+from telemetry import span, set_attributes, incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))          # shared by every session
+PREFETCH_MAX_TEAMS = int(os.getenv("PREFETCH_MAX_TEAMS", "16"))     # per tournament selection
+PREFETCH_PACING_MS = float(os.getenv("PREFETCH_PACING_MS", "50"))   # gap between prefetch requests
+PREFETCH_MATCHES = 10                                               # collect_team_data's default max_matches
+
+_executor = None
+_executor_lock = threading.Lock()
+_discovery_executor = None
+_foreground = 0
+_foreground_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        return _executor
+
+def _get_discovery_executor():
+    # Separate from the prefetch pool so a team list never queues behind warming work
+    global _discovery_executor
+    with _executor_lock:
+        if _discovery_executor is None:
+            _discovery_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="discovery")
+        return _discovery_executor
+
+# ==================================================
+# PRIORITY: FOREGROUND WORK PAUSES PREFETCHING
+# ==================================================
+@contextmanager
+def foreground():
+    """Wrap user-triggered GRID work; prefetch workers hold off until it finishes."""
+    global _foreground
+    with _foreground_lock:
+        _foreground += 1
+    try:
+        yield
+    finally:
+        with _foreground_lock:
+            _foreground -= 1
+
+def _yield_to_foreground(cancel_event):
+    # Pacing keeps prefetch a trickle; waiting on foreground keeps it behind real requests
+    cancel_event.wait(PREFETCH_PACING_MS / 1000)
+    while _foreground and not cancel_event.is_set():
+        cancel_event.wait(0.05)
+
+# ==================================================
+# PREFETCH JOBS
+# ==================================================
+class PrefetchJob:
+    """
+    Warms series lists and series states for a tournament's teams into
+    grid_client's series cache, exactly as scout_team would request them.
+    Cancel it when the coach moves to another tournament.
+    """
+
+    def __init__(self, tournament_id, teams):
+        self.tournament_id = tournament_id
+        self.teams = list(teams)[:PREFETCH_MAX_TEAMS]
+        self.teams_done = 0
+        self.series_warmed = 0
+        self._cancel = threading.Event()
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        executor = _get_executor()
+        self._futures = [executor.submit(self._warm_team, team) for team in self.teams]
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+        for future in self._futures:
+            future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return all(f.done() for f in self._futures)
+
+    def status(self):
+        return {
+            "tournament_id": self.tournament_id,
+            "teams": f"{self.teams_done}/{len(self.teams)}",
+            "series_warmed": self.series_warmed,
+            "cancelled": self.cancelled,
+            "done": self.done
+        }
+
+    def _warm_team(self, team):
+        if self._cancel.is_set():
+            return
+        with span("prefetch.team", team=team["name"], tournament_id=self.tournament_id) as sp:
+            _yield_to_foreground(self._cancel)
+            if self._cancel.is_set():
+                return
+            s_info = grid_client.fetch_series_info_for_team(team["id"], tournament_id=self.tournament_id)
+            warmed = 0
+            for s in s_info[:PREFETCH_MATCHES]:
+                if grid_client.series_state_cached(s["id"]):
+                    continue
+                _yield_to_foreground(self._cancel)
+                if self._cancel.is_set():
+                    set_attributes(sp, cancelled=True)
+                    break
+                if grid_client.fetch_series_state(s["id"], series_info=s) is not None:
+                    warmed += 1
+            with self._lock:
+                self.series_warmed += warmed
+                self.teams_done += 1
+            set_attributes(sp, series_listed=len(s_info), series_warmed=warmed)
+            incr("prefetch_series_total", warmed)
+
+def prefetch_tournament(tournament_id, teams, previous=None):
+    """Cancels `previous` (if any) and starts warming this tournament's teams in the background."""
+    if previous is not None:
+        previous.cancel()
+    if not teams:
+        return None
+    return PrefetchJob(tournament_id, teams).start()
+
+_results_inflight = set()
+_results_lock = threading.Lock()
+
+def warm_results(team, limit=PREFETCH_MATCHES):
+    """
+    Reads a team's ({'name', 'id'}) recent series with the "summary" profile
+    (winners only) on the prefetch pool, so the series listeners can record
+    its results for views that show ratings and W/L but no game stats. One
+    job per team at a time; returns False when one is already running.
+    """
+    key = str(team["id"])
+    with _results_lock:
+        if key in _results_inflight:
+            return False
+        _results_inflight.add(key)
+
+    def run():
+        try:
+            with span("prefetch.results", team=team["name"]) as sp:
+                _yield_to_foreground(threading.Event())
+                s_info = [s for s in grid_client.fetch_series_info_for_team(team["id"], limit=limit)
+                          if not grid_client.series_state_cached(s["id"])]     # full copies were already recorded
+                read = sum(1 for _ in grid_client.fetch_series_states(s_info, profile="summary"))
+                set_attributes(sp, series_listed=len(s_info), series_read=read)
+        finally:
+            with _results_lock:
+                _results_inflight.discard(key)
+    _get_executor().submit(run)
+    return True
+
+# ==================================================
+# TOURNAMENT TEAM DISCOVERY (OFF THE UI THREAD)
+# ==================================================
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _discover(tournament_id):
+    try:
+        return grid_client.discover_teams_from_tournament(tournament_id)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(tournament_id, None)
+
+def discover_teams_async(tournament_id):
+    """
+    Future of discover_teams_from_tournament. Tournaments already in
+    grid_client.TEAM_INDEX (e.g. from the startup scan) resolve at once;
+    concurrent callers for the rest share one request.
+    """
+    tid = str(tournament_id)
+    if tid in grid_client.TEAM_INDEX:
+        done = Future()
+        done.set_result(grid_client.discover_teams_from_tournament(tid))
+        return done
+    with _inflight_lock:
+        future = _inflight.get(tid)
+        if future is None:
+            future = _get_discovery_executor().submit(_discover, tid)
+            _inflight[tid] = future
+        return future
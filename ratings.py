@@ -0,0 +1,307 @@
+import os
+import math
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date as _date
+from telemetry import span, set_attributes, incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+RATINGS_PATH = os.getenv("RATINGS_PATH", os.path.join("reports", "ratings.sqlite3"))
+GLICKO_TAU = float(os.getenv("GLICKO_TAU", "0.5"))    # volatility drift; lower = steadier ratings
+GLICKO_SCALE = 173.7178
+DEFAULT_RATING = 1500.0
+DEFAULT_RD = 350.0
+DEFAULT_VOLATILITY = 0.06
+FLUSH_DELAY = 0.5          # seconds without a new result before a batch is applied
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    series_id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    loser TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    team TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    mu REAL NOT NULL,
+    phi REAL NOT NULL,
+    sigma REAL NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL
+);
+"""
+
+def team_key(name):
+    """Case/whitespace-insensitive team identity (seriesState only carries names)."""
+    return " ".join(str(name).lower().split())
+
+def result_date(value):
+    """ISO date for a series, or "" when it has none ("Unknown", "N/A") so it sorts before every dated result."""
+    try:
+        return _date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return ""
+
+# ==================================================
+# GLICKO-2 (ONE SERIES = ONE RATING PERIOD)
+# ==================================================
+class Rating:
+    """Glicko-2 state on the internal scale; `rating` / `rd` give the familiar 1500-based numbers."""
+    __slots__ = ("name", "mu", "phi", "sigma", "games", "wins")
+
+    def __init__(self, name, mu=0.0, phi=DEFAULT_RD / GLICKO_SCALE, sigma=DEFAULT_VOLATILITY, games=0, wins=0):
+        self.name = name
+        self.mu = mu
+        self.phi = phi
+        self.sigma = sigma
+        self.games = games
+        self.wins = wins
+
+    @property
+    def rating(self):
+        return DEFAULT_RATING + GLICKO_SCALE * self.mu
+
+    @property
+    def rd(self):
+        return GLICKO_SCALE * self.phi
+
+    def to_dict(self):
+        return {"team": self.name, "rating": round(self.rating, 1), "rd": round(self.rd, 1),
+                "volatility": round(self.sigma, 4), "games": self.games, "wins": self.wins}
+
+def _g(phi):
+    return 1.0 / math.sqrt(1.0 + 3.0 * phi * phi / (math.pi * math.pi))
+
+def _expected(mu, mu_opp, phi_opp):
+    return 1.0 / (1.0 + math.exp(-_g(phi_opp) * (mu - mu_opp)))
+
+def _new_sigma(sigma, phi, v, delta, tau):
+    # Glickman's volatility update (Illinois variant of regula falsi)
+    a = math.log(sigma * sigma)
+
+    def f(x):
+        ex = math.exp(x)
+        return ex * (delta * delta - phi * phi - v - ex) / (2 * (phi * phi + v + ex) ** 2) - (x - a) / (tau * tau)
+
+    A = a
+    if delta * delta > phi * phi + v:
+        B = math.log(delta * delta - phi * phi - v)
+    else:
+        k = 1
+        while f(a - k * tau) < 0:
+            k += 1
+        B = a - k * tau
+    fA, fB = f(A), f(B)
+    while abs(B - A) > 1e-6:
+        C = A + (A - B) * fA / (fB - fA)
+        fC = f(C)
+        if fC * fB <= 0:
+            A, fA = B, fB
+        else:
+            fA /= 2
+        B, fB = C, fC
+    return math.exp(A / 2)
+
+def glicko2_update(player, opponent, score, tau=None):
+    """(mu, phi, sigma) for `player` after one result (1 win, 0 loss) against `opponent`'s pre-match rating."""
+    tau = GLICKO_TAU if tau is None else tau
+    g = _g(opponent.phi)
+    e = _expected(player.mu, opponent.mu, opponent.phi)
+    v = 1.0 / (g * g * e * (1 - e))
+    delta = v * g * (score - e)
+    sigma = _new_sigma(player.sigma, player.phi, v, delta, tau)
+    phi_star = math.sqrt(player.phi ** 2 + sigma ** 2)
+    phi = 1.0 / math.sqrt(1.0 / phi_star ** 2 + 1.0 / v)
+    return player.mu + phi * phi * g * (score - e), phi, sigma
+
+def win_probability(a, b):
+    """P(a beats b) from two Ratings, widened by both teams' uncertainty."""
+    return 1.0 / (1.0 + math.exp(-_g(math.sqrt(a.phi ** 2 + b.phi ** 2)) * (a.mu - b.mu)))
+
+# ==================================================
+# PERSISTED, INCREMENTAL RATING ENGINE
+# ==================================================
+class RatingEngine:
+    """
+    Team ratings over every finished series the app has seen. Results are
+    stored once per series id and applied by a background flusher once a
+    batch has settled, oldest first: a batch dated after everything applied
+    so far updates its teams in place, one reaching further back (a backfill)
+    triggers a chronological replay. Either way the new ratings are swapped
+    in whole, so lookups are plain dict reads.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or RATINGS_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._ratings = {}          # team key -> Rating; replaced (never mutated) by _flush
+        self._seen = set()          # series ids already recorded
+        self._last = ("", "")       # (date, series id) of the newest applied result
+        self._pending = []          # (date, series id, winner, loser) recorded but not applied yet
+        self._dirty = False
+        self._lock = threading.Lock()           # _seen / _pending / _dirty
+        self._flush_lock = threading.Lock()     # one flush at a time
+        self._wake = threading.Event()
+        self._flusher = None
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            # Older files stored undated results as "Unknown", which sorts after every real date
+            undated = conn.execute("UPDATE results SET date = '' WHERE date != '' AND date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'").rowcount
+            self._seen = {row[0] for row in conn.execute("SELECT series_id FROM results")}
+            self._last = conn.execute("SELECT date, series_id FROM results ORDER BY date DESC, series_id DESC LIMIT 1").fetchone() or ("", "")
+            for key, name, mu, phi, sigma, games, wins in conn.execute("SELECT * FROM ratings"):
+                self._ratings[key] = Rating(name, mu, phi, sigma, games, wins)
+        # Every applied result adds a game to both sides: fewer than that means results were stored
+        # but never applied (recorded, then the process stopped before the flush)
+        applied = sum(r.games for r in self._ratings.values()) // 2
+        if undated or applied != len(self._seen):
+            self._dirty = True
+            self._schedule_flush()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # one small commit per series; WAL keeps it crash-safe
+        return conn
+
+    # --- ingestion ---
+    def ingest(self, series_info, state):
+        """grid_client series listener: records finished two-team series, once each."""
+        series_id = str(series_info["id"])
+        if series_id in self._seen:
+            return False
+        teams = [t for t in state.get("teams") or [] if t.get("name")]
+        winners = [t for t in teams if t.get("won")]
+        if len(teams) != 2 or len(winners) != 1:
+            return False      # live, abandoned or malformed: not a result yet
+        loser = next(t for t in teams if t is not winners[0])
+        return self.record(series_id, series_info.get("date") or "", winners[0]["name"], loser["name"])
+
+    def record(self, series_id, date, winner, loser):
+        series_id, date = str(series_id), result_date(date)
+        with self._lock:
+            if series_id in self._seen:
+                return False
+            self._seen.add(series_id)
+            with closing(self._connect()) as conn, conn:
+                conn.execute("INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?)", (series_id, date, winner, loser))
+            self._pending.append((date, series_id, winner, loser))
+        incr("rating_results_total")
+        self._schedule_flush()
+        return True
+
+    def _schedule_flush(self):
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="ratings-flush", daemon=True)
+                self._flusher.start()
+        self._wake.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait()
+            # Series lists arrive one state at a time: wait for the batch to settle before applying it
+            while True:
+                self._wake.clear()
+                if not self._wake.wait(FLUSH_DELAY):
+                    break
+            try:
+                self.flush()
+            except Exception as e:
+                # A failed flush leaves the results stored; the next open replays them
+                incr("rating_flush_errors_total", error=type(e).__name__)
+
+    def flush(self):
+        """Applies every recorded result now (in place when possible, else a full replay)."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = sorted(self._pending), []
+                backfill = bool(pending and pending[0][:2] < self._last)
+                replay = self._dirty or backfill
+                if not pending and not replay:
+                    return
+                if replay:
+                    with closing(self._connect()) as conn:
+                        rows = conn.execute("SELECT date, series_id, winner, loser FROM results ORDER BY date, series_id").fetchall()
+            if backfill:
+                incr("rating_backfills_total")
+            with span("ratings.flush", replay=replay) as sp:
+                if replay:
+                    ratings, batch = {}, rows
+                else:
+                    ratings = {k: Rating(r.name, r.mu, r.phi, r.sigma, r.games, r.wins) for k, r in self._ratings.items()}
+                    batch = pending
+                for _, _, winner, loser in batch:
+                    _apply(ratings, winner, loser)
+                with closing(self._connect()) as conn, conn:
+                    if replay:
+                        conn.execute("DELETE FROM ratings")
+                    touched = list(ratings) if replay else {team_key(name) for row in batch for name in row[2:]}
+                    conn.executemany("INSERT OR REPLACE INTO ratings VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                        (k, r.name, r.mu, r.phi, r.sigma, r.games, r.wins) for k in touched for r in [ratings[k]]
+                    ])
+                set_attributes(sp, results=len(batch), teams=len(ratings))
+            with self._lock:
+                self._ratings = ratings
+                if batch:
+                    self._last = tuple(batch[-1][:2])
+                if replay:
+                    self._dirty = False
+
+    def replay(self):
+        """Recomputes every rating from the stored results in date order."""
+        with self._lock:
+            self._dirty = True
+        self.flush()
+
+    # --- lookups (dict reads; results show up once the flusher has applied them) ---
+    def rating(self, name):
+        """Rating for a team name, or None if it has no applied series."""
+        return self._ratings.get(team_key(name))
+
+    def win_probability(self, team_a, team_b):
+        """P(team_a beats team_b), or None when either team is unrated."""
+        a, b = self.rating(team_a), self.rating(team_b)
+        return None if a is None or b is None else win_probability(a, b)
+
+    def leaderboard(self, limit=None, min_games=1):
+        rows = sorted((r for r in self._ratings.values() if r.games >= min_games), key=lambda r: r.rating, reverse=True)
+        return [r.to_dict() for r in rows[:limit]]
+
+    def results(self):
+        """Every stored result as (date, winner, loser), oldest first."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT date, winner, loser FROM results ORDER BY date, series_id").fetchall()
+
+    def stats(self):
+        with self._lock:
+            return {"results": len(self._seen), "teams": len(self._ratings), "pending": len(self._pending),
+                    "pending_replay": self._dirty, "path": self.path}
+
+def _apply(ratings, winner, loser):
+    """One result into a {team key: Rating} dict (both sides updated from their pre-match ratings)."""
+    for name in (winner, loser):
+        if team_key(name) not in ratings:
+            ratings[team_key(name)] = Rating(name)
+    w, l = ratings[team_key(winner)], ratings[team_key(loser)]
+    w_new, l_new = glicko2_update(w, l, 1.0), glicko2_update(l, w, 0.0)
+    w.mu, w.phi, w.sigma = w_new
+    l.mu, l.phi, l.sigma = l_new
+    w.games, w.wins, l.games = w.games + 1, w.wins + 1, l.games + 1
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+def default_engine():
+    """Process-wide RatingEngine at RATINGS_PATH, fed by grid_client's series listener."""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            import grid_client
+            _default_engine = RatingEngine()
+            grid_client.add_series_listener(_default_engine.ingest)
+        return _default_engine
@@ -1,7 +1,5 @@
-import pandas as pd
-from fpdf import FPDF
-import io
 import re
+from telemetry import traced
 
 def clean_for_pdf(text):
     """Strips emojis and non-latin-1 characters that break standard FPDF fonts."""
@@ -48,48 +46,66 @@ def generate_markdown_report(team_name, enriched_data, playbook, structured_rost
 
     return md
 
-class PDFReport(FPDF):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.primary_blue = (0, 71, 171) # Cloud9 Blue
-        self.light_blue = (235, 245, 255)
-        self.text_dark = (33, 37, 41)
-        self.text_gray = (108, 117, 125)
-
-    def header(self):
-        # Header Bar
-        self.set_fill_color(*self.primary_blue)
-        self.rect(0, 0, 210, 35, 'F')
-        
-        self.set_font('Arial', 'B', 18)
-        self.set_text_color(255, 255, 255)
-        self.set_y(12)
-        self.cell(0, 10, 'CLOUD9 AI STRATEGIC INTELLIGENCE', 0, 1, 'C')
-        
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 5, 'POWERED BY GRID ESPORTS & JETBRAINS AI', 0, 1, 'C')
-        self.ln(10)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f'CLASSIFIED DOSSIER - PAGE {self.page_no()}', 0, 0, 'C')
-
-    def section_title(self, label):
-        self.ln(5)
-        self.set_x(20)
-        self.set_font('Arial', 'B', 14)
-        self.set_text_color(*self.primary_blue)
-        self.cell(0, 10, label.upper(), 0, 1)
-        self.set_draw_color(*self.primary_blue)
-        self.set_line_width(0.5)
-        self.line(20, self.get_y(), 190, self.get_y())
-        self.ln(3)
+_PDF_REPORT_CLS = None
+
+def get_pdf_report_class():
+    """Builds the branded PDFReport class on first use so importing this module never loads fpdf."""
+    global _PDF_REPORT_CLS
+    if _PDF_REPORT_CLS is None:
+        from fpdf import FPDF
+
+        class PDFReport(FPDF):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.primary_blue = (0, 71, 171) # Cloud9 Blue
+                self.light_blue = (235, 245, 255)
+                self.text_dark = (33, 37, 41)
+                self.text_gray = (108, 117, 125)
+
+            def header(self):
+                # Header Bar
+                self.set_fill_color(*self.primary_blue)
+                self.rect(0, 0, 210, 35, 'F')
+
+                self.set_font('Arial', 'B', 18)
+                self.set_text_color(255, 255, 255)
+                self.set_y(12)
+                self.cell(0, 10, 'CLOUD9 AI STRATEGIC INTELLIGENCE', 0, 1, 'C')
+
+                self.set_font('Arial', 'I', 8)
+                self.cell(0, 5, 'POWERED BY GRID ESPORTS & JETBRAINS AI', 0, 1, 'C')
+                self.ln(10)
+
+            def footer(self):
+                self.set_y(-15)
+                self.set_font('Arial', 'I', 8)
+                self.set_text_color(128, 128, 128)
+                self.cell(0, 10, f'CLASSIFIED DOSSIER - PAGE {self.page_no()}', 0, 0, 'C')
 
+            def section_title(self, label):
+                self.ln(5)
+                self.set_x(20)
+                self.set_font('Arial', 'B', 14)
+                self.set_text_color(*self.primary_blue)
+                self.cell(0, 10, label.upper(), 0, 1)
+                self.set_draw_color(*self.primary_blue)
+                self.set_line_width(0.5)
+                self.line(20, self.get_y(), 190, self.get_y())
+                self.ln(3)
+
+        _PDF_REPORT_CLS = PDFReport
+    return _PDF_REPORT_CLS
+
+def __getattr__(name):
+    # Keeps `from report_generator import PDFReport` working without an eager fpdf import
+    if name == "PDFReport":
+        return get_pdf_report_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@traced("pdf.render", report="scouting")
 def generate_pdf_report(team_name, enriched_data, playbook, structured_roster, winning_trends, counter_strategy):
     """Generates a Premium Strategic Dossier for a single team."""
-    pdf = PDFReport()
+    pdf = get_pdf_report_class()()
     pdf.set_left_margin(20)
     pdf.set_right_margin(20)
     pdf.set_auto_page_break(True, margin=20)
@@ -219,9 +235,10 @@ def generate_pdf_report(team_name, enriched_data, playbook, structured_roster, w
 
     return bytes(pdf.output())
 
+@traced("pdf.render", report="comparison")
 def generate_comparison_pdf(team_a_name, team_b_name, res, stats_comp=None):
     """Generates a premium Side-by-Side Matchup Dossier."""
-    pdf = PDFReport()
+    pdf = get_pdf_report_class()()
     pdf.set_left_margin(20)
     pdf.set_right_margin(20)
     pdf.set_auto_page_break(True, margin=20)
@@ -317,3 +334,21 @@ def generate_comparison_markdown(team_a, team_b, res):
 {res['strategy']}
 """
     return md
+
+def generate_ranking_markdown(ranking):
+    """Generates an MD power ranking (table plus the field summary)."""
+    rows = "\n".join(
+        f"| {r['rank']} | {r['team']} | {r['power'] * 100:.1f}% | {r['series']} | {r['win_rate']} | {r['map_win_rate']}% | {r['kda']} |"
+        for r in ranking["table"]
+    )
+    md = f"""# 🏅 POWER RANKING
+## {ranking['tournament']['name']}
+
+| # | Team | Power | Series | Win Rate | Map Win % | Avg KDA |
+|---|------|-------|--------|----------|-----------|---------|
+{rows}
+
+### 🧠 FIELD SUMMARY
+{ranking.get('summary') or 'N/A'}
+"""
+    return md
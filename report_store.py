@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import closing
+from grid_client import fetch_series_info_for_team, discover_teams_from_tournament, content_fingerprint
+from team_models import TeamData, json_default
+from telemetry import span, set_attributes, record_cache, incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+REPORT_STORE_PATH = os.getenv("REPORT_STORE_PATH", os.path.join("reports", "report_store.sqlite3"))
+REPORT_MAX_AGE = float(os.getenv("REPORT_MAX_AGE", str(24 * 3600)))   # seconds before a stored report is recomputed anyway
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", "watchlist.json")
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", "900"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scouting_reports (
+    team_id TEXT NOT NULL,
+    tournament_id TEXT NOT NULL DEFAULT '',
+    team_name TEXT NOT NULL,
+    series_key TEXT NOT NULL,
+    report_fp TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (team_id, tournament_id)
+);
+CREATE TABLE IF NOT EXISTS report_pdfs (
+    report_fp TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    pdf BLOB NOT NULL
+);
+"""
+
+def series_key(series_info_list):
+    """Identity of a team's current series list; changes when GRID lists a new series."""
+    return content_fingerprint([s["id"] for s in series_info_list])
+
+# ==================================================
+# SQLITE STORE
+# ==================================================
+class ReportStore:
+    """
+    Finished scouting packs keyed by (team id, tournament id), plus rendered
+    PDFs keyed by report fingerprint. One connection per call, so the web
+    tier, the scheduler thread and CLI workers can share the file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or REPORT_STORE_PATH
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def save_scouting(self, team_name, team_id, tournament_id, data_pack, s_key):
+        enriched_data, playbook, structured_roster, winning_trends, counter_strategy = data_pack
+        payload = json.dumps({
+            "enriched_data": enriched_data,
+            "playbook": playbook,
+            "roster": structured_roster,
+            "winning_trends": winning_trends,
+            "counter_strategy": counter_strategy
+        }, default=json_default)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scouting_reports VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(team_id), str(tournament_id or ""), team_name, s_key,
+                 enriched_data.get("report_fingerprint") or "", time.time(), payload)
+            )
+
+    def load_scouting(self, team_id, tournament_id=None):
+        """(data_pack, meta) or None. meta holds series_key, report_fp and created_at."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT team_name, series_key, report_fp, created_at, payload FROM scouting_reports WHERE team_id = ? AND tournament_id = ?",
+                (str(team_id), str(tournament_id or ""))
+            ).fetchone()
+        if not row:
+            return None
+        team_name, s_key, report_fp, created_at, payload = row
+        data = json.loads(payload)
+        data_pack = (TeamData.from_dict(data["enriched_data"]), data["playbook"], data["roster"], data["winning_trends"], data["counter_strategy"])
+        return data_pack, {"team_name": team_name, "series_key": s_key, "report_fp": report_fp, "created_at": created_at}
+
+    def save_pdf(self, report_fp, pdf_bytes):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO report_pdfs VALUES (?, ?, ?)", (report_fp, time.time(), sqlite3.Binary(pdf_bytes)))
+
+    def load_pdf(self, report_fp):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT pdf FROM report_pdfs WHERE report_fp = ?", (report_fp,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            reports = conn.execute("SELECT COUNT(*) FROM scouting_reports").fetchone()[0]
+            pdfs = conn.execute("SELECT COUNT(*) FROM report_pdfs").fetchone()[0]
+        return {"reports": reports, "pdfs": pdfs, "path": self.path}
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def default_store():
+    """Process-wide ReportStore at REPORT_STORE_PATH."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ReportStore()
+        return _default_store
+
+# ==================================================
+# FRESHNESS & REFRESH
+# ==================================================
+def load_fresh_report(store, team_id, tournament_id=None, max_age=None):
+    """
+    Stored pack for this team if it is younger than `max_age` and GRID lists
+    no series it hasn't seen; otherwise None (caller computes live).
+    """
+    max_age = REPORT_MAX_AGE if max_age is None else max_age
+    stored = store.load_scouting(team_id, tournament_id)
+    fresh = False
+    if stored and time.time() - stored[1]["created_at"] <= max_age:
+        s_info = fetch_series_info_for_team(team_id, tournament_id=tournament_id)
+        fresh = bool(s_info) and series_key(s_info) == stored[1]["series_key"]
+    record_cache("report_store", hit=fresh)
+    return stored[0] if fresh else None
+
+def scout_with_store(team_name, team_id, tournament_id=None, store=None, progress=None):
+    """
+    scout_team through the report store: a fresh stored pack is returned as-is,
+    otherwise it is computed live and written through (unless it was built
+    from stale GRID data). Returns (data_pack, "store" | "live").
+    """
+    from pipeline import scout_team
+
+    store = store or default_store()
+    dp = load_fresh_report(store, team_id, tournament_id)
+    if dp:
+        return dp, "store"
+    dp = scout_team(team_name, team_id, tournament_id=tournament_id, progress=progress)
+    if dp and dp[1] is not None and not dp[0].get("stale_age_s"):
+        try:
+            store.save_scouting(team_name, team_id, tournament_id, dp, series_key(fetch_series_info_for_team(team_id, tournament_id=tournament_id)))
+        except sqlite3.Error as e:
+            if progress:
+                progress(f"⚠️ Report store unavailable: {e}")
+    return dp, "live"
+
+def refresh_report(store, team_name, team_id, tournament_id=None, render_pdf=True, force=False, progress=None):
+    """
+    Recomputes a team's pack when its series list changed (or it is missing or
+    too old) and stores it, with the PDF. Returns "fresh", "refreshed", "stale"
+    (GRID degraded; nothing stored) or "no_data".
+    """
+    from pipeline import scout_team
+
+    with span("store.refresh", team=team_name, tournament_id=tournament_id or "") as sp:
+        s_info = fetch_series_info_for_team(team_id, tournament_id=tournament_id)
+        if not s_info:
+            set_attributes(sp, outcome="no_data")
+            return "no_data"
+        s_key = series_key(s_info)
+        stored = store.load_scouting(team_id, tournament_id)
+        if stored and not force and stored[1]["series_key"] == s_key and time.time() - stored[1]["created_at"] <= REPORT_MAX_AGE:
+            set_attributes(sp, outcome="fresh")
+            return "fresh"
+
+        dp = scout_team(team_name, team_id, tournament_id=tournament_id, progress=progress)
+        if not dp or dp[1] is None:
+            set_attributes(sp, outcome="no_data")
+            return "no_data"
+        if dp[0].get("stale_age_s"):
+            set_attributes(sp, outcome="stale")
+            return "stale"
+        store.save_scouting(team_name, team_id, tournament_id, dp, s_key)
+        if render_pdf:
+            from report_generator import generate_pdf_report
+            store.save_pdf(dp[0]["report_fingerprint"], bytes(generate_pdf_report(team_name, *dp)))
+        incr("store_refreshes_total")
+        set_attributes(sp, outcome="refreshed")
+        return "refreshed"
+
+# ==================================================
+# WATCHLIST SCHEDULER
+# ==================================================
+def load_watchlist(path=None):
+    """
+    JSON list of {"name", "id", "tournament_id"?} teams and/or
+    {"tournament_id"} entries (every team found in that tournament).
+    """
+    path = path or WATCHLIST_PATH
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+def expand_watchlist(entries):
+    teams = []
+    for entry in entries:
+        if entry.get("id"):
+            teams.append({"name": entry["name"], "id": entry["id"], "tournament_id": entry.get("tournament_id")})
+        elif entry.get("tournament_id"):
+            teams.extend({"name": t["name"], "id": t["id"], "tournament_id": entry["tournament_id"]}
+                         for t in discover_teams_from_tournament(entry["tournament_id"]))
+    return teams
+
+def run_watchlist_once(store, entries, progress=None):
+    """One refresh pass over the watchlist; returns {outcome: count}."""
+    counts = {"fresh": 0, "refreshed": 0, "stale": 0, "no_data": 0, "failed": 0}
+    for team in expand_watchlist(entries):
+        try:
+            outcome = refresh_report(store, team["name"], team["id"], team.get("tournament_id"))
+        except Exception as e:
+            outcome = "failed"
+            if progress:
+                progress(f"❌ {team['name']}: {e}")
+        counts[outcome] += 1
+        if progress:
+            progress(f"{'⚡' if outcome == 'refreshed' else '✅' if outcome == 'fresh' else '⚠️'} {team['name']}: {outcome}")
+    return counts
+
+class ReportScheduler:
+    """Background thread that re-runs the watchlist every `interval` seconds until stopped."""
+
+    def __init__(self, store, watchlist_path=None, interval=None, progress=None):
+        self.store = store
+        self.watchlist_path = watchlist_path
+        self.interval = WATCH_INTERVAL if interval is None else interval
+        self.progress = progress
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="report-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.last_run = run_watchlist_once(self.store, load_watchlist(self.watchlist_path), progress=self.progress)
+            self._stop.wait(self.interval)
@@ -0,0 +1,152 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from telemetry import incr
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+SESSION_BUDGET_MB = float(os.getenv("SESSION_BUDGET_MB", "24"))      # payloads pinned per coaching session
+SHARED_RESULTS_MB = float(os.getenv("SHARED_RESULTS_MB", "256"))     # process-wide result cache
+
+def estimate_size(obj):
+    """Deep sys.getsizeof over dicts, sequences and __slots__ objects; shared objects counted once."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, int, float, bool, type(None))):
+            for cls in type(o).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(o, name):
+                        stack.append(getattr(o, name))
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+    return total
+
+# ==================================================
+# SHARED RESULT CACHE (ONE PER SERVER PROCESS)
+# ==================================================
+class ResultCache:
+    """
+    Byte-bounded LRU of result payloads keyed by content fingerprint, so two
+    coaches scouting the same team share one copy.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()   # key -> (payload, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, key, payload, nbytes=None):
+        nbytes = estimate_size(payload) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key][0], self._items[key][1]
+            self._items[key] = (payload, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, dropped) = self._items.popitem(last=False)
+                self._bytes -= dropped
+                incr("result_evictions_total", scope="shared")
+            return payload, nbytes
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+SHARED_RESULTS = ResultCache(int(SHARED_RESULTS_MB * 1024 * 1024))
+
+# ==================================================
+# PER-SESSION RESULT SLOTS
+# ==================================================
+class SessionResults:
+    """
+    Named result slots (res_t1, res_t2, res_comp, res_rank) for one session. Each slot
+    keeps a handle into SHARED_RESULTS; the session also pins payloads up to
+    its byte budget and unpins least-recently-viewed slots beyond that. An
+    unpinned slot still resolves while the shared cache holds its payload.
+    """
+
+    def __init__(self, budget_bytes=None, cache=None):
+        self.budget_bytes = int(SESSION_BUDGET_MB * 1024 * 1024) if budget_bytes is None else budget_bytes
+        self.cache = cache or SHARED_RESULTS
+        self._slots = OrderedDict()   # slot -> {"key", "bytes", "payload" (None once unpinned)}
+
+    def put(self, slot, key, payload):
+        payload, nbytes = self.cache.put(key, payload)
+        self._slots.pop(slot, None)
+        self._slots[slot] = {"key": key, "bytes": nbytes, "payload": payload}
+        self._enforce_budget()
+
+    def get(self, slot):
+        entry = self._slots.get(slot)
+        if entry is None:
+            return None
+        self._slots.move_to_end(slot)
+        payload = entry["payload"]
+        if payload is None:
+            payload = self.cache.get(entry["key"])
+            if payload is None:
+                return None
+            entry["payload"] = payload
+            self._enforce_budget()
+        return payload
+
+    def evicted(self, slot):
+        """True when the slot's payload is gone from both the session and the shared cache."""
+        entry = self._slots.get(slot)
+        return bool(entry) and entry["payload"] is None and entry["key"] not in self.cache
+
+    def drop(self, slot):
+        self._slots.pop(slot, None)
+
+    def __contains__(self, slot):
+        return slot in self._slots
+
+    def pinned_bytes(self):
+        return sum(e["bytes"] for e in self._slots.values() if e["payload"] is not None)
+
+    def _enforce_budget(self):
+        # Never unpin the most recent slot: it is the one on screen
+        for slot in list(self._slots)[:-1]:
+            if self.pinned_bytes() <= self.budget_bytes:
+                break
+            if self._slots[slot]["payload"] is not None:
+                self._slots[slot]["payload"] = None
+                incr("result_evictions_total", scope="session")
+
+    def usage(self):
+        """Rows for the diagnostics panel, most recently used first."""
+        return [{
+            "slot": slot,
+            "key": e["key"][:12],
+            "kib": round(e["bytes"] / 1024, 1),
+            "pinned": e["payload"] is not None,
+            "in_shared_cache": e["key"] in self.cache
+        } for slot, e in reversed(self._slots.items())]
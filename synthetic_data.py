@@ -0,0 +1,194 @@
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+# ==================================================
+# SEEDED SYNTHETIC seriesState GENERATOR
+# ==================================================
+# Per-title shape of a game, mirroring grid_client.GAME_TEAM_FRAGMENTS.
+TITLES = {
+    "lol": {
+        "fragment": "GameTeamStateLol",
+        "maps": ["Summoner's Rift"],
+        "sides": ("blue", "red"),
+        "round_based": False,
+        "team_kills": (4, 32),
+        "player_networth": (7000, 19000),
+        "has_money": True
+    },
+    "cs2": {
+        "fragment": "GameTeamStateCs2",
+        "maps": ["Mirage", "Inferno", "Nuke", "Ancient", "Anubis", "Vertigo", "Dust2"],
+        "sides": ("counter-terrorists", "terrorists"),
+        "round_based": True,
+        "team_kills": (40, 110),
+        "player_networth": (2000, 9000),
+        "has_money": True
+    },
+    "valorant": {
+        "fragment": "GameTeamStateValorant",
+        "maps": ["Ascent", "Bind", "Haven", "Lotus", "Split", "Sunset", "Icebox"],
+        "sides": ("attacker", "defender"),
+        "round_based": True,
+        "team_kills": (40, 100),
+        "player_networth": (3000, 9000),
+        "has_money": True
+    },
+    "default": {
+        "fragment": "GameTeamStateDefault",
+        "maps": ["Default"],
+        "sides": ("home", "away"),
+        "round_based": False,
+        "team_kills": (5, 40),
+        "player_networth": (1000, 10000),
+        "has_money": False
+    }
+}
+
+BEST_OF_WEIGHTS = {1: 0.3, 3: 0.6, 5: 0.1}
+TEAM_PREFIXES = ["Nova", "Apex", "Vortex", "Onyx", "Zenith", "Ember", "Titan", "Cobalt", "Helix", "Raven",
+                 "Solace", "Quasar", "Aegis", "Mirage", "Falcon", "Nimbus", "Pulse", "Specter", "Tempest", "Vanta"]
+
+class SyntheticUniverse:
+    """
+    A seeded world of teams (5-player rosters with a hidden strength) that plays
+    series against each other. `skew` widens the strength spread; `null_rate` is
+    the chance any optional stat comes back null, as GRID sometimes does.
+    """
+
+    def __init__(self, n_teams=12, title="lol", seed=0, skew=1.0, null_rate=0.0, best_of=None):
+        if title not in TITLES:
+            raise ValueError(f"Unknown title {title!r}; expected one of {sorted(TITLES)}")
+        self.rng = random.Random(seed)
+        self.title = title
+        self.spec = TITLES[title]
+        self.null_rate = null_rate
+        self.best_of = best_of or BEST_OF_WEIGHTS
+        self.teams = [self._make_team(i, skew) for i in range(n_teams)]
+
+    def _make_team(self, idx, skew):
+        # Suffix with the index so no team name is a substring of another
+        name = f"{TEAM_PREFIXES[idx % len(TEAM_PREFIXES)]} {idx:03d}"
+        weights = sorted((self.rng.uniform(0.6, 1.6) for _ in range(5)), reverse=True)
+        return {
+            "id": str(9000 + idx),
+            "name": name,
+            "strength": self.rng.gauss(0, skew),
+            "players": [{"name": f"{name.split()[0][:3].lower()}{idx:03d}_p{p + 1}", "weight": w} for p, w in enumerate(weights)]
+        }
+
+    def _maybe_null(self, value):
+        return None if self.null_rate and self.rng.random() < self.null_rate else value
+
+    def _split(self, total, weights):
+        scale = total / sum(weights)
+        return [max(0, int(round(w * scale * self.rng.uniform(0.7, 1.3)))) for w in weights]
+
+    def _team_game_state(self, team, won, side, score, kills, deaths):
+        spec = self.spec
+        lo, hi = spec["player_networth"]
+        p_kills = self._split(kills, [p["weight"] for p in team["players"]])
+        p_deaths = self._split(deaths, [2.2 - p["weight"] for p in team["players"]])
+        players = []
+        for p, k, d in zip(team["players"], p_kills, p_deaths):
+            players.append({
+                "name": p["name"],
+                "kills": self._maybe_null(k),
+                "deaths": self._maybe_null(d),
+                "killAssistsGiven": self._maybe_null(int(kills * self.rng.uniform(0.2, 0.7))),
+                "netWorth": self._maybe_null(int(self.rng.uniform(lo, hi) * p["weight"]))
+            })
+        state = {
+            "__typename": spec["fragment"],
+            "name": team["name"],
+            "won": won,
+            "side": side,
+            "score": score,
+            "kills": self._maybe_null(kills),
+            "deaths": self._maybe_null(deaths),
+            "netWorth": self._maybe_null(sum(p["netWorth"] or 0 for p in players)),
+            "players": players
+        }
+        if spec["has_money"]:
+            state["money"] = self._maybe_null(int(state["netWorth"] or 0) // 8)
+        return state
+
+    def _game(self, seq, a, b, a_wins):
+        spec = self.spec
+        sides = list(spec["sides"])
+        self.rng.shuffle(sides)
+        k_lo, k_hi = spec["team_kills"]
+        w_kills = self.rng.randint((k_lo + k_hi) // 2, k_hi)
+        l_kills = self.rng.randint(k_lo, max(k_lo, w_kills - 1))
+        if spec["round_based"]:
+            w_score, l_score = 13, self.rng.randint(0, 11)
+        else:
+            w_score, l_score = 1, 0
+        winner, loser = (a, b) if a_wins else (b, a)
+        w_state = self._team_game_state(winner, True, sides[0], w_score, w_kills, l_kills)
+        l_state = self._team_game_state(loser, False, sides[1], l_score, l_kills, w_kills)
+        return {
+            "sequenceNumber": seq,
+            "map": {"name": self.rng.choice(spec["maps"])},
+            "teams": [w_state, l_state] if a_wins else [l_state, w_state]
+        }
+
+    def play_series(self, a, b):
+        """Simulates one best-of-N series; returns the seriesState payload."""
+        best_of = self.rng.choices(list(self.best_of), weights=list(self.best_of.values()))[0]
+        p_a = 1 / (1 + math.exp(-(a["strength"] - b["strength"])))
+        need = best_of // 2 + 1
+        wins_a = wins_b = 0
+        games = []
+        while wins_a < need and wins_b < need:
+            a_wins = self.rng.random() < p_a
+            wins_a += a_wins
+            wins_b += not a_wins
+            games.append(self._game(len(games) + 1, a, b, a_wins))
+        return {
+            "version": str(len(games) * 3 + self.rng.randint(0, 2)),
+            "teams": [{"name": a["name"], "won": wins_a > wins_b}, {"name": b["name"], "won": wins_b > wins_a}],
+            "games": games
+        }
+
+    def recording(self, n_series, focus_team=0, focus_share=1.0, tournaments=3, start=None, id_prefix="syn"):
+        """
+        Emits `n_series` series in the mock_grid recording format. A `focus_share`
+        fraction of them involve `focus_team` (index); the rest are random pairs.
+        """
+        start = start or datetime(2025, 6, 1, tzinfo=timezone.utc)
+        tours = [{"id": str(700000 + i), "name": f"Synthetic {self.title.upper()} Circuit {i + 1}"} for i in range(tournaments)]
+        focus = self.teams[focus_team]
+        series, states = [], {}
+        elapsed = 0.0   # hours before `start`; grows every series so listings stay newest-first
+        for i in range(n_series):
+            if self.rng.random() < focus_share:
+                a, b = focus, self.rng.choice([t for t in self.teams if t is not focus])
+            else:
+                a, b = self.rng.sample(self.teams, 2)
+            if self.rng.random() < 0.5:
+                a, b = b, a
+            sid = f"{id_prefix}{i:07d}"
+            gap = self.rng.uniform(6, 60)   # drawn every step so the rest of the seeded stream is unchanged
+            elapsed += gap if i else 0.0
+            when = start - timedelta(hours=elapsed)
+            series.append({"id": sid, "tournament": tours[i % tournaments]["name"], "startTimeScheduled": when.strftime("%Y-%m-%dT%H:%M:%SZ")})
+            states[sid] = {"seriesState": self.play_series(a, b)}
+        return {
+            "_note": f"Synthetic {self.title} data (seeded); see synthetic_data.py",
+            "team": {"name": focus["name"], "id": focus["id"]},
+            "tournaments": tours,
+            "series": series,
+            "series_states": states
+        }
+
+def generate_recording(n_series, title="lol", n_teams=12, seed=0, **kwargs):
+    """Convenience wrapper: one focus team vs a seeded league, in mock_grid recording format."""
+    universe_kwargs = {k: kwargs.pop(k) for k in ("skew", "null_rate", "best_of") if k in kwargs}
+    return SyntheticUniverse(n_teams=n_teams, title=title, seed=seed, **universe_kwargs).recording(n_series, **kwargs)
+
+def series_state_pairs(recording):
+    """(series_info, seriesState) pairs as grid_client.fetch_series_states would yield them."""
+    for s in recording["series"]:
+        info = {"id": s["id"], "tournament": s["tournament"], "date": s["startTimeScheduled"][:10] if s["startTimeScheduled"] else "Unknown"}
+        yield info, recording["series_states"][s["id"]]["seriesState"]
@@ -0,0 +1,163 @@
+import json
+import functools
+from dataclasses import dataclass, field, fields
+
+# ==================================================
+# COMPACT ENRICHED TEAM DATA (SLOTTED DATACLASSES)
+# ==================================================
+@functools.cache
+def _field_names(cls):
+    return tuple(f.name for f in fields(cls))
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+def json_default(obj):
+    """`default=` hook for json.dumps: records become dicts, sets become lists."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    return list(obj)
+
+class Record:
+    """
+    Dict-style access for the slotted dataclasses below, so app.py,
+    report_generator and the prompts keep reading `data["series"]`,
+    `s.get("key_player")` and so on unchanged.
+    """
+    __slots__ = ()
+    OPTIONAL = ()   # fields left out of to_dict() while still None
+
+    def __getitem__(self, key):
+        if key not in _field_names(type(self)):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in _field_names(type(self)):
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in _field_names(type(self)) and not (key in self.OPTIONAL and getattr(self, key) is None)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return [k for k in _field_names(type(self)) if k in self]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def to_dict(self):
+        return {k: _plain(v) for k, v in self.items()}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: data[k] for k in _field_names(cls) if k in data})
+
+@dataclass(slots=True)
+class GameStat(Record):
+    map: str
+    won: bool
+    side: str
+    score: str
+    kills: int = None
+    deaths: int = None
+    net_worth: int = None
+
+@dataclass(slots=True)
+class SeriesSummary(Record):
+    series_id: str
+    tournament: str
+    opponent: str
+    series_win: bool
+    date: str
+    game_stats: list = field(default_factory=list)
+    key_player: str = "N/A"
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["series_id"], data["tournament"], data["opponent"], data["series_win"], data["date"],
+            [g if isinstance(g, GameStat) else GameStat.from_dict(g) for g in data.get("game_stats", [])],
+            data.get("key_player", "N/A")
+        )
+
+@dataclass(slots=True)
+class PlayerAggregate(Record):
+    name: str
+    avg_kda: float
+    avg_kills: float
+    avg_deaths: float
+    avg_networth: int
+    participation: int
+    impact_score: float = None
+    OPTIONAL = ("impact_score",)
+
+@dataclass(slots=True)
+class SeriesResult(Record):
+    opponent: str
+    tournament: str
+
+@dataclass(slots=True)
+class TeamData(Record):
+    series: list
+    top_players: list
+    losses: list
+    wins: list
+    tournament_summary: dict
+    total_series: int
+    map_win_rate: float
+    total_maps: int
+    fingerprint: str = None
+    report_fingerprint: str = None
+    stale_age_s: float = None     # set when some GRID data was served from an expired cache entry
+    OPTIONAL = ("fingerprint", "report_fingerprint", "stale_age_s")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds from the enriched dict shape (also accepts already-typed rows)."""
+        def typed(rows, record):
+            return [r if isinstance(r, record) else record.from_dict(r) for r in rows]
+        return cls(
+            typed(data.get("series", []), SeriesSummary),
+            typed(data.get("top_players", []), PlayerAggregate),
+            typed(data.get("losses", []), SeriesResult),
+            typed(data.get("wins", []), SeriesResult),
+            dict(data.get("tournament_summary", {})),
+            data.get("total_series", 0),
+            data.get("map_win_rate", 0),
+            data.get("total_maps", 0),
+            data.get("fingerprint"),
+            data.get("report_fingerprint"),
+            data.get("stale_age_s")
+        )
+
+    def to_arrow(self):
+        """Columnar copy as pyarrow Tables: {"series", "games", "players"}. Needs pyarrow."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("TeamData.to_arrow() requires pyarrow (pip install pyarrow)") from e
+
+        series_cols = [f for f in _field_names(SeriesSummary) if f != "game_stats"]
+        game_cols = _field_names(GameStat)
+        return {
+            "series": pa.table({c: [getattr(s, c) for s in self.series] for c in series_cols}),
+            "games": pa.table({
+                "series_id": [s.series_id for s in self.series for _ in s.game_stats],
+                "game": [i + 1 for s in self.series for i in range(len(s.game_stats))],
+                **{c: [getattr(g, c) for s in self.series for g in s.game_stats] for c in game_cols}
+            }),
+            "players": pa.table({c: [getattr(p, c) for p in self.top_players] for c in _field_names(PlayerAggregate)})
+        }
@@ -0,0 +1,274 @@
+import os
+import time
+import json
+import threading
+import functools
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# ==================================================
+# CONFIGURATION
+# ==================================================
+SERVICE_NAME = "cloud9-stratos"
+TRACE_BUFFER = int(os.getenv("TRACE_BUFFER", "2000"))     # finished spans kept in memory
+LATENCY_WINDOW = 500                                       # recent durations kept per stage
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_local = threading.local()
+_spans = deque(maxlen=TRACE_BUFFER)
+_durations = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+_histograms = defaultdict(lambda: {"count": 0, "sum": 0.0, "buckets": [0] * len(HISTOGRAM_BUCKETS)})
+_counters = defaultdict(float)
+_metrics_server = None
+
+def _new_id(n_bytes):
+    return os.urandom(n_bytes).hex()
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+# ==================================================
+# SPANS
+# ==================================================
+@contextmanager
+def span(name, **attributes):
+    """
+    Times a pipeline stage. Yields the span dict so callers can attach
+    attributes (payload sizes, counts) before it closes. Nested spans in the
+    same thread share a trace id.
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    sp = {
+        "name": name,
+        "trace_id": parent["trace_id"] if parent else _new_id(16),
+        "span_id": _new_id(8),
+        "parent_id": parent["span_id"] if parent else None,
+        "start_ns": time.time_ns(),
+        "end_ns": None,
+        "attributes": dict(attributes),
+        "status": "OK",
+        "error": None
+    }
+    stack.append(sp)
+    t0 = time.perf_counter()
+    try:
+        yield sp
+    except Exception as e:
+        mark_error(sp, str(e))
+        raise
+    finally:
+        stack.pop()
+        duration = time.perf_counter() - t0
+        sp["end_ns"] = sp["start_ns"] + int(duration * 1e9)
+        sp["duration_ms"] = round(duration * 1000, 2)
+        _finish(sp, duration)
+
+def _finish(sp, duration):
+    name = sp["name"]
+    with _lock:
+        _spans.append(sp)
+        _durations[name].append(duration)
+        hist = _histograms[name]
+        hist["count"] += 1
+        hist["sum"] += duration
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if duration <= bound:
+                hist["buckets"][i] += 1
+        if sp["status"] == "ERROR":
+            _counters[("stage_errors_total", _label_key({"stage": name}))] += 1
+
+def mark_error(sp, message):
+    """Flags a span as failed without raising (for handled errors)."""
+    sp["status"] = "ERROR"
+    sp["error"] = (message or "")[:300]
+
+def set_attributes(sp, **attributes):
+    sp["attributes"].update(attributes)
+
+def traced(name, **attributes):
+    """Decorator form of span(); records the byte size of bytes/str results."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, **attributes) as sp:
+                result = fn(*args, **kwargs)
+                if isinstance(result, (bytes, str)):
+                    sp["attributes"]["output_bytes"] = len(result)
+                return result
+        return wrapper
+    return decorator
+
+# ==================================================
+# COUNTERS
+# ==================================================
+def incr(name, value=1, **labels):
+    with _lock:
+        _counters[(name, _label_key(labels))] += value
+
+def record_cache(cache, hit):
+    """Counts a cache lookup as a hit or miss for the named cache."""
+    incr("cache_hits_total" if hit else "cache_misses_total", cache=cache)
+
+def counter_value(name, **labels):
+    with _lock:
+        return _counters.get((name, _label_key(labels)), 0)
+
+# ==================================================
+# READ SIDE (DEBUG PANEL)
+# ==================================================
+def _percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, int(round(pct / 100 * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+def stage_summary():
+    """Per-stage latency table: calls, errors, p50/p95/max in ms over the recent window."""
+    with _lock:
+        names = list(_durations.keys())
+        rows = []
+        for name in names:
+            vals = sorted(_durations[name])
+            rows.append({
+                "stage": name,
+                "calls": _histograms[name]["count"],
+                "errors": int(_counters.get(("stage_errors_total", _label_key({"stage": name})), 0)),
+                "p50_ms": round(_percentile(vals, 50) * 1000, 1),
+                "p95_ms": round(_percentile(vals, 95) * 1000, 1),
+                "max_ms": round(vals[-1] * 1000, 1) if vals else 0.0,
+                "total_s": round(_histograms[name]["sum"], 2)
+            })
+    return sorted(rows, key=lambda r: r["total_s"], reverse=True)
+
+def cache_summary():
+    """Hit/miss counts per cache name."""
+    out = defaultdict(lambda: {"hits": 0, "misses": 0})
+    with _lock:
+        for (name, labels), value in _counters.items():
+            if name in ("cache_hits_total", "cache_misses_total"):
+                cache = dict(labels).get("cache", "?")
+                out[cache]["hits" if name == "cache_hits_total" else "misses"] += int(value)
+    return dict(out)
+
+def recent_spans(limit=50):
+    with _lock:
+        items = list(_spans)[-limit:]
+    return [{
+        "name": s["name"],
+        "duration_ms": s.get("duration_ms"),
+        "status": s["status"],
+        "error": s["error"],
+        **s["attributes"]
+    } for s in reversed(items)]
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _durations.clear()
+        _histograms.clear()
+        _counters.clear()
+
+# ==================================================
+# EXPORTERS
+# ==================================================
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def export_otlp_json():
+    """Finished spans in the OpenTelemetry OTLP/JSON trace shape (resourceSpans)."""
+    with _lock:
+        items = list(_spans)
+    otlp_spans = []
+    for s in items:
+        entry = {
+            "traceId": s["trace_id"],
+            "spanId": s["span_id"],
+            "name": s["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(s["start_ns"]),
+            "endTimeUnixNano": str(s["end_ns"]),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s["attributes"].items()],
+            "status": {"code": 2, "message": s["error"] or ""} if s["status"] == "ERROR" else {"code": 1}
+        }
+        if s["parent_id"]:
+            entry["parentSpanId"] = s["parent_id"]
+        otlp_spans.append(entry)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "stratos.telemetry"}, "spans": otlp_spans}]
+        }]
+    }
+
+def write_otlp_json(path):
+    with open(path, "w") as f:
+        json.dump(export_otlp_json(), f, indent=2)
+
+def _prom_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs) + "}"
+
+def prometheus_text():
+    """Prometheus text exposition of stage latency histograms and counters."""
+    lines = []
+    with _lock:
+        lines.append("# TYPE stratos_stage_duration_seconds histogram")
+        for name, hist in _histograms.items():
+            for bound, count in zip(HISTOGRAM_BUCKETS, hist["buckets"]):
+                lines.append(f"stratos_stage_duration_seconds_bucket{_prom_labels([('stage', name), ('le', bound)])} {count}")
+            lines.append(f"stratos_stage_duration_seconds_bucket{_prom_labels([('stage', name), ('le', '+Inf')])} {hist['count']}")
+            lines.append(f"stratos_stage_duration_seconds_sum{_prom_labels([('stage', name)])} {hist['sum']:.6f}")
+            lines.append(f"stratos_stage_duration_seconds_count{_prom_labels([('stage', name)])} {hist['count']}")
+
+        seen = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in seen:
+                lines.append(f"# TYPE stratos_{name} counter")
+                seen.add(name)
+            lines.append(f"stratos_{name}{_prom_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+def start_metrics_server(port=None):
+    """Serves /metrics (Prometheus) and /traces (OTLP JSON) on localhost. Idempotent."""
+    global _metrics_server
+    if _metrics_server:
+        return _metrics_server
+    port = int(port or os.getenv("METRICS_PORT", "9464"))
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics"):
+                body, ctype = prometheus_text().encode(), "text/plain; version=0.0.4"
+            elif self.path.startswith("/traces"):
+                body, ctype = json.dumps(export_otlp_json()).encode(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    _metrics_server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    threading.Thread(target=_metrics_server.serve_forever, name="stratos-metrics", daemon=True).start()
+    return _metrics_server
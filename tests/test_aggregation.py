@@ -0,0 +1,35 @@
+import pytest
+from benchmark import DEFAULT_RECORDING, reference_aggregate, _comparable
+from grid_client import aggregate_team_series
+from grid_models import SeriesState
+from mock_grid import load_recording
+from synthetic_data import TITLES, generate_recording, series_state_pairs
+
+def _check(rec):
+    team = rec["team"]["name"]
+    want = _comparable(reference_aggregate(team, series_state_pairs(rec)))
+    assert _comparable(aggregate_team_series(team, series_state_pairs(rec))) == want
+    typed = ((info, SeriesState.from_dict(state)) for info, state in series_state_pairs(rec))
+    assert _comparable(aggregate_team_series(team, typed)) == want
+    return want
+
+@pytest.mark.parametrize("title", sorted(TITLES))
+@pytest.mark.parametrize("null_rate", [0.0, 0.05, 0.3])
+def test_matches_the_reference_per_title(title, null_rate):
+    want = _check(generate_recording(40, title=title, n_teams=8, seed=11, null_rate=null_rate))
+    assert want["total_series"] > 0
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_the_reference_on_seeded_leagues(seed):
+    # Smaller, fixed-seed cousin of `benchmark.py verify`: league size, nulls and focus share all vary
+    _check(generate_recording(seed * 7 % 60, n_teams=2 + seed % 19, seed=seed,
+                              null_rate=(0.0, 0.05, 0.3)[seed % 3], focus_share=(1.0, 0.5, 0.1)[seed % 3]))
+
+def test_empty_and_unmatched_series():
+    assert _check(generate_recording(0, n_teams=2))["total_series"] == 0
+    rec = generate_recording(20, n_teams=6, seed=3, focus_share=0.1)
+    rec["team"] = {**rec["team"], "name": "No Such Team"}
+    assert _check(rec)["series"] == []
+
+def test_matches_the_reference_on_the_recorded_fixture():
+    assert _check(load_recording(DEFAULT_RECORDING))["total_series"] > 0
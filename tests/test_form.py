@@ -0,0 +1,71 @@
+import random
+from datetime import date
+import pytest
+from form import TeamForm, FORM_HALF_LIFE
+
+def _day(iso):
+    return date.fromisoformat(iso).toordinal()
+
+def _series(won, kills=10):
+    # (totals in FIELDS order, players) as form._series_record builds them
+    return (1, 1 if won else 0, 1 if won else 0, 1, kills, 5, 30000), {"Alice": (kills, 5, 3, 30000, 1)}
+
+def _history(n=60):
+    return [(_day("2025-01-01") + i * 3, f"s{i:03d}", *_series(i % 3 != 0, kills=i % 7)) for i in range(n)]
+
+def test_windows_match_a_direct_sum():
+    form = TeamForm("T")
+    rows = _history()
+    for row in rows:
+        form.add(*row)
+    as_of = rows[40][0]
+    got = form.window(series=10, as_of=as_of)
+    picked = rows[31:41]
+    assert got["series"] == 10
+    assert got["wins"] == sum(r[2][1] for r in picked)
+    assert got["avg_kills"] == round(sum(r[2][4] for r in picked) / 10, 2)
+    assert got["to"] == date.fromordinal(as_of).isoformat()
+
+    by_days = form.window(days=30, as_of=as_of)
+    assert by_days["series"] == sum(1 for r in rows if as_of - 30 < r[0] <= as_of)
+
+def test_arrival_order_does_not_matter():
+    rows = _history()
+    forms = []
+    for order in (rows, rows[::-1], random.Random(7).sample(rows, len(rows))):
+        form = TeamForm("T")
+        for i, row in enumerate(order):
+            form.add(*row)
+            if i % 17 == 0:
+                form.window(series=5, as_of=10 ** 7)     # reads between arrivals force partial merges
+        forms.append(form)
+    for query in ({"series": 12}, {"days": 45, "as_of": rows[30][0]}, {}):
+        query.setdefault("as_of", 10 ** 7)
+        assert forms[0].window(**query) == forms[1].window(**query) == forms[2].window(**query)
+    assert forms[0].decayed_form(as_of=rows[-1][0]) == pytest.approx(forms[1].decayed_form(as_of=rows[-1][0]))
+
+def test_remove_restores_the_prefix_sums():
+    rows = _history(20)
+    form = TeamForm("T")
+    for row in rows:
+        form.add(*row)
+    form.remove(rows[5][0], rows[5][1])
+    assert form.window(as_of=10 ** 7)["series"] == 19
+
+@pytest.mark.parametrize("half_life", [FORM_HALF_LIFE, 7.5])
+def test_decayed_form_ignores_series_after_as_of(half_life):
+    form = TeamForm("T")
+    form.add(_day("2025-01-01"), "a", *_series(False))
+    form.add(_day("2025-03-01"), "b", *_series(True))
+    as_of = _day("2025-01-31")
+    decayed = form.decayed_form(half_life, as_of=as_of)
+    assert decayed["win_rate"] == form.window(days=60, as_of=as_of)["win_rate"] == 0
+    assert decayed["series"] == pytest.approx(2.0 ** (-30 / half_life), abs=0.01)
+
+def test_decayed_form_halves_per_half_life():
+    form = TeamForm("T")
+    form.add(_day("2025-01-01"), "a", *_series(True))
+    form.add(_day("2025-01-31"), "b", *_series(False))
+    decayed = form.decayed_form(30, as_of=_day("2025-01-31"))
+    # the win is one half-life old: weight 0.5 against the loss's 1.0
+    assert decayed["win_rate"] == pytest.approx(100 * 0.5 / 1.5, abs=0.1)
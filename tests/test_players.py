@@ -0,0 +1,41 @@
+from players import PlayerIndex
+
+def _state(team, opponent, player):
+    return {
+        "teams": [{"name": team, "won": True}, {"name": opponent, "won": False}],
+        "games": [{"teams": [
+            {"name": team, "players": [{"name": player, "kills": 5, "deaths": 2, "killAssistsGiven": 7, "netWorth": 20000}]},
+            {"name": opponent, "players": [{"name": "Someone", "kills": 2, "deaths": 5, "killAssistsGiven": 1, "netWorth": 15000}]}
+        ]}]
+    }
+
+def test_undated_series_never_decides_current_team(tmp_path):
+    index = PlayerIndex(str(tmp_path / "players.sqlite3"))
+    index.ingest({"id": "1", "date": "2025-01-10"}, _state("Old Team", "Rival", "Alice"))
+    index.ingest({"id": "2", "date": "2025-03-02"}, _state("New Team", "Rival", "Alice"))
+    index.ingest({"id": "3", "date": "Unknown"}, _state("Old Team", "Rival", "Alice"))
+
+    assert [p["name"] for p in index.roster("New Team")] == ["Alice"]
+    assert index.roster("Old Team") == []
+    career = index.player("Alice")
+    assert career["team"] == "New Team"
+    assert career["last_seen"] == "2025-03-02"
+    assert career["series"] == 3
+
+def test_undated_first_series_still_assigns_a_team(tmp_path):
+    index = PlayerIndex(str(tmp_path / "players.sqlite3"))
+    index.ingest({"id": "1", "date": "Unknown"}, _state("Old Team", "Rival", "Alice"))
+    assert index.player("Alice")["team"] == "Old Team"
+    index.ingest({"id": "2", "date": "2024-06-01"}, _state("New Team", "Rival", "Alice"))
+    assert index.player("Alice")["team"] == "New Team"
+
+def test_reload_keeps_current_team(tmp_path):
+    path = str(tmp_path / "players.sqlite3")
+    index = PlayerIndex(path)
+    index.ingest({"id": "1", "date": "2025-01-10"}, _state("Old Team", "Rival", "Alice"))
+    index.ingest({"id": "2", "date": "2025-03-02"}, _state("New Team", "Rival", "Alice"))
+    index.ingest({"id": "3", "date": None}, _state("Old Team", "Rival", "Alice"))
+
+    reloaded = PlayerIndex(path)
+    assert reloaded.player("Alice")["team"] == "New Team"
+    assert [p["name"] for p in reloaded.roster("New Team")] == ["Alice"]
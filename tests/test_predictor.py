@@ -0,0 +1,54 @@
+import json
+import numpy as np
+import pytest
+import predictor
+
+def _data(results):
+    """Minimal collect_team_data-shaped dict: (date, won, maps won, maps) per series, newest first."""
+    series = [{"date": d, "series_win": won, "game_stats": [{"won": i < mw} for i in range(maps)]} for d, won, mw, maps in results]
+    return {"series": series, "total_maps": sum(len(s["game_stats"]) for s in series),
+            "top_players": [{"avg_kda": 9.0, "avg_networth": 40000}]}
+
+@pytest.fixture(autouse=True)
+def _isolated_calibration(tmp_path, monkeypatch):
+    monkeypatch.setattr(predictor, "PREDICTOR_CALIBRATION_PATH", str(tmp_path / "calibration.json"))
+    monkeypatch.setattr(predictor, "PREDICTOR_SCALE", None)
+    monkeypatch.setattr(predictor, "_calibration", {"mtime": None, "scale": 1.0})
+
+def test_walk_forward_features_use_only_earlier_series():
+    data = _data([("2025-03-01", True, 2, 2), ("2025-02-01", False, 0, 2), ("2025-01-01", False, 1, 3)])
+    row, n = predictor.team_features(data, before="2025-02-15")
+    assert n == 2
+    assert row == predictor.team_features(_data([("2025-02-01", False, 0, 2), ("2025-01-01", False, 1, 3)]), before="2025-02-15")[0]
+    # whole-sample player numbers would leak later results into the check
+    assert row[3] == row[4] == 0.0
+    assert predictor.team_features(data)[0][3] > 0
+
+def test_calibrate_predicts_each_result_from_earlier_series_only():
+    strong = _data([("2025-01-%02d" % d, True, 2, 2) for d in range(20, 0, -1)])
+    weak = _data([("2025-01-%02d" % d, False, 0, 2) for d in range(20, 0, -1)])
+    report = predictor.calibrate(["Strong", "Weak"], [strong, weak], [("2025-01-01", "Strong", "Weak"), ("2025-01-15", "Strong", "Weak")])
+    assert report["results"] == 1                    # the first result has no earlier series
+    assert report["current"]["accuracy"] == 1.0
+    assert report["fitted_scale"] > 1.0              # always right: the fit sharpens the model
+
+def test_fit_scale_matches_grid_search():
+    rng = np.random.default_rng(3)
+    for true_a in (0.5, 2.0, -1.0):
+        zz = rng.normal(0, 1.5, 300)
+        won = rng.random(300) < 1 / (1 + np.exp(-true_a * zz))
+        z = np.where(won, zz, -zz)
+        grid = np.linspace(0, 8, 16001)
+        loss = [np.sum(np.logaddexp(0, -a * z)) + predictor.CALIBRATION_PRIOR * (a - 1) ** 2 for a in grid]
+        assert predictor._fit_scale(z) == pytest.approx(grid[int(np.argmin(loss))], abs=1e-3)
+
+def test_saved_slope_is_loaded_and_marks_predictions_calibrated():
+    a = _data([("2025-01-02", True, 2, 2), ("2025-01-01", True, 2, 3)])
+    b = _data([("2025-01-02", False, 0, 2), ("2025-01-01", False, 1, 3)])
+    before = predictor.predict_matchup("A", a, "B", b)
+    assert not before["calibrated"] and "uncalibrated" in before["verdict"]
+
+    path = predictor.save_calibration({"fitted_scale": 0.0})
+    assert json.load(open(path))["scale"] == 0.0
+    after = predictor.predict_matchup("A", a, "B", b)
+    assert after["calibrated"] and after["p_team_a"] == 0.5
@@ -0,0 +1,93 @@
+import math
+import pytest
+import ratings
+from ratings import Rating, RatingEngine, glicko2_update, win_probability, result_date, _new_sigma
+
+@pytest.fixture(autouse=True)
+def _no_background_flush(monkeypatch):
+    # Tests flush explicitly; keep the background flusher from applying batches mid-test
+    monkeypatch.setattr(ratings, "FLUSH_DELAY", 60)
+
+def _results(n=30):
+    return [(f"s{i:03d}", f"2026-{1 + i // 10:02d}-{10 + i % 10}", f"T{i % 5}", f"T{(i + 2) % 5}") for i in range(n)]
+
+def _board(engine):
+    return [(row["team"], row["rating"], row["rd"], row["games"]) for row in engine.leaderboard()]
+
+def test_volatility_matches_glickman_example():
+    # Worked example from Glickman's Glicko-2 paper: sigma' = 0.05999
+    assert _new_sigma(0.06, 200 / ratings.GLICKO_SCALE, 1.7785, -0.4834, 0.5) == pytest.approx(0.05999, abs=1e-5)
+
+def test_single_result_moves_ratings_symmetrically():
+    a, b = Rating("A"), Rating("B")
+    (wa, pa, _), (lb, pb, _) = glicko2_update(a, b, 1.0), glicko2_update(b, a, 0.0)
+    assert wa > 0 > lb and wa == pytest.approx(-lb)
+    assert pa < a.phi and pb < b.phi
+    assert win_probability(a, b) == pytest.approx(0.5)
+    strong, weak = Rating("S", mu=1.0, phi=0.5), Rating("W", mu=-1.0, phi=0.5)
+    assert win_probability(strong, weak) + win_probability(weak, strong) == pytest.approx(1.0)
+    assert win_probability(strong, weak) > 0.5
+
+def test_result_date_sorts_undated_first():
+    assert result_date("2025-03-01T12:00:00Z") == "2025-03-01"
+    assert result_date("Unknown") == result_date(None) == result_date("N/A") == ""
+    assert result_date("Unknown") < "2020-01-01"
+
+def test_newest_first_batch_applies_in_place_and_matches_chronological(tmp_path):
+    rows = _results()
+    newest_first = RatingEngine(str(tmp_path / "a.sqlite3"))
+    for row in reversed(rows[:20]):
+        newest_first.record(*row)
+    assert newest_first.rating("T0") is None          # lookups only see applied ratings
+    newest_first.flush()
+    for row in reversed(rows[20:]):
+        newest_first.record(*row)
+    newest_first.flush()
+
+    chronological = RatingEngine(str(tmp_path / "b.sqlite3"))
+    for row in rows:
+        chronological.record(*row)
+        chronological.flush()
+    assert _board(newest_first) == _board(chronological)
+    assert newest_first.stats()["pending"] == 0 and not newest_first.stats()["pending_replay"]
+
+def test_backfill_replays_in_date_order(tmp_path):
+    rows = _results()
+    engine = RatingEngine(str(tmp_path / "a.sqlite3"))
+    for row in rows[10:]:
+        engine.record(*row)
+    engine.flush()
+    for row in rows[:10]:               # older results arrive later
+        engine.record(*row)
+    engine.record("u1", "Unknown", "T1", "T3")
+    engine.flush()
+
+    reference = RatingEngine(str(tmp_path / "b.sqlite3"))
+    for row in [("u1", "", "T1", "T3")] + rows:
+        reference.record(*row)
+    reference.flush()
+    assert _board(engine) == _board(reference)
+    assert sum(row[3] for row in _board(engine)) == 2 * (len(rows) + 1)
+
+def test_unapplied_results_are_replayed_after_restart(tmp_path):
+    path = str(tmp_path / "r.sqlite3")
+    engine = RatingEngine(path)
+    for row in _results():
+        engine.record(*row)
+    # process "stops" before the flush: results are stored, ratings are not
+    reopened = RatingEngine(path)
+    assert reopened.stats()["pending_replay"]
+    reopened.flush()
+    assert sum(row[3] for row in _board(reopened)) == 2 * len(_results())
+    assert not RatingEngine(path).stats()["pending_replay"]
+
+def test_ingest_skips_unfinished_and_duplicate_series(tmp_path):
+    engine = RatingEngine(str(tmp_path / "r.sqlite3"))
+    live = {"teams": [{"name": "A", "won": False}, {"name": "B", "won": False}]}
+    done = {"teams": [{"name": "A", "won": True}, {"name": "B", "won": False}]}
+    assert not engine.ingest({"id": 1, "date": "2026-01-01"}, live)
+    assert engine.ingest({"id": 1, "date": "2026-01-01"}, done)
+    assert not engine.ingest({"id": 1, "date": "2026-01-01"}, done)
+    engine.flush()
+    assert engine.rating("a").wins == 1 and engine.rating("B").games == 1
+    assert math.isclose(engine.win_probability("A", "B") + engine.win_probability("B", "A"), 1.0)